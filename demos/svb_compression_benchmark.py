@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+#
+# Measure the compression ratio and throughput of every codec and prefilter
+# on frames captured from the first connected camera, with its current ROI
+# and output image type. Requires numpy for the prefilters.
+#
+
+import os
+import sys
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.compression import PREFILTERS, FrameCompressor, benchmark
+from pysvb.device import SVBCamera
+
+
+def separator(c="-", l=50):
+    print("\n{}\n".format(c*l))
+
+
+if __name__ == "__main__":
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    camera_sdk = PySVBCameraSDK()
+    print("SDK VERSION:", camera_sdk.sdk_version)
+
+    if camera_sdk.get_num_of_connected_cameras() > 0:
+        info = camera_sdk.get_camera_info(0)
+        print("Open camera:", info.FriendlyName)
+
+        with SVBCamera(info.CameraID, camera_sdk) as camera:
+            # Frame layout of the camera: sample size, delta stride and row length
+            layout = FrameCompressor.from_camera(camera_sdk, camera.camera_id)
+            frames = []
+            for frame in camera.frames(max_frames=count):
+                with frame:
+                    frames.append(bytes(frame.data))
+
+            roi = camera_sdk.get_roi_format(camera.camera_id)
+            image_type = camera_sdk.get_output_image_type(camera.camera_id)
+
+        print("Frames: {} of {}x{} {}".format(len(frames), roi.width, roi.height, image_type.name))
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            separator()
+            print("Workers:", workers)
+            for stats in benchmark(frames, prefilters=PREFILTERS, sample_size=layout.sample_size,
+                                   stride=layout.stride, row_samples=layout.row_samples, workers=workers):
+                print("\t{:<5} {:<14} ratio {:5.2f}, {:7.1f} MB/s, {:6.1f} fps".format(
+                    stats.codec, stats.prefilter, stats.ratio, stats.throughput, stats.frames / stats.wall_seconds))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+#
+# Measure the demosaic methods at the full sensor resolution of the first
+# connected camera (MaxWidth x MaxHeight and its Bayer pattern), on one core
+# and on every core, for 8 and 16 bit frames. Requires numpy.
+#
+
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from pysvb.camera import SVB_BAYER_PATTERN, PySVBCameraSDK
+from pysvb.demosaic import DEMOSAIC_METHODS, Demosaicer
+
+
+def separator(c="-", l=50):
+    print("\n{}\n".format(c*l))
+
+
+def bench(demosaicer, raw, repeat):
+    out = np.empty(demosaicer.output_shape(raw.shape), dtype=raw.dtype)
+    demosaicer(raw, out)
+    start = perf_counter()
+    for _ in range(0, repeat):
+        demosaicer(raw, out)
+    return (perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    camera_sdk = PySVBCameraSDK()
+    print("SDK VERSION:", camera_sdk.sdk_version)
+
+    if camera_sdk.get_num_of_connected_cameras() > 0:
+        camera_id = camera_sdk.get_camera_info(0).CameraID
+        camera_sdk.open_camera(camera_id)
+        prop = camera_sdk.get_camera_property(camera_id)
+        width, height, pattern = prop.MaxWidth, prop.MaxHeight, prop.BayerPattern
+        camera_sdk.close_camera(camera_id)
+    else:
+        print("No camera connected, using a 4144x2822 RG sensor")
+        width, height, pattern = 4144, 2822, SVB_BAYER_PATTERN.SVB_BAYER_RG
+
+    print("Frame: {}x{} {}".format(width, height, pattern.name))
+    rng = np.random.default_rng()
+
+    for dtype in (np.uint8, np.uint16):
+        raw = rng.integers(0, np.iinfo(dtype).max, (height, width), dtype=dtype, endpoint=True)
+        separator()
+        print("{} frames".format(np.dtype(dtype).name))
+        for method in DEMOSAIC_METHODS:
+            for workers in sorted({1, os.cpu_count() or 1}):
+                with Demosaicer(pattern, method, workers) as demosaicer:
+                    elapsed = bench(demosaicer, raw, repeat)
+                print("\t{:<10} workers {:>2}: {:7.1f} ms, {:6.1f} fps, {:7.1f} Mpx/s".format(
+                    method, workers, elapsed * 1e3, 1 / elapsed, width * height / elapsed / 1e6))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+#
+# Measure how the capture throughput scales with the number of cameras:
+# capture from 1, 2, ... N connected cameras at once and compare the
+# aggregated frame rate with N times the single camera frame rate.
+#
+
+import sys
+from time import monotonic
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.multicam import MultiCameraCapture
+
+
+def separator(c="-", l=50):
+    print("\n{}\n".format(c*l))
+
+
+def run(camera_sdk, camera_ids, seconds, ring_depth):
+    frames = 0
+    nbytes = 0
+
+    with MultiCameraCapture(camera_sdk, camera_ids, ring_depth=ring_depth) as capture:
+        start = monotonic()
+        for _, frame in capture.frames(timeout=seconds):
+            frames += 1
+            nbytes += frame.size
+            frame.release()
+            if monotonic() - start >= seconds:
+                break
+        elapsed = monotonic() - start
+        stats = capture.stats()
+
+    return frames / elapsed, nbytes / elapsed, stats
+
+
+if __name__ == "__main__":
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    ring_depth = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    camera_sdk = PySVBCameraSDK()
+    connected = camera_sdk.get_num_of_connected_cameras()
+    print("SDK VERSION:", camera_sdk.sdk_version)
+    print("Connected camera(s): {}".format(connected))
+
+    camera_ids = [camera_sdk.get_camera_info(i).CameraID for i in range(0, connected)]
+    single_fps = None
+
+    for n in range(1, len(camera_ids) + 1):
+        separator()
+        fps, bps, stats = run(camera_sdk, camera_ids[:n], seconds, ring_depth)
+        if single_fps is None:
+            single_fps = fps
+
+        print("Cameras: {}".format(n))
+        print("\ttotal fps: {:.1f}".format(fps))
+        print("\ttotal MB/s: {:.1f}".format(bps / 1e6))
+        print("\tscaling: {:.0f}%".format(100 * fps / (single_fps * n) if single_fps else 0))
+        for camera_id, s in stats.items():
+            print("\tcamera {}: {:.1f} fps, {} dropped frames{}".format(
+                camera_id, s.fps, s.dropped_frames, ", error: {!r}".format(s.error) if s.error else ""))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import time
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.device import SVBCamera
+from pysvb.ser import SerReader, SerWriter
+
+if __name__ == "__main__":
+
+    camera_sdk = PySVBCameraSDK()
+
+    connected = camera_sdk.get_num_of_connected_cameras()
+    print("SDK VERSION:", camera_sdk.sdk_version)
+    print("Connected camera(s): {}".format(connected))
+
+    if connected > 0:
+        info = camera_sdk.get_camera_info(0)
+        print("Open camera:", info.FriendlyName)
+
+        with SVBCamera(info.CameraID, camera_sdk) as camera:
+            filename = "SVB_capture.ser"
+            print("Save on:", filename)
+
+            # All the frames go to one file with buffered sequential writes
+            start = time.monotonic()
+            with SerWriter.from_camera(filename, camera_sdk, camera.camera_id) as ser:
+                for frame in camera.frames(max_frames=500, ring_depth=16):
+                    with frame:
+                        ser.write(frame)
+
+            elapsed = time.monotonic() - start
+            print("Frames: {}, {:.1f} fps".format(ser.frames, ser.frames / elapsed))
+            print("Dropped frames:", camera_sdk.get_dropped_frames(camera.camera_id))
+
+        with SerReader(filename) as ser:
+            print("Read back {} frames {}x{}, {} bit".format(len(ser), ser.width, ser.height, ser.bit_depth))
+            print("First frame at", ser.timestamp(0), "last frame at", ser.timestamp(-1))
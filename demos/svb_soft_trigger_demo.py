@@ -3,29 +3,10 @@
 from datetime import datetime
 from time import sleep
 from pysvb.camera import SVB_CAMERA_MODE, SVB_CONTROL_TYPE, SVB_IMG_TYPE, PySVBCameraSDK, SVB_ROI_FORMAT
-from pysvb.errors import SvbonyCameraError
-from threading import Thread
 
 def separator(c="-", l=50):
     print("\n{}\n".format(c*l))
 
-def capture_func(camera_sdk, camera_id, buffer_size, data):
-    camera_sdk.send_soft_trigger(camera_id)
-
-    while(True):
-        sleep(0.1)
-        try:
-            data = camera_sdk.get_video_data(camera_id, buffer_size, 100)
-        except SvbonyCameraError.Timeout:
-            pass
-        except Exception as e:
-            print("Error: ", str(e))
-            break
-        else:
-            break
-
-    return data
-
 if __name__ == "__main__":
 
     camera_sdk = PySVBCameraSDK()
@@ -159,8 +140,7 @@ if __name__ == "__main__":
         print("Init capture...")
         camera_sdk.start_video_capture(camera_id)
 
-        #buffer_size = int(int((props.MaxBitDepth + 7) / 8) * croi_format.width * croi_format.height * 4)
-        buffer_size = int(croi_format.width * croi_format.height * 16 / 8)
+        buffer_size = camera_sdk.get_frame_buffer_size(camera_id)
 
         max_captures = 5
 
@@ -170,27 +150,29 @@ if __name__ == "__main__":
         print("Buffer size: ", buffer_size)
 
         for i in range(0, max_captures):
-            data = None
-
             print("Capture frame nr. {}".format(i+1))
             start_time = datetime.now()
-            exposure_thread = Thread(target=capture_func, args=(camera_sdk, camera_id, buffer_size, data))
-            exposure_thread.start()
+            # Trigger and wait for the frame on a worker thread
+            exposure = camera_sdk.trigger_async(camera_id, exposure_secs * 1000000)
 
             current_secs = exposure_secs
-            while(current_secs > 0):
+            while(current_secs > 0 and not exposure.done()):
                 sleep(1)
                 print("\ttime left (secs):",current_secs)
                 current_secs -= 1
 
-            exposure_thread.join()
+            try:
+                frame = exposure.result()
+            except Exception as e:
+                print("Error: ", repr(e))
+                frame = None
 
-            if data:
+            if frame:
                 filename = "SVB_image_{}.raw".format(i+1)
                 print("\tsave on: ",filename)
 
-                with open(filename, 'wb') as f:
-                    f.write(data)
+                with frame, open(filename, 'wb') as f:
+                    f.write(frame.data)
 
             delta = datetime.now() - start_time
             print("\tseconds: ", delta.seconds)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.device import SVBCamera
+
+if __name__ == "__main__":
+
+    camera_sdk = PySVBCameraSDK()
+
+    connected = camera_sdk.get_num_of_connected_cameras()
+    print("SDK VERSION:", camera_sdk.sdk_version)
+    print("Connected camera(s): {}".format(connected))
+
+    if connected > 0:
+        info = camera_sdk.get_camera_info(0)
+        print("Open camera:", info.FriendlyName)
+
+        with SVBCamera(info.CameraID, camera_sdk) as camera:
+            print("Frame size:", camera_sdk.get_frame_buffer_size(camera.camera_id))
+
+            # Capture is started by the iterator and stopped when the loop ends
+            for frame in camera.frames(max_frames=10):
+                filename = "SVB_image_{}.raw".format(frame.sequence)
+                print("\tframe {} at {:.3f}s, save on: {}".format(frame.sequence, frame.timestamp, filename))
+
+                with frame, open(filename, 'wb') as f:
+                    f.write(frame.data)
+
+            print("Dropped frames:", camera_sdk.get_dropped_frames(camera.camera_id))
@@ -0,0 +1,187 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# asyncio front-end
+#
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import monotonic
+from typing import AsyncIterator
+
+from pysvb.camera import SVB_CONTROL_TYPE, PySVBCameraSDK
+from pysvb.device import SVBCamera
+from pysvb.errors import SVB_CAMERA_ERRORS, SvbonyCameraError
+from pysvb.pool import FrameBuffer
+
+
+class AsyncSVBCamera:
+    """asyncio wrapper of SVBCamera: blocking SDK calls run on two worker threads of the camera, one for
+       the video data and one for everything else, so that the event loop is never blocked and a controls
+       update or a soft trigger does not wait for a pending frame.
+
+       async with AsyncSVBCamera(camera_id) as camera:
+           async for frame in camera.stream():
+               process(frame.data)
+    """
+
+    def __init__(self, camera_id: int, sdk: PySVBCameraSDK = None, pool_size: int = 4) -> None:
+        """Initialize class, the camera is opened by open or by the async context manager.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            sdk (PySVBCameraSDK, optional): sdk instance to use. Defaults to None (a new one raising exceptions).
+            pool_size (int, optional): number of frame buffers recycled by get_frame and stream. Defaults to 4.
+        """
+        self.__camera = SVBCamera(camera_id, sdk, pool_size)
+        self.__pool_size = pool_size
+        self.__wait_ms = None
+        self.__control = ThreadPoolExecutor(1, "svb-control-{}".format(camera_id))
+        self.__video = ThreadPoolExecutor(1, "svb-video-{}".format(camera_id))
+
+    @property
+    def camera(self) -> SVBCamera:
+        """Wrapped camera"""
+        return self.__camera
+
+    @property
+    def camera_id(self) -> int:
+        """Camera ID"""
+        return self.__camera.camera_id
+
+    @property
+    def sdk(self) -> PySVBCameraSDK:
+        """Sdk instance used by the camera"""
+        return self.__camera.sdk
+
+    async def run(self, func, *args):
+        """Run a blocking call of the camera on its control worker thread.
+
+        Args:
+            func: callable, usually a PySVBCameraSDK method
+            args: call arguments
+
+        Returns:
+            the value returned by func
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.__control, partial(func, *args))
+
+    async def open(self) -> None:
+        """Open the camera"""
+        await self.run(self.__camera.open)
+
+    async def close(self) -> None:
+        """Stop the video capture if needed, close the camera and shutdown the worker threads"""
+        try:
+            await asyncio.shield(self.run(self.__camera.close))
+        finally:
+            self.__control.shutdown(wait=False)
+            self.__video.shutdown(wait=False)
+
+    async def start_capture(self) -> None:
+        """Start video capture"""
+        if self.__wait_ms is None:
+            self.__wait_ms = await self.run(self.sdk.get_default_wait_ms, self.camera_id)
+        if not self.__camera.capturing:
+            await self.run(self.sdk.create_frame_pool, self.camera_id, self.__pool_size)
+            await self.run(self.__camera.start_capture)
+
+    async def stop_capture(self) -> None:
+        """Stop video capture, it completes even if the calling task is cancelled"""
+        await asyncio.shield(self.run(self.__camera.stop_capture))
+
+    async def get_frame(self, wait_ms: int = None) -> FrameBuffer:
+        """Wait for the next frame, video capture is started if needed.
+
+        Args:
+            wait_ms (int, optional): wait value (milliseconds). Defaults to None (exposure*2+500ms when capture started).
+
+        Returns:
+            FrameBuffer: leased frame buffer, release it to recycle the buffer
+        """
+        return (await self.__read_frame(wait_ms))[0]
+
+    async def __read_frame(self, wait_ms: int) -> 'tuple[FrameBuffer, SVB_CAMERA_ERRORS]':
+        await self.start_capture()
+        if wait_ms is None:
+            wait_ms = self.__wait_ms
+        func = partial(self.__read_frame_sync, self.camera_id, wait_ms)
+        return await asyncio.get_running_loop().run_in_executor(self.__video, func)
+
+    def __read_frame_sync(self, camera_id: int, wait_ms: int) -> 'tuple[FrameBuffer, SVB_CAMERA_ERRORS]':
+        # Runs on the video worker: the arrival time is taken before the hop back to the event loop
+        frame, err = self.sdk.read_video_frame(camera_id, wait_ms)
+        if frame is not None and frame.timestamp is None:
+            frame.timestamp = monotonic()
+        return frame, err
+
+    async def stream(self, wait_ms: int = None, max_frames: int = None) -> 'AsyncIterator[FrameBuffer]':
+        """Stream the frames of the camera, timeouts mean no frame yet. Video capture is stopped when the
+            iteration ends, breaks or the consuming task is cancelled. With exceptions disabled the stream
+            ends on the first error other than a timeout, see last_error_code of the sdk.
+
+        Args:
+            wait_ms (int, optional): wait value (milliseconds) of each frame. Defaults to None (exposure*2+500ms).
+            max_frames (int, optional): stop after this number of frames. Defaults to None (endless stream).
+
+        Yields:
+            FrameBuffer: frame with sequence number and monotonic timestamp
+        """
+        sequence = 0
+        try:
+            while max_frames is None or sequence < max_frames:
+                try:
+                    frame, err = await self.__read_frame(wait_ms)
+                except SvbonyCameraError.Timeout:
+                    continue
+
+                if frame is None:
+                    if err == SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT:
+                        continue
+                    break
+
+                if frame.sequence is None:
+                    frame.sequence = sequence
+                sequence += 1
+
+                yield frame
+                frame = None
+        finally:
+            await self.stop_capture()
+
+    async def get_control_value(self, control_type: SVB_CONTROL_TYPE) -> 'tuple[int, bool]':
+        """Get controls property value and auto value (see PySVBCameraSDK.get_control_value)"""
+        return await self.run(self.sdk.get_control_value, self.camera_id, control_type)
+
+    async def set_control_value(self, control_type: SVB_CONTROL_TYPE, control_value: int, b_auto: bool = False) -> None:
+        """Set controls property value and auto value (see PySVBCameraSDK.set_control_value)"""
+        await self.run(self.sdk.set_control_value, self.camera_id, control_type, control_value, b_auto)
+        if control_type == SVB_CONTROL_TYPE.SVB_EXPOSURE:
+            self.__wait_ms = None
+
+    async def send_soft_trigger(self) -> None:
+        """Send out a softTrigger (see PySVBCameraSDK.send_soft_trigger)"""
+        await self.run(self.sdk.send_soft_trigger, self.camera_id)
+
+    async def trigger_and_wait(self, exposure_us: int = None) -> FrameBuffer:
+        """Send out a softTrigger and wait for the exposed frame (see PySVBCameraSDK.trigger_and_wait),
+            use asyncio.gather to wait many triggered cameras together. Video capture is started if needed.
+
+        Args:
+            exposure_us (int, optional): exposure (microseconds) used to compute the timeout. Defaults to None (read from the camera).
+
+        Returns:
+            FrameBuffer: leased frame buffer, release it to recycle the buffer
+        """
+        await self.start_capture()
+        func = partial(self.sdk.trigger_and_wait, self.camera_id, exposure_us)
+        return await asyncio.get_running_loop().run_in_executor(self.__video, func)
+
+    async def __aenter__(self) -> 'AsyncSVBCamera':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
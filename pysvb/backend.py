@@ -0,0 +1,229 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Pluggable sdk backends
+#
+
+import os
+from abc import ABC, abstractmethod
+
+
+class SVBBackend(ABC):
+    """Functions of the svbcamerasdk extension used by PySVBCameraSDK. A backend is any object (or module)
+       providing them with the same arguments and results, subclassing this class is optional but
+       then every function must be implemented.
+       Results end with the SVB_CAMERA_ERRORS code of the call, controls and modes are plain ints.
+    """
+
+    @abstractmethod
+    def SVBGetNumOfConnectedCameras(self) -> int:
+        """() -> count"""
+
+    @abstractmethod
+    def SVBGetCameraInfo(self, camera_index: int) -> tuple:
+        """(camera_index) -> ((FriendlyName, CameraSN, PortType, DeviceID, CameraID), err)"""
+
+    @abstractmethod
+    def SVBGetCameraProperty(self, camera_id: int) -> tuple:
+        """(camera_id) -> ((MaxHeight, MaxWidth, IsColorCam, BayerPattern, (bins), (video formats),
+            MaxBitDepth, IsTriggerCam), err)"""
+
+    @abstractmethod
+    def SVBGetCameraPropertyEx(self, camera_id: int) -> tuple:
+        """(camera_id) -> ((bSupportPulseGuide, bSupportControlTemp), err)"""
+
+    @abstractmethod
+    def SVBOpenCamera(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBCloseCamera(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBGetNumOfControls(self, camera_id: int) -> tuple:
+        """(camera_id) -> (count, err)"""
+
+    @abstractmethod
+    def SVBGetControlCaps(self, camera_id: int, control_index: int) -> tuple:
+        """(camera_id, control_index) -> ((Name, Description, MaxValue, MinValue, DefaultValue,
+            IsAutoSupported, IsWritable, ControlType), err)"""
+
+    @abstractmethod
+    def SVBGetControlValue(self, camera_id: int, control_type: int) -> tuple:
+        """(camera_id, control_type) -> (value, auto, err)"""
+
+    @abstractmethod
+    def SVBSetControlValue(self, camera_id: int, control_type: int, value: int, auto: int) -> int:
+        """(camera_id, control_type, value, auto) -> err"""
+
+    @abstractmethod
+    def SVBGetControlValues(self, camera_id: int, control_types) -> tuple:
+        """(camera_id, [control_type]) -> ({control_type: (value, auto)}, {control_type: err}, err)"""
+
+    @abstractmethod
+    def SVBSetControlValues(self, camera_id: int, controls: dict) -> tuple:
+        """(camera_id, {control_type: (value, auto) or value}) -> ({control_type: err}, err)"""
+
+    @abstractmethod
+    def SVBGetOutputImageType(self, camera_id: int) -> tuple:
+        """(camera_id) -> (image_type, err)"""
+
+    @abstractmethod
+    def SVBSetOutputImageType(self, camera_id: int, image_type: int) -> int:
+        """(camera_id, image_type) -> err"""
+
+    @abstractmethod
+    def SVBSetROIFormat(self, camera_id: int, start_x: int, start_y: int, width: int, height: int, bin: int) -> int:
+        """(camera_id, start_x, start_y, width, height, bin) -> err"""
+
+    @abstractmethod
+    def SVBGetROIFormat(self, camera_id: int) -> tuple:
+        """(camera_id) -> (start_x, start_y, width, height, bin, err)"""
+
+    @abstractmethod
+    def SVBGetDroppedFrames(self, camera_id: int) -> tuple:
+        """(camera_id) -> (dropped frames, err)"""
+
+    @abstractmethod
+    def SVBStartVideoCapture(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBStopVideoCapture(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBGetVideoData(self, camera_id: int, buff_size: int, wait_ms: int) -> tuple:
+        """(camera_id, buff_size, wait_ms) -> (bytes, err)"""
+
+    @abstractmethod
+    def SVBGetVideoDataInto(self, camera_id: int, buffer, wait_ms: int, buff_size: int = -1) -> tuple:
+        """(camera_id, writable buffer, wait_ms[, buff_size]) -> (written, err)"""
+
+    @abstractmethod
+    def SVBWhiteBalanceOnce(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBGetCameraFirmwareVersion(self, camera_id: int, buff_size: int) -> tuple:
+        """(camera_id, buff_size) -> (version, err)"""
+
+    @abstractmethod
+    def SVBGetSDKVersion(self) -> str:
+        """() -> version"""
+
+    @abstractmethod
+    def SVBGetCameraSupportMode(self, camera_id: int) -> tuple:
+        """(camera_id) -> ((modes), err)"""
+
+    @abstractmethod
+    def SVBGetCameraMode(self, camera_id: int) -> tuple:
+        """(camera_id) -> (mode, err)"""
+
+    @abstractmethod
+    def SVBSetCameraMode(self, camera_id: int, mode: int) -> int:
+        """(camera_id, mode) -> err"""
+
+    @abstractmethod
+    def SVBSendSoftTrigger(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBGetSerialNumber(self, camera_id: int) -> tuple:
+        """(camera_id) -> (serial number, err)"""
+
+    @abstractmethod
+    def SVBSetTriggerOutputIOConf(self, camera_id: int, pin: int, pin_high: int, delay: int, duration: int) -> int:
+        """(camera_id, pin, pin_high, delay, duration) -> err"""
+
+    @abstractmethod
+    def SVBGetTriggerOutputIOConf(self, camera_id: int, pin: int) -> tuple:
+        """(camera_id, pin) -> (pin_high, delay, duration, err)"""
+
+    @abstractmethod
+    def SVBPulseGuide(self, camera_id: int, direction: int, duration: int) -> int:
+        """(camera_id, direction, duration) -> err"""
+
+    @abstractmethod
+    def SVBGetSensorPixelSize(self, camera_id: int) -> tuple:
+        """(camera_id) -> (pixel size, err)"""
+
+    @abstractmethod
+    def SVBCanPulseGuide(self, camera_id: int) -> tuple:
+        """(camera_id) -> (can pulse guide, err)"""
+
+    @abstractmethod
+    def SVBSetAutoSaveParam(self, camera_id: int, enable: int) -> int:
+        """(camera_id, enable) -> err"""
+
+    @abstractmethod
+    def SVBIsCameraNeedToUpgrade(self, camera_id: int, buff_size: int) -> tuple:
+        """(camera_id, buff_size) -> (needed, min version, err)"""
+
+    @abstractmethod
+    def SVBRestoreDefaultParam(self, camera_id: int) -> int:
+        """(camera_id) -> err"""
+
+    @abstractmethod
+    def SVBStartRingCapture(self, camera_id: int, depth: int, buff_size: int, wait_ms: int) -> int:
+        """(camera_id, depth, buff_size, wait_ms) -> err"""
+
+    @abstractmethod
+    def SVBStopRingCapture(self, camera_id: int) -> tuple:
+        """(camera_id) -> (frames, overruns, timeouts, high_water, queued, depth, err)"""
+
+    @abstractmethod
+    def SVBGetRingCaptureStats(self, camera_id: int) -> tuple:
+        """(camera_id) -> (frames, overruns, timeouts, high_water, queued, depth, err)"""
+
+    @abstractmethod
+    def SVBGetRingFrameInto(self, camera_id: int, buffer, wait_ms: int) -> tuple:
+        """(camera_id, writable buffer, wait_ms) -> (written, sequence, monotonic timestamp, err)"""
+
+
+SVB_BACKEND_FUNCTIONS = tuple(name for name in vars(SVBBackend) if name.startswith('SVB'))
+"""Names of the functions of a backend"""
+
+_default_backend = None
+
+
+def _is_implemented(function) -> bool:
+    return callable(function) and not getattr(function, '__isabstractmethod__', False)
+
+
+def check_backend(backend) -> None:
+    """Check that an object provides every function of a backend, raise TypeError if not"""
+    missing = [name for name in SVB_BACKEND_FUNCTIONS if not _is_implemented(getattr(backend, name, None))]
+    if missing:
+        raise TypeError("backend misses {}".format(", ".join(missing)))
+
+
+def load_backend(name: str):
+    """Create a backend by name: 'native' (the svbcamerasdk extension) or 'simulator' (SVBSimulator)"""
+    if name == 'native':
+        from pysvb import svbcamerasdk
+        return svbcamerasdk
+    if name == 'simulator':
+        from pysvb.simulator import SVBSimulator
+        return SVBSimulator()
+    raise ValueError("unknown backend {}".format(name))
+
+
+def get_default_backend():
+    """Backend used by the PySVBCameraSDK instances created without one. It is loaded on first use by
+       name from the PYSVB_BACKEND environment variable, the native extension if not set.
+    """
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = load_backend(os.environ.get('PYSVB_BACKEND', 'native'))
+    return _default_backend
+
+
+def set_default_backend(backend) -> None:
+    """Set the backend used by the PySVBCameraSDK instances created without one, None restores the default"""
+    global _default_backend
+    if backend is not None:
+        check_backend(backend)
+    _default_backend = backend
@@ -0,0 +1,155 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Software binning, requires numpy
+#
+
+from pysvb.camera import SVB_IMG_TYPE, PySVBCameraSDK
+
+BINNING_MODES = ('sum', 'mean')
+"""Available binning modes"""
+
+
+class SoftwareBinning:
+    """Bin captured frames in software, from 2x2 to 8x8, without touching the camera ROI format: a reduced
+       preview or analysis stream can be fed from the full resolution capture. Frames are read through strided
+       views and added straight into the binned image, the only temporaries have the binned size.
+       With bayer enabled the samples of the same color are binned together and the result is still a
+       mosaic with the pattern of the frame. Rows and columns left over by the factor are dropped.
+
+       preview = SoftwareBinning(4, 'mean', bayer=True)
+       small = preview(sdk.get_video_frame_array(camera_id, wait_ms))
+    """
+
+    def __init__(self, factor: int, mode: str = 'mean', bayer: bool = False) -> None:
+        """Initialize class
+
+        Args:
+            factor (int): binning factor, 2 to 8
+            mode (str, optional): one of BINNING_MODES. Defaults to 'mean'.
+            bayer (bool, optional): frames are Bayer mosaics. Defaults to False.
+        """
+        if not 2 <= factor <= 8:
+            raise ValueError("binning factor must be between 2 and 8")
+        if mode not in BINNING_MODES:
+            raise ValueError("unknown binning mode {}".format(mode))
+
+        self.__factor = factor
+        self.__mode = mode
+        self.__bayer = bayer
+
+    @classmethod
+    def from_camera(cls, sdk: PySVBCameraSDK, camera_id: int, factor: int, mode: str = 'mean') -> 'SoftwareBinning':
+        """Create a binning stage for the frames of a camera, Bayer aware for the RAW frames of color cameras.
+            The camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            factor (int): binning factor, 2 to 8
+            mode (str, optional): one of BINNING_MODES. Defaults to 'mean'.
+
+        Returns:
+            SoftwareBinning: binning stage of the camera frames
+        """
+        raw = sdk.get_output_image_type(camera_id) < SVB_IMG_TYPE.SVB_IMG_Y8
+        return cls(factor, mode, raw and sdk.get_camera_property(camera_id).IsColorCam)
+
+    @property
+    def factor(self) -> int:
+        """Binning factor"""
+        return self.__factor
+
+    @property
+    def mode(self) -> str:
+        """Binning mode"""
+        return self.__mode
+
+    @property
+    def bayer(self) -> bool:
+        """Frames are Bayer mosaics"""
+        return self.__bayer
+
+    def output_shape(self, shape: tuple) -> tuple:
+        """Shape of the binned image of a frame.
+
+        Args:
+            shape (tuple): frame (height, width) or (height, width, channels)
+
+        Returns:
+            tuple: binned shape
+        """
+        cell = self.__factor * 2 if self.__bayer else self.__factor
+        height, width = shape[0] // cell * cell, shape[1] // cell * cell
+        return (height // self.__factor, width // self.__factor) + tuple(shape[2:])
+
+    def output_dtype(self, dtype):
+        """Dtype of the binned image: the frame dtype for mean, a wider one for sum (uint8 -> uint16, uint16 -> uint32).
+
+        Args:
+            dtype: frame dtype
+
+        Returns:
+            numpy.dtype: binned dtype
+        """
+        import numpy as np
+
+        dtype = np.dtype(dtype)
+        if self.__mode == 'mean' or dtype.kind == 'f':
+            return dtype
+        return np.dtype(np.uint16 if dtype.itemsize == 1 else np.uint32)
+
+    def __call__(self, frame, out=None):
+        """Bin a frame.
+
+        Args:
+            frame (numpy.ndarray): frame, 2D (or 3D for RGB) array (see get_video_frame_array)
+            out (numpy.ndarray, optional): destination, output_shape and output_dtype. Defaults to None (new array).
+
+        Returns:
+            numpy.ndarray: binned image
+        """
+        import numpy as np
+
+        f = self.__factor
+        shape = self.output_shape(frame.shape)
+        dtype = self.output_dtype(frame.dtype)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape or out.dtype != dtype:
+            raise ValueError("out must be a {} array of shape {}".format(dtype, shape))
+
+        frame = frame[:shape[0] * f, :shape[1] * f]
+        if self.__bayer:
+            # Each color plane is binned into the samples of the same color of the result
+            for py in (0, 1):
+                for px in (0, 1):
+                    self.__bin_plane(frame[py::2, px::2], out[py::2, px::2])
+        else:
+            self.__bin_plane(frame, out)
+        return out
+
+    def __bin_plane(self, plane, target) -> None:
+        import numpy as np
+
+        # f*f strided views added into a binned size accumulator: every sample is read once
+        f = self.__factor
+        if self.__mode == 'sum':
+            acc = target
+            acc[...] = plane[0::f, 0::f]
+        else:
+            acc = plane[0::f, 0::f].astype(np.float64 if target.dtype.kind == 'f' else np.uint32)
+        for i in range(0, f):
+            for j in range(0, f):
+                if i or j:
+                    acc += plane[i::f, j::f]
+
+        if self.__mode == 'sum':
+            return
+        if target.dtype.kind == 'f':
+            np.divide(acc, f * f, out=target, casting='unsafe')
+        else:
+            # Integer mean, rounded
+            acc += f * f // 2
+            np.floor_divide(acc, f * f, out=target, casting='unsafe')
@@ -0,0 +1,317 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Bias, dark and flat calibration, requires numpy
+#
+
+import os
+from dataclasses import dataclass, replace
+
+from pysvb.camera import SVB_CONTROL_TYPE, PySVBCameraSDK
+from pysvb.errors import SvbonyCameraError
+from pysvb.stacking import LiveStacker
+
+CALIBRATION_KINDS = ('bias', 'dark', 'flat')
+"""Kinds of master frames"""
+
+
+@dataclass(frozen=True)
+class SVB_CALIBRATION_KEY:
+    """Capture conditions of a master frame dataclass"""
+    exposure: int = 0
+    "exposure (microseconds)"
+    gain: int = 0
+    "gain"
+    temperature: int = 0
+    "sensor temperature bucket, temperature (C) / temperature_step rounded"
+    roi: tuple = ()
+    "roi area (start_x, start_y, width, height)"
+    bin: int = 1
+    "binning method"
+    image_type: int = 0
+    "output image type"
+
+    @classmethod
+    def from_camera(cls, sdk: PySVBCameraSDK, camera_id: int, temperature_step: float = 2.0) -> 'SVB_CALIBRATION_KEY':
+        """Get the current capture conditions of a camera. The camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            temperature_step (float, optional): width of the temperature buckets (C). Defaults to 2.0.
+
+        Returns:
+            SVB_CALIBRATION_KEY: capture conditions
+        """
+        values, _ = sdk.get_control_values(camera_id, [SVB_CONTROL_TYPE.SVB_EXPOSURE, SVB_CONTROL_TYPE.SVB_GAIN,
+                                                       SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE])
+        roi = sdk.get_roi_format(camera_id)
+        # Temperature is in 0.1C, cameras without sensor fall in bucket 0
+        temperature = values.get(SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE, (0, False))[0] / 10
+
+        return cls(values.get(SVB_CONTROL_TYPE.SVB_EXPOSURE, (0, False))[0],
+                   values.get(SVB_CONTROL_TYPE.SVB_GAIN, (0, False))[0],
+                   int(round(temperature / temperature_step)),
+                   (roi.start_x, roi.start_y, roi.width, roi.height), roi.bin,
+                   int(sdk.get_output_image_type(camera_id)))
+
+    def for_kind(self, kind: str) -> 'SVB_CALIBRATION_KEY':
+        """Get the key of a kind of master: bias ignore the exposure, flats the exposure and the temperature.
+
+        Args:
+            kind (str): one of CALIBRATION_KINDS
+
+        Returns:
+            SVB_CALIBRATION_KEY: key with only the fields meaningful for the kind
+        """
+        if kind not in CALIBRATION_KINDS:
+            raise ValueError("unknown calibration kind {}".format(kind))
+        if kind == 'bias':
+            return replace(self, exposure=0)
+        if kind == 'flat':
+            return replace(self, exposure=0, temperature=0)
+        return self
+
+
+class MasterBuilder:
+    """Build a master frame from a sequence of frames: winsorized sigma clipped mean, stacked incrementally (see LiveStacker).
+
+       builder = MasterBuilder('dark', *sdk.get_frame_array_format(camera_id))
+       builder.capture(sdk, camera_id, 50)
+       library.save('dark', SVB_CALIBRATION_KEY.from_camera(sdk, camera_id), builder.master())
+    """
+
+    def __init__(self, kind: str, shape: tuple, frame_dtype: str = '<u2', sigma: float = 3.0) -> None:
+        """Initialize class
+
+        Args:
+            kind (str): one of CALIBRATION_KINDS
+            shape (tuple): frame shape
+            frame_dtype (str, optional): dtype of the frames given as buffers. Defaults to '<u2'.
+            sigma (float, optional): rejection threshold in standard deviations, None disables the clipping. Defaults to 3.0.
+        """
+        if kind not in CALIBRATION_KINDS:
+            raise ValueError("unknown calibration kind {}".format(kind))
+        self.__kind = kind
+        self.__stacker = LiveStacker(shape, frame_dtype, sigma, dtype='float32')
+
+    @property
+    def kind(self) -> str:
+        """Kind of master"""
+        return self.__kind
+
+    @property
+    def frames(self) -> int:
+        """Frames added"""
+        return self.__stacker.frames
+
+    def add(self, frame) -> None:
+        """Add a frame (ndarray or buffer, see LiveStacker.add)"""
+        self.__stacker.add(frame)
+
+    def capture(self, sdk: PySVBCameraSDK, camera_id: int, count: int, wait_ms: int = None) -> None:
+        """Capture frames from a camera and add them, video capture is started and stopped.
+            The camera need be opened and set for the kind of master (shutter closed, flat panel...) at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance, raising exceptions
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            count (int): frames to add
+            wait_ms (int, optional): wait value (milliseconds) of each frame. Defaults to None (exposure*2+500ms).
+        """
+        if wait_ms is None:
+            wait_ms = sdk.get_default_wait_ms(camera_id)
+
+        sdk.create_frame_pool(camera_id, 2)
+        sdk.start_video_capture(camera_id)
+        try:
+            added = 0
+            while added < count:
+                try:
+                    frame = sdk.get_video_frame(camera_id, wait_ms)
+                except SvbonyCameraError.Timeout:
+                    continue
+                if frame is None:
+                    continue
+                with frame:
+                    self.add(frame.data)
+                added += 1
+        finally:
+            sdk.stop_video_capture(camera_id)
+
+    def master(self, bias=None):
+        """Get the master frame.
+
+        Args:
+            bias (numpy.ndarray, optional): master bias (or dark of the same exposure) subtracted from flats. Defaults to None.
+
+        Returns:
+            numpy.ndarray: float32 master frame
+        """
+        master = self.__stacker.preview()
+        if bias is not None and self.__kind == 'flat':
+            master -= bias
+        return master
+
+
+class CalibrationLibrary:
+    """Directory of master frames indexed by kind and SVB_CALIBRATION_KEY, stored as .npy files and loaded
+       lazily as read only memory maps: only the pages actually used are read from disk.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize class
+
+        Args:
+            path (str): directory of the library, created on first save
+        """
+        self.__path = os.path.expanduser(path)
+        self.__loaded = {}
+
+    @property
+    def path(self) -> str:
+        """Directory of the library"""
+        return self.__path
+
+    def save(self, kind: str, key: SVB_CALIBRATION_KEY, master) -> None:
+        """Store a master frame, replacing the previous one with the same key.
+
+        Args:
+            kind (str): one of CALIBRATION_KINDS
+            key (SVB_CALIBRATION_KEY): capture conditions of the master
+            master (numpy.ndarray): master frame
+        """
+        import numpy as np
+
+        key = key.for_kind(kind)
+        os.makedirs(self.__path, exist_ok=True)
+        file = self.__file(kind, key)
+        tmp = file + ".tmp.npy"
+        np.save(tmp, np.asarray(master, dtype=np.float32))
+        os.replace(tmp, file)
+        self.__loaded.pop((kind, key), None)
+
+    def load(self, kind: str, key: SVB_CALIBRATION_KEY):
+        """Get a master frame.
+
+        Args:
+            kind (str): one of CALIBRATION_KINDS
+            key (SVB_CALIBRATION_KEY): capture conditions of the frames to calibrate
+
+        Returns:
+            numpy.ndarray: read only memory mapped float32 master, None if the library has not it
+        """
+        import numpy as np
+
+        key = key.for_kind(kind)
+        master = self.__loaded.get((kind, key))
+        if master is None:
+            try:
+                master = np.load(self.__file(kind, key), mmap_mode='r')
+            except FileNotFoundError:
+                return None
+            self.__loaded[(kind, key)] = master
+        return master
+
+    def __file(self, kind: str, key: SVB_CALIBRATION_KEY) -> str:
+        x, y, width, height = key.roi if key.roi else (0, 0, 0, 0)
+        name = "{}_e{}_g{}_t{}_{}_{}_{}x{}_b{}_i{}.npy".format(
+            kind, key.exposure, key.gain, key.temperature, x, y, width, height, key.bin, key.image_type)
+        return os.path.join(self.__path, name)
+
+
+class Calibrator:
+    """Calibrate raw frames: out = clip((raw - dark) * flat_gain). The dark (or the bias when there is no dark)
+       and the normalized inverse of the flat are computed once, then each frame is calibrated in blocks of
+       rows small enough to stay in cache: subtract, multiply and clip run on a block before the next one.
+
+       calibrator = Calibrator.from_library(library, SVB_CALIBRATION_KEY.from_camera(sdk, camera_id))
+       calibrator.apply(sdk.get_video_frame_array(camera_id, wait_ms, raw), out=calibrated)
+    """
+
+    def __init__(self, dark=None, flat=None, bias=None, bayer: bool = False, block_rows: int = 64) -> None:
+        """Initialize class
+
+        Args:
+            dark (numpy.ndarray, optional): master dark, it includes the bias. Defaults to None.
+            flat (numpy.ndarray, optional): master flat, bias subtracted. Defaults to None.
+            bias (numpy.ndarray, optional): master bias, used when there is no dark. Defaults to None.
+            bayer (bool, optional): frames are Bayer mosaics, the flat is normalized on each color. Defaults to False.
+            block_rows (int, optional): rows calibrated at once. Defaults to 64.
+        """
+        import numpy as np
+
+        self.__offset = dark if dark is not None else bias
+        self.__gain = None
+        self.__block_rows = max(block_rows, 1)
+
+        if flat is not None:
+            flat = np.asarray(flat, dtype=np.float32)
+            gain = np.ones(flat.shape, dtype=np.float32)
+            phases = [(slice(py, None, 2), slice(px, None, 2)) for py in (0, 1) for px in (0, 1)] \
+                if bayer else [(Ellipsis,)]
+            for phase in phases:
+                plane = flat[phase]
+                valid = plane > 0
+                if valid.any():
+                    mean = plane[valid].mean()
+                    np.divide(mean, plane, out=gain[phase], where=valid)
+            self.__gain = gain
+
+    @classmethod
+    def from_library(cls, library: CalibrationLibrary, key: SVB_CALIBRATION_KEY, bayer: bool = False) -> 'Calibrator':
+        """Create a calibrator with the masters of the library matching the capture conditions, missing ones are skipped.
+
+        Args:
+            library (CalibrationLibrary): master frames library
+            key (SVB_CALIBRATION_KEY): capture conditions of the frames to calibrate
+            bayer (bool, optional): frames are Bayer mosaics. Defaults to False.
+
+        Returns:
+            Calibrator: calibrator for the frames
+        """
+        return cls(library.load('dark', key), library.load('flat', key), library.load('bias', key), bayer)
+
+    def apply(self, raw, out=None, max_value: int = None):
+        """Calibrate a frame.
+
+        Args:
+            raw (numpy.ndarray): frame with the masters shape (see get_video_frame_array)
+            out (numpy.ndarray, optional): destination, frame shape, any dtype. Defaults to None (float32).
+            max_value (int, optional): clip limit for integer outputs. Defaults to None (largest value of the out dtype).
+
+        Returns:
+            numpy.ndarray: calibrated frame
+        """
+        import numpy as np
+
+        if out is None:
+            out = np.empty(raw.shape, dtype=np.float32)
+
+        if out.dtype.kind in 'ui':
+            high = np.iinfo(out.dtype).max if max_value is None else max_value
+            rounded = True
+        else:
+            high = np.inf if max_value is None else max_value
+            rounded = False
+
+        direct = out.dtype == np.float32
+        scratch = None if direct else np.empty((self.__block_rows,) + raw.shape[1:], dtype=np.float32)
+
+        for y0 in range(0, raw.shape[0], self.__block_rows):
+            rows = slice(y0, min(y0 + self.__block_rows, raw.shape[0]))
+            block = out[rows] if direct else scratch[:rows.stop - y0]
+            if self.__offset is not None:
+                np.subtract(raw[rows], self.__offset[rows], out=block, dtype=np.float32)
+            else:
+                np.copyto(block, raw[rows], casting='unsafe')
+            if self.__gain is not None:
+                block *= self.__gain[rows]
+            if rounded:
+                np.rint(block, out=block)
+            np.clip(block, 0, high, out=block)
+            if not direct:
+                np.copyto(out[rows], block, casting='unsafe')
+
+        return out
@@ -5,12 +5,15 @@
 # Main camera class and types
 #
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import IntEnum, auto
-from pysvb import svbcamerasdk
 
+from pysvb.backend import get_default_backend
 from pysvb.errors import SVB_CAMERA_ERRORS
-from pysvb.helpers import SVB_ERROR_CODE_TO_EXC
+from pysvb.helpers import SVB_ERROR_CODE_TO_EXC, frame_buffer_size, frame_shape, image_type_to_dtype
+from pysvb.metadata import CameraMetadataStore
+from pysvb.pool import FrameBuffer, FramePool
 
 SVBCAMERA_ID_MAX = 128
 
@@ -121,162 +124,90 @@ class SVB_EXPOSURE_STATUS(IntEnum):
 
 
 class SVB_CAMERA_INFO:
-
-    @property
-    def FriendlyName(self) -> str:
-        """Camera friendly name"""
-        return self.__b["FriendlyName"]
-
-    @property
-    def CameraSN(self) -> str:
-        """Camera serial number"""
-        return self.__b["CameraSN"]
-
-    @property
-    def PortType(self) -> str:
-        """Camera port type"""
-        return self.__b["PortType"]
-
-    @property
-    def DeviceID(self) -> int:
-        """Camera device ID"""
-        return self.__b["DeviceID"]
-
-    @property
-    def CameraID(self) -> int:
-        """Camera ID"""
-        return self.__b["CameraID"]
+    __slots__ = {
+        'FriendlyName': "Camera friendly name",
+        'CameraSN': "Camera serial number",
+        'PortType': "Camera port type",
+        'DeviceID': "Camera device ID",
+        'CameraID': "Camera ID"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        self.FriendlyName, self.CameraSN, self.PortType, self.DeviceID, self.CameraID = b
 
 
 class SVB_CAMERA_PROPERTY:
-
-    @property
-    def MaxHeight(self) -> int:
-        """the max height of the camera"""
-        return self.__b["MaxHeight"]
-
-    @property
-    def MaxWidth(self) -> int:
-        """the max width of the camera"""
-        return self.__b["MaxWidth"]
-
-    @property
-    def IsColorCam(self) -> bool:
-        """is camera color"""
-        return bool(self.__b["BayerPattern"] != 0)
-
-    @property
-    def BayerPattern(self) -> SVB_BAYER_PATTERN:
-        """camera bayern pattern"""
-        return SVB_BAYER_PATTERN(self.__b["BayerPattern"])
-
-    @property
-    def SupportedBins(self) -> 'list[int]':
-        """list of supported binning methods"""
-        return self.__b["SupportedBins"]
-
-    @property
-    def SupportedVideoFormat(self) -> 'list[SVB_IMG_TYPE]':
-        """list of supported video formats"""
-        return [SVB_IMG_TYPE(el) for el in self.__b["SupportedVideoFormat"]]
-
-    @property
-    def MaxBitDepth(self) -> int:
-        return self.__b["MaxBitDepth"]
-
-    @property
-    def IsTriggerCam(self) -> bool:
-        return bool(self.__b["IsTriggerCam"] != 0)
+    __slots__ = {
+        'MaxHeight': "the max height of the camera",
+        'MaxWidth': "the max width of the camera",
+        'IsColorCam': "is camera color",
+        'BayerPattern': "camera bayern pattern",
+        'SupportedBins': "list of supported binning methods",
+        'SupportedVideoFormat': "list of supported video formats",
+        'MaxBitDepth': "max bit depth of the sensor",
+        'IsTriggerCam': "camera supports trigger modes"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        max_height, max_width, is_color_cam, bayer_pattern, bins, video_formats, max_bit_depth, is_trigger_cam = b
+        self.MaxHeight = max_height
+        self.MaxWidth = max_width
+        self.IsColorCam = bool(is_color_cam)
+        self.BayerPattern = SVB_BAYER_PATTERN(bayer_pattern)
+        self.SupportedBins = list(bins)
+        self.SupportedVideoFormat = [SVB_IMG_TYPE(el) for el in video_formats]
+        self.MaxBitDepth = max_bit_depth
+        self.IsTriggerCam = bool(is_trigger_cam != 0)
 
 
 class SVB_CAMERA_PROPERTY_EX:
-
-    @property
-    def bSupportPulseGuide(self) -> bool:
-        """Support pulse guide"""
-        return bool(self.__b["bSupportPulseGuide"])
-
-    @property
-    def bSupportControlTemp(self) -> bool:
-        """Support control temp"""
-        return bool(self.__b["bSupportControlTemp"])
+    __slots__ = {
+        'bSupportPulseGuide': "Support pulse guide",
+        'bSupportControlTemp': "Support control temp"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        support_pulse_guide, support_control_temp = b
+        self.bSupportPulseGuide = bool(support_pulse_guide)
+        self.bSupportControlTemp = bool(support_control_temp)
 
 
 class SVB_CONTROL_CAPS:
-
-    @property
-    def Name(self) -> str:
-        """Control name"""
-        return self.__b["Name"]
-
-    @property
-    def Description(self) -> str:
-        """Control description"""
-        return self.__b["Description"]
-
-    @property
-    def MaxValue(self) -> int:
-        """Control max value"""
-        return self.__b["MaxValue"]
-
-    @property
-    def MinValue(self) -> int:
-        """Control min value"""
-        return self.__b["MinValue"]
-
-    @property
-    def DefaultValue(self) -> int:
-        """Control default value"""
-        return self.__b["DefaultValue"]
-
-    @property
-    def IsAutoSupported(self) -> bool:
-        """Support auto set"""
-        return bool(self.__b["IsAutoSupported"] != 0)
-
-    @property
-    def IsWritable(self) -> bool:
-        """Control is writable"""
-        return bool(self.__b["IsWritable"] != 0)
-
-    @property
-    def ControlType(self) -> SVB_CONTROL_TYPE:
-        """Control type, used to get value and set value of the control"""
-        return SVB_CONTROL_TYPE(self.__b["ControlType"])
+    __slots__ = {
+        'Name': "Control name",
+        'Description': "Control description",
+        'MaxValue': "Control max value",
+        'MinValue': "Control min value",
+        'DefaultValue': "Control default value",
+        'IsAutoSupported': "Support auto set",
+        'IsWritable': "Control is writable",
+        'ControlType': "Control type, used to get value and set value of the control"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        self.Name, self.Description, self.MaxValue, self.MinValue, self.DefaultValue, \
+            is_auto_supported, is_writable, control_type = b
+        self.IsAutoSupported = bool(is_auto_supported != 0)
+        self.IsWritable = bool(is_writable != 0)
+        self.ControlType = SVB_CONTROL_TYPE(control_type)
 
 
 class SVB_SUPPORTED_MODE:
-
-    @property
-    def SupportedCameraMode(self) -> 'list[SVB_CAMERA_MODE]':
-        """This list will content with the support camera mode types"""
-        return [SVB_CAMERA_MODE(el) for el in self.__b["SupportedCameraMode"]]
+    __slots__ = {
+        'SupportedCameraMode': "This list will content with the support camera mode types"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        self.SupportedCameraMode = [SVB_CAMERA_MODE(el) for el in b]
 
 
 class SVB_ID:
-
-    @property
-    def id(self) -> str:
-        """Camera serial number"""
-        return self.__b['id']
+    __slots__ = {
+        'id': "Camera serial number"
+    }
 
     def __init__(self, b) -> None:
-        self.__b = b
+        self.id = b
 
 
 @dataclass
@@ -309,16 +240,48 @@ class SVB_CAMERA_UPGRADE_STATUS:
     "Required firmware min version"""
 
 
+@dataclass
+class SVB_RING_CAPTURE_STATS:
+    """Ring capture counters dataclass"""
+    frames: int = 0
+    "frames received from the camera"
+    overruns: int = 0
+    "frames dropped because the ring was full"
+    timeouts: int = 0
+    "SVBGetVideoData calls that returned without a frame"
+    high_water: int = 0
+    "maximum number of frames waiting in the ring"
+    queued: int = 0
+    "frames currently waiting in the ring"
+    depth: int = 0
+    "number of slots of the ring"
+
+
 class PySVBCameraSDK:
 
-    def __init__(self, raise_exc=True) -> None:
+    def __init__(self, raise_exc=True, metadata_store: CameraMetadataStore = None, backend=None) -> None:
         """Initialize class
 
         Args:
             raise_exc (bool, optional): Enable raise of exceptions. Defaults to True.
+            metadata_store (CameraMetadataStore, optional): on-disk database of the cameras metadata, loaded by
+                open_camera to skip the enumeration. Defaults to None (metadata is read from the camera).
+            backend (SVBBackend, optional): sdk backend, e.g. SVBSimulator. Defaults to None (see get_default_backend).
         """
+        self.__backend = backend if backend is not None else get_default_backend()
         self.__last_error_code_p = SVB_CAMERA_ERRORS.SVB_SUCCESS
         self.__raise_exc = raise_exc
+        self.__frame_pools = {}
+        self.__trigger_executor = None
+        self.__trigger_workers = 0
+        self.__open_cameras = set()
+        self.__metadata = {}
+        self.__metadata_store = metadata_store
+
+    @property
+    def backend(self):
+        """Sdk backend used by this instance"""
+        return self.__backend
 
     @property
     def __last_error_code(self) -> SVB_CAMERA_ERRORS:
@@ -347,7 +310,7 @@ class PySVBCameraSDK:
         Returns:
             str: version string
         """
-        return svbcamerasdk.SVBGetSDKVersion()
+        return self.__backend.SVBGetSDKVersion()
 
     def get_num_of_connected_cameras(self) -> int:
         """This should be the first API to be called get number of connected SVB cameras.
@@ -357,7 +320,7 @@ class PySVBCameraSDK:
             int: number of connected SVB cameras. 1 means 1 camera connected.
         """
 
-        return svbcamerasdk.SVBGetNumOfConnectedCameras()
+        return self.__backend.SVBGetNumOfConnectedCameras()
 
     def get_camera_info(self, camera_index: int) -> SVB_CAMERA_INFO:
         """Get the information of the connected cameras, you can do this without open the camera.
@@ -369,7 +332,7 @@ class PySVBCameraSDK:
             SVB_CAMERA_INFO: structure containing the information of camera
         """
 
-        binfo, err = svbcamerasdk.SVBGetCameraInfo(camera_index)
+        binfo, err = self.__backend.SVBGetCameraInfo(camera_index)
         self.__last_error_code = err
         return SVB_CAMERA_INFO(binfo)
 
@@ -382,9 +345,13 @@ class PySVBCameraSDK:
         Returns:
             SVB_CAMERA_PROPERTY: structure containing the properties of camera
         """
-        binfo, err = svbcamerasdk.SVBGetCameraProperty(camera_id)
+        cached = self.__cache_get(camera_id, 'property')
+        if cached is not None:
+            return cached
+
+        binfo, err = self.__backend.SVBGetCameraProperty(camera_id)
         self.__last_error_code = err
-        return SVB_CAMERA_PROPERTY(binfo)
+        return self.__cache_put(camera_id, 'property', SVB_CAMERA_PROPERTY(binfo))
 
     def get_camera_property_ex(self, camera_id: int) -> SVB_CAMERA_PROPERTY_EX:
         """Get the extra properties of the connected cameras.
@@ -395,9 +362,13 @@ class PySVBCameraSDK:
         Returns:
             SVB_CAMERA_PROPERTY_EX: structure containing the extra properties of camera
         """
-        binfo, err = svbcamerasdk.SVBGetCameraPropertyEx(camera_id)
+        cached = self.__cache_get(camera_id, 'property_ex')
+        if cached is not None:
+            return cached
+
+        binfo, err = self.__backend.SVBGetCameraPropertyEx(camera_id)
         self.__last_error_code = err
-        return SVB_CAMERA_PROPERTY_EX(binfo)
+        return self.__cache_put(camera_id, 'property_ex', SVB_CAMERA_PROPERTY_EX(binfo))
 
     def open_camera(self, camera_id: int) -> None:
         """Open the camera before any operation to the camera, this will not affect the camera which is capturing.
@@ -405,8 +376,12 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBOpenCamera(camera_id)
+        err = self.__backend.SVBOpenCamera(camera_id)
+        if err == SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            self.__open_cameras.add(camera_id)
         self.__last_error_code = err
+        if err == SVB_CAMERA_ERRORS.SVB_SUCCESS and self.__metadata_store is not None:
+            self.__load_metadata(camera_id)
 
     def close_camera(self, camera_id: int) -> None:
         """You need to close the camera to free all the resource.
@@ -414,9 +389,24 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBCloseCamera(camera_id)
+        self.__frame_pools.pop(camera_id, None)
+        self.refresh(camera_id)
+        self.__open_cameras.discard(camera_id)
+        if not self.__open_cameras:
+            self.__shutdown_trigger_executor(wait=False)
+        err = self.__backend.SVBCloseCamera(camera_id)
         self.__last_error_code = err
 
+    def close(self) -> None:
+        """Wait for the pending trigger_async calls and stop their worker threads, the cameras are not closed"""
+        self.__shutdown_trigger_executor(wait=True)
+
+    def __enter__(self) -> 'PySVBCameraSDK':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def get_num_of_controls(self, camera_id: int) -> int:
         """Get number of controls available for this camera. The camera need be opened at first.
 
@@ -426,9 +416,13 @@ class PySVBCameraSDK:
         Returns:
             int: number of controls
         """
-        res, err = svbcamerasdk.SVBGetNumOfControls(camera_id)
+        cached = self.__cache_get(camera_id, 'num_of_controls')
+        if cached is not None:
+            return cached
+
+        res, err = self.__backend.SVBGetNumOfControls(camera_id)
         self.__last_error_code = err
-        return res
+        return self.__cache_put(camera_id, 'num_of_controls', res)
 
     def get_control_caps(self, camera_id: int, control_index: int) -> SVB_CONTROL_CAPS:
         """Get controls property available for this camera. The camera need be opened at first.
@@ -440,9 +434,52 @@ class PySVBCameraSDK:
         Returns:
             SVB_CONTROL_CAPS: structure containing the property of the control
         """
-        res, err = svbcamerasdk.SVBGetControlCaps(camera_id, control_index)
+        cached = self.__cache_get(camera_id, ('control_caps', control_index))
+        if cached is not None:
+            return cached
+
+        res, err = self.__backend.SVBGetControlCaps(camera_id, control_index)
         self.__last_error_code = err
-        return SVB_CONTROL_CAPS(res)
+        return self.__cache_put(camera_id, ('control_caps', control_index), SVB_CONTROL_CAPS(res))
+
+    def get_all_control_caps(self, camera_id: int) -> 'dict[SVB_CONTROL_TYPE, SVB_CONTROL_CAPS]':
+        """Get the property of every control available for this camera, indexed by control type.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            dict[SVB_CONTROL_TYPE, SVB_CONTROL_CAPS]: controls property by control type
+        """
+        cached = self.__cache_get(camera_id, 'control_caps_by_type')
+        if cached is not None:
+            return cached
+
+        caps_by_type = {}
+        for i in range(0, self.get_num_of_controls(camera_id)):
+            caps = self.get_control_caps(camera_id, i)
+            if self.__last_error_code != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+                return caps_by_type
+            caps_by_type[caps.ControlType] = caps
+
+        return self.__cache_put(camera_id, 'control_caps_by_type', caps_by_type)
+
+    def get_control_caps_by_type(self, camera_id: int, control_type: SVB_CONTROL_TYPE) -> SVB_CONTROL_CAPS:
+        """Get control property by control type instead of index. The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            control_type (SVB_CONTROL_TYPE): control type
+
+        Returns:
+            SVB_CONTROL_CAPS: structure containing the property of the control, None if the camera has not the control
+                and exceptions are disabled
+        """
+        caps = self.get_all_control_caps(camera_id).get(control_type)
+        if caps is None and self.__last_error_code == SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            self.__last_error_code = SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_CONTROL_TYPE
+        return caps
 
     def get_control_value(self, camera_id: int, control_type: SVB_CONTROL_TYPE) -> 'tuple[int, bool]':
         """Get controls property value and auto value. Note: the value of the temperature is the float value * 10 to convert it to long type,
@@ -456,7 +493,7 @@ class PySVBCameraSDK:
         Returns:
             Tuple[int, bool]: property value, auto value
         """
-        res, auto, err = svbcamerasdk.SVBGetControlValue(
+        res, auto, err = self.__backend.SVBGetControlValue(
             camera_id, control_type)
         self.__last_error_code = err
         return res, bool(auto != 0)
@@ -471,10 +508,50 @@ class PySVBCameraSDK:
             b_auto (bool): set the control auto
         """
         b_auto_i = int(b_auto == True)
-        err = svbcamerasdk.SVBSetControlValue(
+        err = self.__backend.SVBSetControlValue(
             camera_id, control_type, control_value, b_auto_i)
         self.__last_error_code = err
 
+    def get_control_values(self, camera_id: int, control_types: 'list[SVB_CONTROL_TYPE]' = None) \
+            -> 'tuple[dict[SVB_CONTROL_TYPE, tuple[int, bool]], dict[SVB_CONTROL_TYPE, SVB_CAMERA_ERRORS]]':
+        """Get the value and auto value of many controls with a single sdk call. The camera need be opened at first.
+            Controls that can not be read are reported in the errors mapping, the last error code is set
+            (and the exception raised) only if every control failed.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            control_types (list[SVB_CONTROL_TYPE], optional): controls to read. Defaults to None (every control of the camera).
+
+        Returns:
+            Tuple[dict[SVB_CONTROL_TYPE, Tuple[int, bool]], dict[SVB_CONTROL_TYPE, SVB_CAMERA_ERRORS]]: (property value,
+                auto value) by control type, error code by control type of the controls that failed
+        """
+        if control_types is None:
+            control_types = list(self.get_all_control_caps(camera_id))
+
+        values, errors, err = self.__backend.SVBGetControlValues(camera_id, control_types)
+        self.__last_error_code = err
+        values = {SVB_CONTROL_TYPE(control_type): (value, bool(auto != 0)) for control_type, (value, auto) in values.items()}
+        errors = {SVB_CONTROL_TYPE(control_type): SVB_CAMERA_ERRORS(e) for control_type, e in errors.items()}
+        return values, errors
+
+    def set_control_values(self, camera_id: int, controls: 'dict[SVB_CONTROL_TYPE, tuple[int, bool]]') \
+            -> 'dict[SVB_CONTROL_TYPE, SVB_CAMERA_ERRORS]':
+        """Set the value and auto value of many controls with a single sdk call. The camera need be opened at first.
+            Controls that can not be set are reported in the returned mapping, the last error code is set
+            (and the exception raised) only if every control failed.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            controls (dict[SVB_CONTROL_TYPE, Tuple[int, bool]]): (value, auto) by control type, a plain value means auto off
+
+        Returns:
+            dict[SVB_CONTROL_TYPE, SVB_CAMERA_ERRORS]: error code by control type of the controls that failed
+        """
+        errors, err = self.__backend.SVBSetControlValues(camera_id, dict(controls))
+        self.__last_error_code = err
+        return {SVB_CONTROL_TYPE(control_type): SVB_CAMERA_ERRORS(e) for control_type, e in errors.items()}
+
     def get_output_image_type(self, camera_id: int) -> SVB_IMG_TYPE:
         """Get the output image type. The camera need be opened at first.
 
@@ -484,7 +561,7 @@ class PySVBCameraSDK:
         Returns:
             SVB_IMG_TYPE: current image type
         """
-        img_type, err = svbcamerasdk.SVBGetOutputImageType(camera_id)
+        img_type, err = self.__backend.SVBGetOutputImageType(camera_id)
         self.__last_error_code = err
         return SVB_IMG_TYPE(img_type)
 
@@ -496,8 +573,9 @@ class PySVBCameraSDK:
             camera_id (int): this is get from the camera info (use get_camera_info)
             type (SVB_IMG_TYPE): image type
         """
-        err = svbcamerasdk.SVBSetOutputImageType(camera_id, type)
+        err = self.__backend.SVBSetOutputImageType(camera_id, type)
         self.__last_error_code = err
+        self.__resize_frame_pool(camera_id)
 
     def set_roi_format(self, camera_id: int, roi_format: SVB_ROI_FORMAT) -> None:
         """Set the ROI area before capture. You must stop capture before call it.
@@ -509,10 +587,11 @@ class PySVBCameraSDK:
             camera_id (int): this is get from the camera info (use get_camera_info)
             roi_format (SVB_ROI_FORMAT): roi format paramas dataclass to be set
         """
-        err = svbcamerasdk.SVBSetROIFormat(
+        err = self.__backend.SVBSetROIFormat(
             camera_id, roi_format.start_x, roi_format.start_y,
             roi_format.width, roi_format.height, roi_format.bin)
         self.__last_error_code = err
+        self.__resize_frame_pool(camera_id)
 
     def get_roi_format(self, camera_id: int) -> SVB_ROI_FORMAT:
         """Get the current ROI area setting. The camera need be opened at first.
@@ -524,10 +603,22 @@ class PySVBCameraSDK:
             SVB_ROI_FORMAT: roi format paramas dataclass
         """
         start_x, start_y,\
-            width, height, bin, err = svbcamerasdk.SVBGetROIFormat(camera_id)
+            width, height, bin, err = self.__backend.SVBGetROIFormat(camera_id)
         self.__last_error_code = err
         return SVB_ROI_FORMAT(start_x, start_y, width, height, bin)
 
+    def get_frame_buffer_size(self, camera_id: int) -> int:
+        """Get the size in bytes of one frame with the current ROI area and output image type.
+           The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            int: frame size in bytes, use it to size the buffers of get_video_data and get_video_data_into
+        """
+        return frame_buffer_size(self.get_roi_format(camera_id), self.get_output_image_type(camera_id))
+
     def get_dropped_frames(self, camera_id: int) -> int:
         """Get dropped frames number. The camera need be opened at first.
            Drop frames happen when USB is traffic or harddisk write speed is slow it will reset to 0 after stop capture.
@@ -539,7 +630,7 @@ class PySVBCameraSDK:
         Returns:
             int: dropped frames
         """
-        df, err = svbcamerasdk.SVBGetDroppedFrames(camera_id)
+        df, err = self.__backend.SVBGetDroppedFrames(camera_id)
         self.__last_error_code = err
         return df
 
@@ -550,7 +641,7 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBStartVideoCapture(camera_id)
+        err = self.__backend.SVBStartVideoCapture(camera_id)
         self.__last_error_code = err
 
     def stop_video_capture(self, camera_id: int):
@@ -559,7 +650,7 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBStopVideoCapture(camera_id)
+        err = self.__backend.SVBStopVideoCapture(camera_id)
         self.__last_error_code = err
 
     def get_video_data(self, camera_id: int, buff_size: int, wait_ms: int) -> bytes:
@@ -578,10 +669,266 @@ class PySVBCameraSDK:
         Returns:
             bytes: buffer data
         """
-        data, err = svbcamerasdk.SVBGetVideoData(camera_id, buff_size, wait_ms)
+        data, err = self.__backend.SVBGetVideoData(camera_id, buff_size, wait_ms)
         self.__last_error_code = err
         return data
 
+    def get_default_wait_ms(self, camera_id: int) -> int:
+        """Get the recommended wait value of get_video_data for the current exposure: exposure*2+500ms.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            int: wait value (milliseconds)
+        """
+        exposure, _ = self.get_control_value(camera_id, SVB_CONTROL_TYPE.SVB_EXPOSURE)
+        return int(exposure / 1000) * 2 + 500
+
+    def get_video_data_into(self, camera_id: int, buffer, wait_ms: int, buff_size: int = -1) -> int:
+        """Get data from the video buffer straight into a caller supplied writable buffer (bytearray, memoryview,
+            numpy array, mmap...), without allocations or copies. Same constraints of get_video_data apply.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            buffer: writable contiguous buffer that receives the frame
+            wait_ms (int): wait value (milliseconds), this value is recommend set to exposure*2+500ms
+            buff_size (int, optional): bytes of the buffer handed to the SDK (use frame_buffer_size), -1 means the whole buffer.
+                Defaults to -1.
+
+        Returns:
+            int: bytes written into the buffer
+        """
+        written, err = self.__backend.SVBGetVideoDataInto(camera_id, buffer, wait_ms, buff_size)
+        self.__last_error_code = err
+        return written
+
+    def get_video_frame_array(self, camera_id: int, wait_ms: int, out=None):
+        """Get data from the video buffer as a numpy array, uint8 for RAW8/Y8, uint16 for RAW10-16/Y10-16,
+            (height, width, 3/4) uint8 for RGB24/RGB32. The SDK writes straight into the array, no copies are made.
+            Requires numpy. The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds), this value is recommend set to exposure*2+500ms
+            out (numpy.ndarray, optional): contiguous array that receives the frame, reuse it (see get_frame_array_format)
+                to avoid allocations. Defaults to None (allocate a new array).
+
+        Returns:
+            numpy.ndarray: the frame, None on error when exceptions are disabled
+        """
+        if out is None:
+            import numpy as np
+            shape, dtype = self.get_frame_array_format(camera_id)
+            out = np.empty(shape, dtype=dtype)
+
+        written = self.get_video_data_into(camera_id, out, wait_ms, out.nbytes)
+        return out if written else None
+
+    def get_frame_array_format(self, camera_id: int) -> 'tuple[tuple, str]':
+        """Get the numpy shape and dtype of the frames with the current ROI area and output image type.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            Tuple[tuple, str]: array shape, numpy dtype name
+        """
+        roi_format = self.get_roi_format(camera_id)
+        image_type = self.get_output_image_type(camera_id)
+        return frame_shape(roi_format, image_type), image_type_to_dtype(image_type)
+
+    def create_frame_pool(self, camera_id: int, count: int = 4) -> FramePool:
+        """Create the pool of preallocated frame buffers used by get_video_frame, sized from the current ROI area
+            and output image type. The pool follows set_roi_format and set_output_image_type and is dropped by close_camera.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            count (int, optional): number of buffers, bounds the capture memory. Defaults to 4.
+
+        Returns:
+            FramePool: the camera frame pool
+        """
+        pool = FramePool(self.get_frame_buffer_size(camera_id), count)
+        self.__frame_pools[camera_id] = pool
+        return pool
+
+    def get_frame_pool(self, camera_id: int) -> FramePool:
+        """Get the frame pool of the camera, it is created with the default size if needed.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            FramePool: the camera frame pool
+        """
+        pool = self.__frame_pools.get(camera_id)
+        if pool is None:
+            pool = self.create_frame_pool(camera_id)
+        return pool
+
+    def get_video_frame(self, camera_id: int, wait_ms: int, pool_timeout: float = None) -> FrameBuffer:
+        """Get data from the video buffer into a buffer leased from the camera frame pool (see get_video_data).
+            Release the returned frame (or use it as a context manager) to recycle its buffer.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds), this value is recommend set to exposure*2+500ms
+            pool_timeout (float, optional): seconds to wait for a free buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            FrameBuffer: leased frame buffer, None on error when exceptions are disabled
+        """
+        return self.read_video_frame(camera_id, wait_ms, pool_timeout)[0]
+
+    def read_video_frame(self, camera_id: int, wait_ms: int, pool_timeout: float = None) \
+            -> 'tuple[FrameBuffer, SVB_CAMERA_ERRORS]':
+        """Variant of get_video_frame returning the error code of this call too. Unlike last_error_code, which is
+            shared by the threads using this instance, it can be checked safely when exceptions are disabled.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds), this value is recommend set to exposure*2+500ms
+            pool_timeout (float, optional): seconds to wait for a free buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            Tuple[FrameBuffer, SVB_CAMERA_ERRORS]: leased frame buffer (None on error when exceptions are disabled),
+                error code of the call
+        """
+        frame = self.get_frame_pool(camera_id).acquire(pool_timeout)
+        try:
+            written, err = self.__backend.SVBGetVideoDataInto(camera_id, frame.buffer, wait_ms, frame.size)
+            self.__last_error_code = err
+        except BaseException:
+            frame.release()
+            raise
+
+        if written == 0:
+            frame.release()
+            return None, SVB_CAMERA_ERRORS(err)
+
+        return frame, SVB_CAMERA_ERRORS(err)
+
+    def start_ring_capture(self, camera_id: int, depth: int = 8, wait_ms: int = None) -> None:
+        """Start video capture and a native thread that drains the video buffer as fast as possible into a ring of depth
+            frames, then you can pop the frames at your own pace with get_ring_frame or get_ring_frame_into.
+            When the ring is full the oldest frame is dropped and counted as overrun (see get_ring_capture_stats).
+            The camera need be opened at first, ROI area and output image type can't change until stop_ring_capture.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            depth (int, optional): number of frames the ring can hold. Defaults to 8.
+            wait_ms (int, optional): wait value (milliseconds) of each SVBGetVideoData call of the thread, it bounds the time
+                needed by stop_ring_capture so it must be positive: -1 (wait forever) would keep stop_ring_capture from
+                joining the thread and 0 would make the thread spin. Defaults to None (exposure*2+500ms).
+        """
+        if wait_ms is None:
+            wait_ms = self.get_default_wait_ms(camera_id)
+        elif wait_ms <= 0:
+            raise ValueError("ring capture wait_ms must be positive")
+
+        buff_size = self.get_frame_buffer_size(camera_id)
+        self.start_video_capture(camera_id)
+        err = self.__backend.SVBStartRingCapture(camera_id, depth, buff_size, wait_ms)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            self.__backend.SVBStopVideoCapture(camera_id)
+        self.__last_error_code = err
+
+    def stop_ring_capture(self, camera_id: int) -> SVB_RING_CAPTURE_STATS:
+        """Stop the ring capture thread and the video capture. Frames still in the ring are discarded.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            SVB_RING_CAPTURE_STATS: final counters of the ring capture
+        """
+        *stats, err = self.__backend.SVBStopRingCapture(camera_id)
+        self.__last_error_code = err
+        self.stop_video_capture(camera_id)
+        return SVB_RING_CAPTURE_STATS(*stats)
+
+    def get_ring_capture_stats(self, camera_id: int) -> SVB_RING_CAPTURE_STATS:
+        """Get the counters of the running ring capture, use them to size the ring depth.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            SVB_RING_CAPTURE_STATS: ring capture counters
+        """
+        *stats, err = self.__backend.SVBGetRingCaptureStats(camera_id)
+        self.__last_error_code = err
+        return SVB_RING_CAPTURE_STATS(*stats)
+
+    def get_ring_frame_into(self, camera_id: int, buffer, wait_ms: int) -> 'tuple[int, int, float]':
+        """Pop the oldest frame of the ring capture into a caller supplied writable buffer.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            buffer: writable contiguous buffer, at least get_frame_buffer_size bytes
+            wait_ms (int): wait value (milliseconds) for a frame, -1 means wait forever
+
+        Returns:
+            Tuple[int, int, float]: bytes written, frame sequence number, monotonic timestamp (seconds) of the frame arrival
+        """
+        written, sequence, timestamp, err = self.__backend.SVBGetRingFrameInto(camera_id, buffer, wait_ms)
+        self.__last_error_code = err
+        return written, sequence, timestamp
+
+    def get_ring_frame(self, camera_id: int, wait_ms: int, pool_timeout: float = None) -> FrameBuffer:
+        """Pop the oldest frame of the ring capture into a buffer leased from the camera frame pool.
+            Release the returned frame (or use it as a context manager) to recycle its buffer.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds) for a frame, -1 means wait forever
+            pool_timeout (float, optional): seconds to wait for a free buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            FrameBuffer: leased frame buffer with sequence and timestamp, None on error when exceptions are disabled
+        """
+        return self.read_ring_frame(camera_id, wait_ms, pool_timeout)[0]
+
+    def read_ring_frame(self, camera_id: int, wait_ms: int, pool_timeout: float = None) \
+            -> 'tuple[FrameBuffer, SVB_CAMERA_ERRORS]':
+        """Variant of get_ring_frame returning the error code of this call too (see read_video_frame).
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds) for a frame, -1 means wait forever
+            pool_timeout (float, optional): seconds to wait for a free buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            Tuple[FrameBuffer, SVB_CAMERA_ERRORS]: leased frame buffer with sequence and timestamp (None on error when
+                exceptions are disabled), error code of the call
+        """
+        frame = self.get_frame_pool(camera_id).acquire(pool_timeout)
+        try:
+            written, sequence, timestamp, err = self.__backend.SVBGetRingFrameInto(camera_id, frame.buffer, wait_ms)
+            self.__last_error_code = err
+        except BaseException:
+            frame.release()
+            raise
+
+        if written == 0:
+            frame.release()
+            return None, SVB_CAMERA_ERRORS(err)
+
+        frame.sequence, frame.timestamp = sequence, timestamp
+        return frame, SVB_CAMERA_ERRORS(err)
+
+    def __resize_frame_pool(self, camera_id: int) -> None:
+        pool = self.__frame_pools.get(camera_id)
+        if pool is not None and self.__last_error_code == SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            pool.resize(self.get_frame_buffer_size(camera_id))
+
     def white_balance_once(self, camera_id: int) -> None:
         """White balance once time. If success, please get SVB_WB_R, SVB_WB_G and SVB_WB_B values to update UI display.
             The camera need be opened at first.
@@ -590,7 +937,7 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBWhiteBalanceOnce(camera_id)
+        err = self.__backend.SVBWhiteBalanceOnce(camera_id)
         self.__last_error_code = err
 
     def get_camera_firmware_version(self, camera_id, buff_size=64) -> str:
@@ -601,7 +948,7 @@ class PySVBCameraSDK:
             buff_size (int): buffer size, form firmware version string, which needs to be at least 64 bytes in size (default)
         """
 
-        data, err = svbcamerasdk.SVBGetCameraFirmwareVersion(
+        data, err = self.__backend.SVBGetCameraFirmwareVersion(
             camera_id, buff_size)
         self.__last_error_code = err
         return str(data).strip()
@@ -617,9 +964,13 @@ class PySVBCameraSDK:
         Returns:
             SVB_SUPPORTED_MODE: the camera supported mode
         """
-        modes, err = svbcamerasdk.SVBGetCameraSupportMode(camera_id)
+        cached = self.__cache_get(camera_id, 'support_mode')
+        if cached is not None:
+            return cached
+
+        modes, err = self.__backend.SVBGetCameraSupportMode(camera_id)
         self.__last_error_code = err
-        return SVB_SUPPORTED_MODE(modes)
+        return self.__cache_put(camera_id, 'support_mode', SVB_SUPPORTED_MODE(modes))
 
     def get_camera_mode(self, camera_id: int) -> SVB_CAMERA_MODE:
         """Get the camera current mode, only need to call when the IsTriggerCam in the CameraInfo is true
@@ -632,7 +983,7 @@ class PySVBCameraSDK:
         Returns:
             SVB_CAMERA_MODE: the current camera mode
         """
-        mode, err = svbcamerasdk.SVBGetCameraMode(camera_id)
+        mode, err = self.__backend.SVBGetCameraMode(camera_id)
         self.__last_error_code = err
         return SVB_CAMERA_MODE(mode)
 
@@ -644,7 +995,7 @@ class PySVBCameraSDK:
             camera_id (int): this is get from the camera info (use get_camera_info)
             mode (SVB_CAMERA_MODE): this is get from the camera property (use get_camera_property)
         """
-        err = svbcamerasdk.SVBSetCameraMode(camera_id, mode)
+        err = self.__backend.SVBSetCameraMode(camera_id, mode)
         self.__last_error_code = err
 
     def send_soft_trigger(self, camera_id: int) -> None:
@@ -657,8 +1008,60 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBSendSoftTrigger(camera_id)
+        err = self.__backend.SVBSendSoftTrigger(camera_id)
+        self.__last_error_code = err
+
+    def trigger_and_wait(self, camera_id: int, exposure_us: int = None, pool_timeout: float = None) -> FrameBuffer:
+        """Send out a softTrigger and block until the exposed frame arrives, without polling: the wait happens inside
+            the SDK with a timeout of exposure*2+500ms. Video capture must be started in SVB_MODE_TRIG_SOFT mode.
+            The camera need be opened at first.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            exposure_us (int, optional): exposure (microseconds) used to compute the timeout. Defaults to None (read from the camera).
+            pool_timeout (float, optional): seconds to wait for a free frame buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            FrameBuffer: leased frame buffer, None on error when exceptions are disabled
+        """
+        if exposure_us is None:
+            wait_ms = self.get_default_wait_ms(camera_id)
+        else:
+            wait_ms = int(exposure_us / 1000) * 2 + 500
+
+        # The error of this call, last_error_code may be set meanwhile by the other trigger_async workers
+        err = self.__backend.SVBSendSoftTrigger(camera_id)
         self.__last_error_code = err
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return None
+
+        return self.get_video_frame(camera_id, wait_ms, pool_timeout)
+
+    def trigger_async(self, camera_id: int, exposure_us: int = None) -> Future:
+        """Future returning variant of trigger_and_wait, the wait runs on a worker thread: many triggered cameras can be
+            waited together with concurrent.futures.wait, or awaited with asyncio.wrap_future.
+            There is a worker thread for each open camera, they are stopped by close or when the last camera is closed.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            exposure_us (int, optional): exposure (microseconds) used to compute the timeout. Defaults to None (read from the camera).
+
+        Returns:
+            Future: future of the FrameBuffer returned by trigger_and_wait
+        """
+        workers = max(len(self.__open_cameras), 1)
+        if self.__trigger_executor is None or workers > self.__trigger_workers:
+            # Grown with the open cameras, the pending waits of the old executor still complete
+            self.__shutdown_trigger_executor(wait=False)
+            self.__trigger_executor = ThreadPoolExecutor(workers, "svb-trigger")
+            self.__trigger_workers = workers
+        return self.__trigger_executor.submit(self.trigger_and_wait, camera_id, exposure_us)
+
+    def __shutdown_trigger_executor(self, wait: bool) -> None:
+        if self.__trigger_executor is not None:
+            self.__trigger_executor.shutdown(wait=wait)
+            self.__trigger_executor = None
+            self.__trigger_workers = 0
 
     def get_serial_number(self, camera_id: int) -> SVB_ID:
         """Get a serial number from a camera. The camera need be opened at first.
@@ -669,7 +1072,7 @@ class PySVBCameraSDK:
         Returns:
             SVB_ID: SVB_ID structure
         """
-        sn, err = svbcamerasdk.SVBGetSerialNumber(camera_id)
+        sn, err = self.__backend.SVBGetSerialNumber(camera_id)
         self.__last_error_code = err
         return SVB_ID(sn)
 
@@ -684,7 +1087,7 @@ class PySVBCameraSDK:
             pin (SVB_TRIG_OUTPUT) : select the pin for output
             trigger_conf (SVB_TRIGGER_OUTPUT_IO_CONF): trigger configuration dataclass
         """
-        err = svbcamerasdk.SVBSetTriggerOutputIOConf(camera_id, pin,
+        err = self.__backend.SVBSetTriggerOutputIOConf(camera_id, pin,
                                                      int(trigger_conf.pin_high == True), trigger_conf.delay, trigger_conf.duration)
         self.__last_error_code = err
 
@@ -699,7 +1102,7 @@ class PySVBCameraSDK:
             SVB_TRIGGER_OUTPUT_IO_CONF: trigger configuration dataclass
         """
 
-        pin_high, delay, duration, err = svbcamerasdk.SVBGetTriggerOutputIOConf(
+        pin_high, delay, duration, err = self.__backend.SVBGetTriggerOutputIOConf(
             camera_id, pin)
         self.__last_error_code = err
         return SVB_TRIGGER_OUTPUT_IO_CONF(bool(pin_high != 0), delay, duration)
@@ -714,7 +1117,7 @@ class PySVBCameraSDK:
             duration (int): duration of pulse in missilseconds
         """
 
-        err = svbcamerasdk.SVBPulseGuide(camera_id, direction, duration)
+        err = self.__backend.SVBPulseGuide(camera_id, direction, duration)
         self.__last_error_code = err
 
     def get_sensor_pixel_size(self, camera_id: int) -> float:
@@ -726,9 +1129,13 @@ class PySVBCameraSDK:
         Returns:
             float: pixel size in microns
         """
-        size, err = svbcamerasdk.SVBGetSensorPixelSize(camera_id)
+        cached = self.__cache_get(camera_id, 'pixel_size')
+        if cached is not None:
+            return cached
+
+        size, err = self.__backend.SVBGetSensorPixelSize(camera_id)
         self.__last_error_code = err
-        return size
+        return self.__cache_put(camera_id, 'pixel_size', size)
 
     def can_pulse_guide(self, camera_id: int) -> bool:
         """Get whether to support pulse guide.
@@ -741,7 +1148,7 @@ class PySVBCameraSDK:
         Returns:
             bool: if True then support pulse guide
         """
-        can, err = svbcamerasdk.SVBCanPulseGuide(camera_id)
+        can, err = self.__backend.SVBCanPulseGuide(camera_id)
         self.__last_error_code = err
         return bool(can != 0)
 
@@ -752,7 +1159,7 @@ class PySVBCameraSDK:
             camera_id (int): this is get from the camera info (use get_camera_info)
             enable (bool): if True then save the parameter file automatically
         """
-        err = svbcamerasdk.SVBSetAutoSaveParam(camera_id, int(enable == True))
+        err = self.__backend.SVBSetAutoSaveParam(camera_id, int(enable == True))
         self.__last_error_code = err
 
     def is_camera_need_to_upgrade(self, camera_id: int, buff_size=64) -> SVB_CAMERA_UPGRADE_STATUS:
@@ -762,7 +1169,7 @@ class PySVBCameraSDK:
             camera_id (int): this is get from the camera info (use get_camera_info)
             buff_size (int): buffer size, for min firmware version string, which needs to be at least 64 bytes in size (default)
         """
-        needed, min_version, err = svbcamerasdk.SVBIsCameraNeedToUpgrade(camera_id, buff_size)
+        needed, min_version, err = self.__backend.SVBIsCameraNeedToUpgrade(camera_id, buff_size)
         self.__last_error_code = err
         return SVB_CAMERA_UPGRADE_STATUS(bool(needed != 0), str(min_version).strip())
     
@@ -773,5 +1180,99 @@ class PySVBCameraSDK:
         Args:
             camera_id (int): this is get from the camera info (use get_camera_info)
         """
-        err = svbcamerasdk.SVBRestoreDefaultParam(camera_id)
-        self.__last_error_code = err
\ No newline at end of file
+        self.refresh(camera_id)
+        err = self.__backend.SVBRestoreDefaultParam(camera_id)
+        self.__last_error_code = err
+
+    def refresh(self, camera_id: int = None) -> None:
+        """Drop the cached camera metadata (properties, controls property, supported modes, pixel size),
+            it will be read again from the camera on next use.
+
+        Args:
+            camera_id (int, optional): this is get from the camera info (use get_camera_info). Defaults to None (every camera).
+        """
+        if camera_id is None:
+            self.__metadata.clear()
+        else:
+            self.__metadata.pop(camera_id, None)
+
+    def __load_metadata(self, camera_id: int) -> None:
+        # Serial number and firmware are read anyway, everything else comes from the store when not stale
+        sn, err = self.__backend.SVBGetSerialNumber(camera_id)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return
+        firmware, err = self.__backend.SVBGetCameraFirmwareVersion(camera_id, 64)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return
+        firmware = str(firmware).strip()
+        sdk_version = self.sdk_version
+
+        metadata = self.__metadata_store.load(sn, firmware, sdk_version)
+        if metadata is None:
+            metadata = self.__enumerate_metadata(camera_id)
+            if metadata is None:
+                return
+            try:
+                self.__metadata_store.save(sn, firmware, sdk_version, metadata)
+            except OSError:
+                pass
+
+        try:
+            cache = {
+                'property': SVB_CAMERA_PROPERTY(metadata['property']),
+                'property_ex': SVB_CAMERA_PROPERTY_EX(metadata['property_ex']),
+                'num_of_controls': len(metadata['control_caps']),
+                'pixel_size': metadata['pixel_size']
+            }
+            for i, caps in enumerate(metadata['control_caps']):
+                cache[('control_caps', i)] = SVB_CONTROL_CAPS(caps)
+            if metadata['support_mode'] is not None:
+                cache['support_mode'] = SVB_SUPPORTED_MODE(metadata['support_mode'])
+        except (KeyError, TypeError, ValueError):
+            self.__metadata_store.remove(sn)
+            return
+        self.__metadata[camera_id] = cache
+
+    def __enumerate_metadata(self, camera_id: int) -> dict:
+        prop, err = self.__backend.SVBGetCameraProperty(camera_id)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return None
+        prop_ex, err = self.__backend.SVBGetCameraPropertyEx(camera_id)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return None
+        ncontrols, err = self.__backend.SVBGetNumOfControls(camera_id)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return None
+        control_caps = []
+        for i in range(0, ncontrols):
+            caps, err = self.__backend.SVBGetControlCaps(camera_id, i)
+            if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+                return None
+            control_caps.append(caps)
+        support_mode = None
+        if SVB_CAMERA_PROPERTY(prop).IsTriggerCam:
+            support_mode, err = self.__backend.SVBGetCameraSupportMode(camera_id)
+            if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+                return None
+        pixel_size, err = self.__backend.SVBGetSensorPixelSize(camera_id)
+        if err != SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            return None
+
+        return {
+            'property': prop,
+            'property_ex': prop_ex,
+            'control_caps': control_caps,
+            'support_mode': support_mode,
+            'pixel_size': pixel_size
+        }
+
+    def __cache_get(self, camera_id: int, key):
+        value = self.__metadata.get(camera_id, {}).get(key)
+        if value is not None:
+            self.__last_error_code = SVB_CAMERA_ERRORS.SVB_SUCCESS
+        return value
+
+    def __cache_put(self, camera_id: int, key, value):
+        if self.__last_error_code == SVB_CAMERA_ERRORS.SVB_SUCCESS:
+            self.__metadata.setdefault(camera_id, {})[key] = value
+        return value
\ No newline at end of file
@@ -0,0 +1,150 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Camera configuration snapshots
+#
+
+from dataclasses import dataclass, field, replace
+
+from pysvb.camera import SVB_CAMERA_MODE, SVB_CONTROL_TYPE, SVB_IMG_TYPE, SVB_ROI_FORMAT, PySVBCameraSDK
+from pysvb.errors import SVB_CAMERA_ERRORS
+
+
+@dataclass
+class SVB_CONFIG_APPLY_STATS:
+    """Result of CameraConfig.apply dataclass"""
+    calls: int = 0
+    "sdk set calls issued, video capture stop/start included"
+    saved_calls: int = 0
+    "sdk set calls skipped because the camera already had the value"
+    restarted: bool = False
+    "video capture was stopped and started again"
+    errors: 'dict[SVB_CONTROL_TYPE, SVB_CAMERA_ERRORS]' = field(default_factory=dict)
+    "error code by control type of the controls that could not be set"
+    state: 'CameraConfig' = None
+    "camera configuration after apply, pass it as current to the next apply"
+
+
+@dataclass
+class CameraConfig:
+    """Snapshot of the settings of a camera: ROI, output image type, camera mode and control values.
+       Fields left to None (and controls not in the mapping) are not part of the snapshot and are never written.
+
+       planetary = CameraConfig.capture(sdk, camera_id)
+       ...
+       stats = planetary.apply(sdk, camera_id, current=stats.state)
+    """
+    roi: SVB_ROI_FORMAT = None
+    "roi format"
+    image_type: SVB_IMG_TYPE = None
+    "output image type"
+    mode: SVB_CAMERA_MODE = None
+    "camera mode, trigger cameras only"
+    controls: 'dict[SVB_CONTROL_TYPE, tuple[int, bool]]' = field(default_factory=dict)
+    "(value, auto) by control type"
+
+    @classmethod
+    def capture(cls, sdk: PySVBCameraSDK, camera_id: int) -> 'CameraConfig':
+        """Read the current settings of a camera, every writable control is included.
+            The camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance, raising exceptions
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            CameraConfig: camera configuration
+        """
+        writable = [control_type for control_type, caps in sdk.get_all_control_caps(camera_id).items()
+                    if caps.IsWritable]
+        values, _ = sdk.get_control_values(camera_id, writable)
+        mode = sdk.get_camera_mode(camera_id) if sdk.get_camera_property(camera_id).IsTriggerCam else None
+
+        return cls(sdk.get_roi_format(camera_id), sdk.get_output_image_type(camera_id), mode, values)
+
+    def diff(self, current: 'CameraConfig') -> 'CameraConfig':
+        """Get the settings of this configuration that differ from another one. A control set to auto
+            on both sides is unchanged whatever its value.
+
+        Args:
+            current (CameraConfig): configuration to compare with, usually the current one of the camera
+
+        Returns:
+            CameraConfig: settings to write to go from current to this configuration
+        """
+        controls = {}
+        for control_type, (value, auto) in self.controls.items():
+            old = current.controls.get(control_type)
+            if old is None or old[1] != auto or (not auto and old[0] != value):
+                controls[control_type] = (value, auto)
+
+        return CameraConfig(self.roi if self.roi is not None and self.roi != current.roi else None,
+                            self.image_type if self.image_type is not None and self.image_type != current.image_type else None,
+                            self.mode if self.mode is not None and self.mode != current.mode else None,
+                            controls)
+
+    def apply(self, sdk: PySVBCameraSDK, camera_id: int, current: 'CameraConfig' = None,
+              capturing: bool = False) -> SVB_CONFIG_APPLY_STATS:
+        """Write to the camera only the settings that differ from its current configuration. Camera mode,
+            image type and ROI need the video capture stopped: if the camera is capturing it is stopped and
+            started again once, and only when one of them changes. The camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance, raising exceptions
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            current (CameraConfig, optional): known configuration of the camera, usually the state of the
+                previous apply. Defaults to None (read from the camera with capture).
+            capturing (bool, optional): video capture of the camera is running. Defaults to False.
+
+        Returns:
+            SVB_CONFIG_APPLY_STATS: calls issued and saved, errors and configuration of the camera after apply
+        """
+        if current is None:
+            current = CameraConfig.capture(sdk, camera_id)
+
+        changes = self.diff(current)
+        state = replace(current, controls=dict(current.controls))
+        stats = SVB_CONFIG_APPLY_STATS(state=state)
+
+        full = sum(value is not None for value in (self.roi, self.image_type, self.mode)) + len(self.controls)
+        restart = capturing and any(value is not None for value in (changes.roi, changes.image_type, changes.mode))
+        if capturing and any(value is not None for value in (self.roi, self.image_type, self.mode)):
+            # Writing everything blindly would restart the capture too
+            full += 2
+
+        if restart:
+            sdk.stop_video_capture(camera_id)
+            stats.calls += 1
+            stats.restarted = True
+
+        try:
+            # Mode first, image type before ROI so that the frame size is computed once
+            if changes.mode is not None:
+                sdk.set_camera_mode(camera_id, changes.mode)
+                state.mode = changes.mode
+                stats.calls += 1
+            if changes.image_type is not None:
+                sdk.set_output_image_type(camera_id, changes.image_type)
+                state.image_type = changes.image_type
+                stats.calls += 1
+            if changes.roi is not None:
+                sdk.set_roi_format(camera_id, changes.roi)
+                state.roi = replace(changes.roi)
+                stats.calls += 1
+        finally:
+            if restart:
+                sdk.start_video_capture(camera_id)
+                stats.calls += 1
+
+        if changes.controls:
+            stats.errors = sdk.set_control_values(camera_id, changes.controls)
+            stats.calls += len(changes.controls)
+            for control_type, value in changes.controls.items():
+                if control_type in stats.errors:
+                    state.controls.pop(control_type, None)
+                else:
+                    state.controls[control_type] = value
+
+        stats.saved_calls = full - stats.calls
+        return stats
@@ -0,0 +1,153 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Camera object and frame streaming
+#
+
+from time import monotonic
+from typing import Iterator
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.errors import SVB_CAMERA_ERRORS, SvbonyCameraError
+from pysvb.pool import FrameBuffer
+
+
+class SVBCamera:
+    """One opened camera: wraps PySVBCameraSDK calls for a camera_id and streams its frames.
+
+       with SVBCamera(camera_id) as camera:
+           for frame in camera.frames(max_frames=100):
+               process(frame.data)
+    """
+
+    def __init__(self, camera_id: int, sdk: PySVBCameraSDK = None, pool_size: int = 4) -> None:
+        """Initialize class, the camera is opened by open or by the context manager.
+
+        Args:
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            sdk (PySVBCameraSDK, optional): sdk instance to use. Defaults to None (a new one raising exceptions).
+            pool_size (int, optional): number of frame buffers recycled by frames. Defaults to 4.
+        """
+        self.__camera_id = camera_id
+        self.__sdk = sdk if sdk is not None else PySVBCameraSDK()
+        self.__pool_size = pool_size
+        self.__opened = False
+        self.__capturing = False
+        self.__ring = False
+
+    @property
+    def camera_id(self) -> int:
+        """Camera ID"""
+        return self.__camera_id
+
+    @property
+    def sdk(self) -> PySVBCameraSDK:
+        """Sdk instance used by the camera"""
+        return self.__sdk
+
+    @property
+    def opened(self) -> bool:
+        """The camera is opened"""
+        return self.__opened
+
+    @property
+    def capturing(self) -> bool:
+        """Video capture is running"""
+        return self.__capturing
+
+    def open(self) -> None:
+        """Open the camera"""
+        if not self.__opened:
+            self.__sdk.open_camera(self.__camera_id)
+            self.__opened = True
+
+    def close(self) -> None:
+        """Stop the video capture if needed and close the camera"""
+        if not self.__opened:
+            return
+        try:
+            self.stop_capture()
+        finally:
+            self.__opened = False
+            self.__sdk.close_camera(self.__camera_id)
+
+    def start_capture(self) -> None:
+        """Start video capture"""
+        if not self.__capturing:
+            self.__sdk.start_video_capture(self.__camera_id)
+            self.__capturing = True
+
+    def stop_capture(self) -> None:
+        """Stop video capture (and the ring capture thread started by frames)"""
+        if not self.__capturing:
+            return
+        self.__capturing = False
+        if self.__ring:
+            self.__ring = False
+            self.__sdk.stop_ring_capture(self.__camera_id)
+        else:
+            self.__sdk.stop_video_capture(self.__camera_id)
+
+    def frames(self, wait_ms: int = None, max_frames: int = None, ring_depth: int = 0) -> 'Iterator[FrameBuffer]':
+        """Stream the frames of the camera, video capture is started if needed and always stopped when the
+            iteration ends, breaks or the generator is closed. Frames are leased from the camera frame pool,
+            the buffer is recycled when the frame is released or dropped: keep at most pool_size frames alive.
+            A timeout just means no frame yet and does not stop the stream.
+
+        Args:
+            wait_ms (int, optional): wait value (milliseconds) of each frame. Defaults to None (exposure*2+500ms).
+            max_frames (int, optional): stop after this number of frames. Defaults to None (endless stream).
+            ring_depth (int, optional): when greater than 0 frames are drained by the native ring capture thread
+                (see start_ring_capture) so that a slow consumer does not drop frames on the camera side. Defaults to 0.
+
+        Yields:
+            FrameBuffer: frame with sequence number and monotonic timestamp
+        """
+        sdk, camera_id = self.__sdk, self.__camera_id
+
+        if wait_ms is None:
+            wait_ms = sdk.get_default_wait_ms(camera_id)
+
+        # Buffers are sized once from the current geometry and reused for the whole stream
+        sdk.create_frame_pool(camera_id, self.__pool_size)
+
+        if ring_depth > 0:
+            sdk.start_ring_capture(camera_id, ring_depth, wait_ms)
+            self.__capturing = self.__ring = True
+            read = sdk.read_ring_frame
+        else:
+            self.start_capture()
+            read = sdk.read_video_frame
+
+        sequence = 0
+        try:
+            while max_frames is None or sequence < max_frames:
+                try:
+                    frame, err = read(camera_id, wait_ms)
+                except SvbonyCameraError.Timeout:
+                    continue
+
+                if frame is None:
+                    # The error of this call, the sdk may be shared with other threads (see MultiCameraCapture)
+                    if err == SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT:
+                        continue
+                    break
+
+                if frame.sequence is None:
+                    frame.sequence = sequence
+                    frame.timestamp = monotonic()
+                sequence += 1
+
+                yield frame
+                # Let the buffer go back to the pool as soon as the consumer drops it
+                frame = None
+        finally:
+            self.stop_capture()
+
+    def __enter__(self) -> 'SVBCamera':
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
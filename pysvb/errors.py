@@ -154,6 +154,11 @@ class SvbonyCameraError:
         def __init__(self):
             super().__init__()
 
+    class PoolExhausted(Exception):
+        """No free frame buffer in the pool exception"""
+        def __init__(self):
+            super().__init__()
+
     class PyInternalError(Exception):
         """Python internal error exception"""
         def __init__(self):
@@ -0,0 +1,323 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Asynchronous FITS writer, requires numpy
+#
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from pysvb.camera import SVB_BAYER_PATTERN, SVB_CONTROL_TYPE, SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.helpers import image_type_to_bpp, image_type_to_dtype
+from pysvb.pool import FrameBuffer
+
+FITS_BLOCK = 2880
+"""FITS files are made of 2880 bytes blocks"""
+
+_BAYER_PATTERNS = {
+    SVB_BAYER_PATTERN.SVB_BAYER_RG: 'RGGB',
+    SVB_BAYER_PATTERN.SVB_BAYER_BG: 'BGGR',
+    SVB_BAYER_PATTERN.SVB_BAYER_GR: 'GRBG',
+    SVB_BAYER_PATTERN.SVB_BAYER_GB: 'GBRG'
+}
+
+# Samples converted at once by the 16 bit and RGB paths
+_CHUNK = 1 << 20
+
+
+def fits_card(keyword: str, value=None, comment: str = "") -> bytes:
+    """Format a FITS header card.
+
+    Args:
+        keyword (str): keyword, up to 8 characters
+        value (optional): bool, int, float or str value. Defaults to None (commentary card).
+        comment (str, optional): comment. Defaults to "".
+
+    Returns:
+        bytes: 80 bytes card
+    """
+    keyword = keyword.upper()
+    if len(keyword) > 8:
+        raise ValueError("FITS keyword {} longer than 8 characters".format(keyword))
+
+    if value is None:
+        card = keyword.ljust(8) + comment
+    else:
+        if isinstance(value, bool):
+            text = ('T' if value else 'F').rjust(20)
+        elif isinstance(value, int):
+            text = str(value).rjust(20)
+        elif isinstance(value, float):
+            text = repr(value).upper().rjust(20)
+        else:
+            text = "'{}'".format(str(value).replace("'", "''").ljust(8))
+        card = keyword.ljust(8) + "= " + text
+        if comment:
+            card += " / " + comment
+    return card[:80].ljust(80).encode('ascii', 'replace')
+
+
+class FitsWriter:
+    """Write frames to FITS files on a pool of background threads: submit returns as soon as the frame is queued,
+       so the capture loop is free for the next trigger. The queue is bounded, submit blocks when it is full.
+       Headers get the camera controls (exposure, gain, temperature) read by submit, at capture time, plus the
+       fixed camera metadata (ROI, binning, serial number...) read once. FrameBuffer frames are released
+       by the writer once written.
+
+       8 bit samples are written straight from the frame buffer. FITS stores 16 bit samples as big endian
+       signed integers with BZERO = 32768: they are converted in chunks through a small scratch buffer, the
+       frame is never copied whole. RGB frames are written as three planes (NAXIS3 = 3) in R, G, B order.
+
+       with FitsWriter.from_camera(sdk, camera_id, workers=2) as fits:
+           for i in range(0, 100):
+               fits.submit("light_{:04d}.fits".format(i), sdk.trigger_and_wait(camera_id))
+    """
+
+    def __init__(self, shape: tuple, image_type: SVB_IMG_TYPE, header: dict = None, workers: int = 1,
+                 queue_size: int = 4) -> None:
+        """Initialize class
+
+        Args:
+            shape (tuple): frame shape, (height, width) or (height, width, channels) (see get_frame_array_format)
+            image_type (SVB_IMG_TYPE): image type of the frames
+            header (dict, optional): cards added to every file, {keyword: value or (value, comment)}. Defaults to None.
+            workers (int, optional): writer threads. Defaults to 1.
+            queue_size (int, optional): frames queued or being written before submit blocks. Defaults to 4.
+        """
+        self.__shape = tuple(shape)
+        self.__image_type = SVB_IMG_TYPE(image_type)
+        self.__header = dict(header) if header else {}
+        self.__workers = max(workers, 1)
+        self.__slots = threading.BoundedSemaphore(max(queue_size, 1))
+        self.__executor = ThreadPoolExecutor(self.__workers, "svb-fits")
+        self.__scratch = threading.local()
+        self.__sdk = None
+        self.__camera_id = None
+        # Frame timestamps are monotonic, they are moved to the wall clock with the offset of the creation
+        self.__clock_offset = time.time() - time.monotonic()
+
+    @classmethod
+    def from_camera(cls, sdk: PySVBCameraSDK, camera_id: int, header: dict = None, workers: int = 1,
+                    queue_size: int = 4) -> 'FitsWriter':
+        """Create a writer for the frames of a camera with its current ROI area and output image type.
+            The fixed camera metadata is read now, submit reads the controls of every frame.
+            The camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            header (dict, optional): more cards added to every file, {keyword: value or (value, comment)}. Defaults to None.
+            workers (int, optional): writer threads. Defaults to 1.
+            queue_size (int, optional): frames queued or being written before submit blocks. Defaults to 4.
+
+        Returns:
+            FitsWriter: writer of the camera frames
+        """
+        shape, _ = sdk.get_frame_array_format(camera_id)
+        image_type = sdk.get_output_image_type(camera_id)
+        roi = sdk.get_roi_format(camera_id)
+        prop = sdk.get_camera_property(camera_id)
+
+        cards = {}
+        for i in range(0, sdk.get_num_of_connected_cameras()):
+            info = sdk.get_camera_info(i)
+            if info.CameraID == camera_id:
+                cards['INSTRUME'] = (info.FriendlyName, "camera")
+                break
+        cards['SERIALNO'] = (sdk.get_serial_number(camera_id).id, "camera serial number")
+        pixel_size = sdk.get_sensor_pixel_size(camera_id) * roi.bin
+        cards['XPIXSZ'] = (pixel_size, "pixel width (microns, binning included)")
+        cards['YPIXSZ'] = (pixel_size, "pixel height (microns, binning included)")
+        cards['XBINNING'] = (roi.bin, "binning factor")
+        cards['YBINNING'] = (roi.bin, "binning factor")
+        cards['XORGSUBF'] = (roi.start_x, "ROI start X")
+        cards['YORGSUBF'] = (roi.start_y, "ROI start Y")
+        if prop.IsColorCam and image_type < SVB_IMG_TYPE.SVB_IMG_Y8:
+            cards['BAYERPAT'] = (_BAYER_PATTERNS[prop.BayerPattern], "Bayer pattern")
+        cards['ROWORDER'] = ('TOP-DOWN', "order of the rows")
+        cards.update(header or {})
+
+        writer = cls(shape, image_type, cards, workers, queue_size)
+        writer.__sdk = sdk
+        writer.__camera_id = camera_id
+        return writer
+
+    @property
+    def workers(self) -> int:
+        """Writer threads"""
+        return self.__workers
+
+    def capture_header(self) -> dict:
+        """Read the controls of the camera for the header of the next frame: exposure, gain and sensor temperature.
+
+        Returns:
+            dict: cards {keyword: (value, comment)}, empty if the writer was not created from a camera
+        """
+        if self.__sdk is None:
+            return {}
+
+        values, _ = self.__sdk.get_control_values(self.__camera_id, [
+            SVB_CONTROL_TYPE.SVB_EXPOSURE, SVB_CONTROL_TYPE.SVB_GAIN, SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE])
+
+        cards = {}
+        if SVB_CONTROL_TYPE.SVB_EXPOSURE in values:
+            cards['EXPTIME'] = (values[SVB_CONTROL_TYPE.SVB_EXPOSURE][0] / 1e6, "exposure (s)")
+        if SVB_CONTROL_TYPE.SVB_GAIN in values:
+            cards['GAIN'] = (values[SVB_CONTROL_TYPE.SVB_GAIN][0], "sensor gain")
+        if SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE in values:
+            # Temperature is in 0.1C
+            cards['CCD-TEMP'] = (values[SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE][0] / 10, "sensor temperature (C)")
+        return cards
+
+    def submit(self, path: str, frame, header: dict = None, timestamp: float = None, timeout: float = None) -> Future:
+        """Queue a frame to be written, blocking while the queue is full.
+
+        Args:
+            path (str): FITS file path, the file is written aside and renamed when complete
+            frame: FrameBuffer (released once written), or buffer of the frame samples (not to be modified until written)
+            header (dict, optional): cards of this frame, {keyword: value or (value, comment)}. Defaults to None
+                (capture_header, the camera controls read now).
+            timestamp (float, optional): monotonic capture time (seconds) for DATE-OBS. Defaults to None
+                (the FrameBuffer timestamp, or now).
+            timeout (float, optional): seconds to wait for room in the queue, None means wait forever. Defaults to None.
+
+        Returns:
+            Future: future of the path, it raises the error of the write
+        """
+        if header is None:
+            header = self.capture_header()
+        if timestamp is None:
+            timestamp = frame.timestamp if isinstance(frame, FrameBuffer) else None
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        cards = dict(self.__header)
+        cards.update(header)
+        # DATE-OBS is the start of the exposure, the timestamp is taken when the frame arrives
+        exptime = cards.get('EXPTIME', 0.0)
+        exptime = exptime[0] if isinstance(exptime, tuple) else exptime
+        start = datetime.fromtimestamp(timestamp + self.__clock_offset - exptime, timezone.utc)
+        cards['DATE-OBS'] = (start.isoformat(timespec='microseconds')[:26], "UTC start of the exposure")
+
+        if not self.__slots.acquire(timeout=timeout):
+            raise TimeoutError("FITS writer queue is full")
+        try:
+            future = self.__executor.submit(self.__write, path, frame, cards)
+        except BaseException:
+            self.__slots.release()
+            raise
+        future.add_done_callback(lambda _: self.__slots.release())
+        return future
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the writer threads.
+
+        Args:
+            wait (bool, optional): wait for the queued frames to be written. Defaults to True.
+        """
+        self.__executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __write(self, path: str, frame, cards: dict) -> str:
+        try:
+            data = frame.data if isinstance(frame, FrameBuffer) else frame
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp = tempfile.mkstemp(".part", os.path.basename(path) + ".", directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    write_fits(f, data, self.__shape, self.__image_type, cards, self.__scratch_buffer())
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            return path
+        finally:
+            if isinstance(frame, FrameBuffer):
+                frame.release()
+
+    def __scratch_buffer(self):
+        import numpy as np
+
+        # One conversion buffer per writer thread
+        scratch = getattr(self.__scratch, 'buffer', None)
+        if scratch is None:
+            scratch = self.__scratch.buffer = np.empty(_CHUNK, dtype='>i2')
+        return scratch
+
+    def __enter__(self) -> 'FitsWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_fits(f, data, shape: tuple, image_type: SVB_IMG_TYPE, header: dict = None, scratch=None) -> None:
+    """Write a frame as a FITS file, see FitsWriter.
+
+    Args:
+        f: binary file object
+        data: buffer of the frame samples (bytes, memoryview, FrameBuffer.data, ndarray...)
+        shape (tuple): frame shape, (height, width) or (height, width, channels)
+        image_type (SVB_IMG_TYPE): image type of the frame
+        header (dict, optional): cards {keyword: value or (value, comment)}. Defaults to None.
+        scratch (numpy.ndarray, optional): '>i2' conversion buffer reused between calls. Defaults to None.
+    """
+    import numpy as np
+
+    samples = np.frombuffer(data, dtype=image_type_to_dtype(image_type), count=int(np.prod(shape))).reshape(shape)
+    height, width = shape[:2]
+    planes = 3 if len(shape) > 2 else 1
+    wide = samples.dtype.itemsize == 2
+
+    cards = [fits_card('SIMPLE', True, "conforms to FITS standard"),
+             fits_card('BITPIX', 16 if wide else 8, "bits per sample"),
+             fits_card('NAXIS', 3 if planes > 1 else 2, "number of axes"),
+             fits_card('NAXIS1', width, "image width"),
+             fits_card('NAXIS2', height, "image height")]
+    if planes > 1:
+        cards.append(fits_card('NAXIS3', planes, "R, G, B planes"))
+    if wide:
+        cards += [fits_card('BZERO', 32768, "unsigned 16 bit samples"), fits_card('BSCALE', 1)]
+        bits = min(image_type_to_bpp(image_type), 16)
+        if bits < 16:
+            cards.append(fits_card('BITDEPTH', bits, "significant bits per sample"))
+    for keyword, value in (header or {}).items():
+        value, comment = value if isinstance(value, tuple) else (value, "")
+        cards.append(fits_card(keyword, value, comment))
+    cards.append(fits_card('END'))
+
+    head = b''.join(cards)
+    f.write(head + b' ' * (-len(head) % FITS_BLOCK))
+
+    if planes > 1:
+        # BGR(A) interleaved samples to R, G, B planes
+        planes_data = [samples[..., c] for c in (2, 1, 0)]
+    else:
+        planes_data = [samples]
+
+    written = 0
+    for plane in planes_data:
+        if not wide and plane.flags.c_contiguous:
+            f.write(memoryview(plane).cast('B'))
+            written += plane.nbytes
+            continue
+
+        rows = max(_CHUNK // width, 1)
+        if wide and (scratch is None or scratch.size < rows * width):
+            scratch = np.empty(rows * width, dtype='>i2')
+        for y in range(0, height, rows):
+            block = plane[y:y + rows]
+            if wide:
+                # v - 32768 as big endian int16 is v with the top bit flipped, byte swapped
+                out = scratch[:block.size].reshape(block.shape)
+                np.bitwise_xor(block, 0x8000, out=out.view('>u2'))
+            else:
+                out = np.ascontiguousarray(block)
+            f.write(memoryview(out).cast('B'))
+            written += out.nbytes
+
+    f.write(b'\0' * (-written % FITS_BLOCK))
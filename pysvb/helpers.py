@@ -54,3 +54,54 @@ def image_type_to_bpp(image_type):
     }
 
     return types[image_type]
+
+
+def image_type_to_bytes_per_pixel(image_type):
+    """Bytes used by one pixel in the frame buffer, RAW10/12/14 are delivered in 16 bit containers"""
+    return (image_type_to_bpp(image_type) + 7) // 8
+
+
+def frame_buffer_size(roi_format, image_type):
+    """Size in bytes of one frame with the given roi format (SVB_ROI_FORMAT) and image type (SVB_IMG_TYPE)"""
+    return roi_format.width * roi_format.height * image_type_to_bytes_per_pixel(image_type)
+
+
+def image_type_to_dtype(image_type):
+    """Numpy dtype name of the pixels of the image type, RAW10/12/14 and Y10/12/14 are delivered in 16 bit containers"""
+    from pysvb.camera import SVB_IMG_TYPE
+
+    if image_type in (SVB_IMG_TYPE.SVB_IMG_RAW8, SVB_IMG_TYPE.SVB_IMG_Y8,
+                      SVB_IMG_TYPE.SVB_IMG_RGB24, SVB_IMG_TYPE.SVB_IMG_RGB32):
+        return 'uint8'
+
+    return '<u2'
+
+
+def frame_shape(roi_format, image_type):
+    """Array shape of one frame: (height, width) or (height, width, channels) for RGB24/RGB32"""
+    from pysvb.camera import SVB_IMG_TYPE
+
+    channels = {
+        SVB_IMG_TYPE.SVB_IMG_RGB24: 3,
+        SVB_IMG_TYPE.SVB_IMG_RGB32: 4
+    }
+
+    if image_type in channels:
+        return (roi_format.height, roi_format.width, channels[image_type])
+
+    return (roi_format.height, roi_format.width)
+
+
+def frame_as_ndarray(buffer, roi_format, image_type):
+    """View a frame buffer (bytes, bytearray, memoryview, FrameBuffer.data...) as a numpy array
+       with the dtype and shape of the image type, without copying it. Requires numpy.
+    """
+    import numpy as np
+
+    shape = frame_shape(roi_format, image_type)
+    dtype = np.dtype(image_type_to_dtype(image_type))
+    count = 1
+    for dim in shape:
+        count *= dim
+
+    return np.frombuffer(buffer, dtype=dtype, count=count).reshape(shape)
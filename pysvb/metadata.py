@@ -0,0 +1,103 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# On-disk camera metadata store
+#
+
+import json
+import os
+import re
+import tempfile
+
+
+class CameraMetadataStore:
+    """On-disk database of the static metadata of the cameras (properties, controls property, supported modes),
+       one JSON document per camera serial number. An entry is stale, and ignored, when it was written with
+       another camera firmware or sdk version. Several processes can share the same directory.
+
+       sdk = PySVBCameraSDK(metadata_store=CameraMetadataStore("~/.cache/pysvb"))
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        """Initialize class
+
+        Args:
+            path (str): directory of the database, created on first save
+        """
+        self.__path = os.path.expanduser(path)
+
+    @property
+    def path(self) -> str:
+        """Directory of the database"""
+        return self.__path
+
+    def load(self, serial_number: str, firmware_version: str, sdk_version: str) -> dict:
+        """Load the metadata of a camera.
+
+        Args:
+            serial_number (str): camera serial number (use get_serial_number)
+            firmware_version (str): camera firmware version (use get_camera_firmware_version)
+            sdk_version (str): sdk version (use sdk_version)
+
+        Returns:
+            dict: stored metadata, None if missing, unreadable or stale
+        """
+        try:
+            with open(self.__file(serial_number), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or \
+                entry.get("format") != self.FORMAT_VERSION or \
+                entry.get("serial_number") != serial_number or \
+                entry.get("firmware_version") != firmware_version or \
+                entry.get("sdk_version") != sdk_version:
+            return None
+        return entry.get("metadata")
+
+    def save(self, serial_number: str, firmware_version: str, sdk_version: str, metadata: dict) -> None:
+        """Store the metadata of a camera, replacing the previous entry.
+
+        Args:
+            serial_number (str): camera serial number (use get_serial_number)
+            firmware_version (str): camera firmware version (use get_camera_firmware_version)
+            sdk_version (str): sdk version (use sdk_version)
+            metadata (dict): JSON serializable metadata
+        """
+        entry = {
+            "format": self.FORMAT_VERSION,
+            "serial_number": serial_number,
+            "firmware_version": firmware_version,
+            "sdk_version": sdk_version,
+            "metadata": metadata
+        }
+
+        os.makedirs(self.__path, exist_ok=True)
+        # Readers of other processes see either the old or the new entry, never a partial one
+        fd, tmp = tempfile.mkstemp(prefix=".svb-", suffix=".tmp", dir=self.__path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self.__file(serial_number))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def remove(self, serial_number: str) -> None:
+        """Remove the entry of a camera, if any.
+
+        Args:
+            serial_number (str): camera serial number (use get_serial_number)
+        """
+        try:
+            os.unlink(self.__file(serial_number))
+        except FileNotFoundError:
+            pass
+
+    def __file(self, serial_number: str) -> str:
+        name = re.sub(r"[^0-9A-Za-z_.-]", "_", serial_number) or "_"
+        return os.path.join(self.__path, name + ".json")
@@ -0,0 +1,210 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Multi camera capture
+#
+
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from time import monotonic
+from typing import Iterator
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.device import SVBCamera
+from pysvb.pool import FrameBuffer
+
+
+@dataclass
+class SVB_CAPTURE_STATS:
+    """Per camera capture counters dataclass"""
+    camera_id: int = -1
+    "camera ID"
+    frames: int = 0
+    "frames captured"
+    fps: float = 0.0
+    "average frames per second since start"
+    dropped_frames: int = 0
+    "frames dropped by the camera (see get_dropped_frames)"
+    error: Exception = None
+    "exception that stopped the capture worker of the camera"
+
+
+class MultiCameraCapture:
+    """Capture from several cameras at once: each camera has its own capture worker thread and the frames
+       of all of them are merged in a single stream tagged by CameraID.
+
+       with MultiCameraCapture() as capture:
+           for camera_id, frame in capture.frames():
+               process(camera_id, frame.data)
+    """
+
+    def __init__(self, sdk: PySVBCameraSDK = None, camera_ids: 'list[int]' = None, wait_ms: int = None,
+                 pool_size: int = 4, queue_size: int = 16, ring_depth: int = 0) -> None:
+        """Initialize class
+
+        Args:
+            sdk (PySVBCameraSDK, optional): sdk instance to use. Defaults to None (a new one raising exceptions).
+            camera_ids (list[int], optional): cameras to capture. Defaults to None (every connected camera).
+            wait_ms (int, optional): wait value (milliseconds) of each frame. Defaults to None (exposure*2+500ms).
+            pool_size (int, optional): frame buffers of each camera. Defaults to 4.
+            queue_size (int, optional): frames waiting in the merged stream, a full queue pauses the workers. Defaults to 16.
+            ring_depth (int, optional): when greater than 0 each camera is drained by the native ring capture thread. Defaults to 0.
+        """
+        self.__sdk = sdk if sdk is not None else PySVBCameraSDK()
+        self.__camera_ids = camera_ids
+        self.__wait_ms = wait_ms
+        self.__pool_size = pool_size
+        self.__ring_depth = ring_depth
+        self.__queue = Queue(queue_size)
+        self.__stop = Event()
+        self.__cameras = {}
+        self.__workers = {}
+        self.__stats = {}
+        self.__started_at = None
+
+    @property
+    def sdk(self) -> PySVBCameraSDK:
+        """Sdk instance used by the cameras"""
+        return self.__sdk
+
+    @property
+    def cameras(self) -> 'dict[int, SVBCamera]':
+        """Opened cameras by CameraID"""
+        return dict(self.__cameras)
+
+    def open(self) -> None:
+        """Open the cameras, every camera found by get_num_of_connected_cameras if no camera_ids were given"""
+        camera_ids = self.__camera_ids
+        if camera_ids is None:
+            connected = self.__sdk.get_num_of_connected_cameras()
+            camera_ids = [self.__sdk.get_camera_info(i).CameraID for i in range(0, connected)]
+
+        try:
+            for camera_id in camera_ids:
+                camera = SVBCamera(camera_id, self.__sdk, self.__pool_size)
+                camera.open()
+                self.__cameras[camera_id] = camera
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop the capture and close the cameras"""
+        self.stop()
+        cameras, self.__cameras = self.__cameras, {}
+        for camera in cameras.values():
+            camera.close()
+
+    def start(self) -> None:
+        """Start one capture worker per camera"""
+        if self.__workers:
+            return
+
+        self.__stop.clear()
+        self.__started_at = monotonic()
+        for camera_id, camera in self.__cameras.items():
+            self.__stats[camera_id] = SVB_CAPTURE_STATS(camera_id)
+            worker = Thread(target=self.__capture, args=(camera,),
+                            name="svb-capture-{}".format(camera_id), daemon=True)
+            self.__workers[camera_id] = worker
+            worker.start()
+
+    def stop(self) -> None:
+        """Stop the capture workers, frames still waiting in the stream are discarded"""
+        self.__stop.set()
+        self.__drain()
+        workers, self.__workers = self.__workers, {}
+        for worker in workers.values():
+            worker.join()
+        self.__drain()
+
+    @property
+    def running(self) -> bool:
+        """At least one capture worker is alive"""
+        return any(worker.is_alive() for worker in self.__workers.values())
+
+    def frames(self, timeout: float = None) -> 'Iterator[tuple[int, FrameBuffer]]':
+        """Merged stream of the frames of every camera, the capture is started if needed.
+            It ends when every worker stopped, or when no frame arrives within timeout.
+
+        Args:
+            timeout (float, optional): seconds to wait for the next frame, None means wait forever. Defaults to None.
+
+        Yields:
+            Tuple[int, FrameBuffer]: CameraID, frame (release it to recycle the buffer)
+        """
+        self.start()
+        waited = 0.0
+        while True:
+            try:
+                item = self.__queue.get(timeout=0.1)
+            except Empty:
+                if not self.running:
+                    return
+                waited += 0.1
+                if timeout is not None and waited >= timeout:
+                    return
+                continue
+
+            waited = 0.0
+            yield item
+
+    def stats(self) -> 'dict[int, SVB_CAPTURE_STATS]':
+        """Get the capture counters of every camera
+
+        Returns:
+            dict[int, SVB_CAPTURE_STATS]: counters by CameraID
+        """
+        elapsed = monotonic() - self.__started_at if self.__started_at else 0.0
+        result = {}
+        for camera_id, stats in self.__stats.items():
+            camera = self.__cameras.get(camera_id)
+            if camera is not None and camera.capturing:
+                stats.dropped_frames = self.__sdk.get_dropped_frames(camera_id)
+            stats.fps = stats.frames / elapsed if elapsed > 0 else 0.0
+            result[camera_id] = SVB_CAPTURE_STATS(**vars(stats))
+        return result
+
+    def __capture(self, camera: SVBCamera) -> None:
+        stats = self.__stats[camera.camera_id]
+        stream = camera.frames(self.__wait_ms, ring_depth=self.__ring_depth)
+        try:
+            for frame in stream:
+                stats.frames += 1
+                if not self.__put((camera.camera_id, frame)):
+                    break
+                frame = None
+        except Exception as e:
+            stats.error = e
+        finally:
+            try:
+                stats.dropped_frames = self.__sdk.get_dropped_frames(camera.camera_id)
+            except Exception:
+                pass
+            stream.close()
+
+    def __put(self, item) -> bool:
+        while not self.__stop.is_set():
+            try:
+                self.__queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def __drain(self) -> None:
+        while True:
+            try:
+                _, frame = self.__queue.get_nowait()
+            except Empty:
+                return
+            frame.release()
+
+    def __enter__(self) -> 'MultiCameraCapture':
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
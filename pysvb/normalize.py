@@ -0,0 +1,187 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Bit depth normalization, requires numpy
+#
+
+from pysvb.camera import SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.helpers import image_type_to_bpp, image_type_to_dtype
+
+
+class FrameNormalizer:
+    """Convert the frames of an image type to a common range. RAW10/12/14 (and Y10/12/14) samples are delivered
+       right aligned in 16 bit containers, the significant bits are those of the image type limited to the sensor
+       MaxBitDepth: samples above it are clipped. Frames can be ndarrays, FrameBuffer.data or any buffer, they are
+       viewed and never copied, conversions write into out when given.
+
+       normalizer = FrameNormalizer.from_camera(sdk, camera_id)
+       with sdk.get_video_frame(camera_id, wait_ms) as frame:
+           preview = normalizer.to_uint8(frame.data, out=preview)
+    """
+
+    def __init__(self, image_type: SVB_IMG_TYPE, max_bit_depth: int = None) -> None:
+        """Initialize class
+
+        Args:
+            image_type (SVB_IMG_TYPE): image type of the frames
+            max_bit_depth (int, optional): sensor bit depth (see get_camera_property). Defaults to None (bits of the image type).
+        """
+        import numpy as np
+
+        self.__image_type = SVB_IMG_TYPE(image_type)
+        self.__dtype = np.dtype(image_type_to_dtype(image_type))
+        container = self.__dtype.itemsize * 8
+        bits = min(image_type_to_bpp(image_type), container)
+        if max_bit_depth:
+            bits = min(bits, max_bit_depth)
+        self.__bits = bits
+        self.__max_value = (1 << bits) - 1
+        self.__shift = container - bits
+        self.__luts = {}
+
+    @classmethod
+    def from_camera(cls, sdk: PySVBCameraSDK, camera_id: int) -> 'FrameNormalizer':
+        """Create a normalizer for the current output image type and the bit depth of a camera.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+
+        Returns:
+            FrameNormalizer: normalizer of the camera frames
+        """
+        return cls(sdk.get_output_image_type(camera_id), sdk.get_camera_property(camera_id).MaxBitDepth)
+
+    @property
+    def image_type(self) -> SVB_IMG_TYPE:
+        """Image type of the frames"""
+        return self.__image_type
+
+    @property
+    def bits(self) -> int:
+        """Significant bits of the samples"""
+        return self.__bits
+
+    @property
+    def max_value(self) -> int:
+        """Largest valid sample"""
+        return self.__max_value
+
+    def array(self, frame):
+        """View a frame with the dtype of the image type, without copying it.
+
+        Args:
+            frame: ndarray, FrameBuffer.data, bytes, bytearray...
+
+        Returns:
+            numpy.ndarray: the frame itself if it is already an ndarray, a 1D view otherwise
+        """
+        import numpy as np
+
+        if isinstance(frame, np.ndarray):
+            return frame
+        return np.frombuffer(frame, dtype=self.__dtype)
+
+    def clip(self, frame):
+        """Clip in place the samples above max_value.
+
+        Args:
+            frame: writable frame (see array)
+
+        Returns:
+            numpy.ndarray: the clipped frame
+        """
+        import numpy as np
+
+        a = self.array(frame)
+        if self.__shift:
+            np.minimum(a, self.__max_value, out=a)
+        return a
+
+    def rescale(self, frame):
+        """Clip and left shift in place the samples to the full range of the container (0-65535 for 16 bit types).
+
+        Args:
+            frame: writable frame (see array)
+
+        Returns:
+            numpy.ndarray: the rescaled frame
+        """
+        import numpy as np
+
+        a = self.clip(frame)
+        if self.__shift:
+            np.left_shift(a, self.__shift, out=a)
+        return a
+
+    def lut(self, func=None, dtype: str = 'uint8'):
+        """Build a lookup table for to_uint8/to_float32, indexed by the sample value up to max_value.
+
+        Args:
+            func (callable, optional): maps normalized values (float64 ndarray in [0, 1]) to normalized values
+                (gamma, stretch...). Defaults to None (linear).
+            dtype (str, optional): 'uint8' (0-255) or 'float32' (0-1). Defaults to 'uint8'.
+
+        Returns:
+            numpy.ndarray: lookup table of max_value + 1 entries
+        """
+        import numpy as np
+
+        values = np.arange(self.__max_value + 1, dtype=np.float64) / self.__max_value
+        if func is not None:
+            values = np.clip(func(values), 0.0, 1.0)
+        if np.dtype(dtype) == np.uint8:
+            return np.rint(values * 255).astype(np.uint8)
+        return values.astype(dtype)
+
+    def to_uint8(self, frame, out=None, lut=None):
+        """Convert a frame to 8 bit with a lookup table, samples above max_value are clipped.
+
+        Args:
+            frame: frame (see array)
+            out (numpy.ndarray, optional): uint8 destination, frame shape. Defaults to None (new array).
+            lut (numpy.ndarray, optional): uint8 lookup table (see lut). Defaults to None (linear).
+
+        Returns:
+            numpy.ndarray: uint8 frame
+        """
+        return self.__take(frame, out, lut, 'uint8')
+
+    def to_float32(self, frame, out=None, lut=None):
+        """Convert a frame to float32 in the range 0-1, samples above max_value are clipped.
+
+        Args:
+            frame: frame (see array)
+            out (numpy.ndarray, optional): float32 destination, frame shape. Defaults to None (new array).
+            lut (numpy.ndarray, optional): float32 lookup table (see lut). Defaults to None (linear).
+
+        Returns:
+            numpy.ndarray: float32 frame
+        """
+        import numpy as np
+
+        a = self.array(frame)
+        if lut is not None or self.__dtype.itemsize == 1:
+            return self.__take(a, out, lut, 'float32')
+
+        if out is None:
+            out = np.empty(a.shape, dtype=np.float32)
+        np.multiply(a, np.float32(1.0 / self.__max_value), out=out, dtype=np.float32)
+        if self.__shift:
+            np.minimum(out, 1.0, out=out)
+        return out
+
+    def __take(self, frame, out, lut, dtype: str):
+        import numpy as np
+
+        if lut is None:
+            lut = self.__luts.get(dtype)
+            if lut is None:
+                lut = self.__luts[dtype] = self.lut(None, dtype)
+
+        a = self.array(frame)
+        if out is None:
+            out = np.empty(a.shape, dtype=lut.dtype)
+        # mode clip maps the samples above max_value to the last entry
+        return np.take(lut, a, out=out, mode='clip')
@@ -0,0 +1,137 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Frame buffer pool
+#
+
+from threading import Condition
+
+from pysvb.errors import SvbonyCameraError
+
+
+class FrameBuffer:
+    """Frame buffer leased from a FramePool, the SDK writes the frame straight into it.
+       Call release (or use it as a context manager) to give it back to the pool,
+       the data must not be used after the release.
+    """
+
+    __slots__ = ('__pool', '__buffer', '__generation', 'size', 'sequence', 'timestamp')
+
+    def __init__(self, pool: 'FramePool', buffer: bytearray, generation: int) -> None:
+        self.__pool = pool
+        self.__buffer = buffer
+        self.__generation = generation
+        self.size = len(buffer)
+        "bytes of frame data in the buffer"
+        self.sequence = None
+        "frame sequence number, when known"
+        self.timestamp = None
+        "frame monotonic timestamp (seconds), when known"
+
+    @property
+    def buffer(self) -> bytearray:
+        """Underlying writable buffer"""
+        return self.__buffer
+
+    @property
+    def generation(self) -> int:
+        """Pool geometry generation the buffer belongs to"""
+        return self.__generation
+
+    @property
+    def data(self) -> memoryview:
+        """Frame data"""
+        return memoryview(self.__buffer)[:self.size]
+
+    @property
+    def released(self) -> bool:
+        """The buffer was given back to the pool"""
+        return self.__pool is None
+
+    def release(self) -> None:
+        """Give the buffer back to the pool"""
+        pool, self.__pool = self.__pool, None
+        if pool is not None:
+            pool._give_back(self.__buffer, self.__generation)
+
+    def __enter__(self) -> 'FrameBuffer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+
+class FramePool:
+    """Fixed number of preallocated frame buffers, recycled between captures.
+       The capture memory is bounded: when every buffer is leased acquire waits for a release.
+    """
+
+    def __init__(self, buffer_size: int, count: int = 4) -> None:
+        """Initialize pool
+
+        Args:
+            buffer_size (int): size in bytes of one frame (use get_frame_buffer_size)
+            count (int, optional): number of buffers. Defaults to 4.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        self.__cond = Condition()
+        self.__count = count
+        self.__buffer_size = buffer_size
+        self.__generation = 0
+        self.__free = [bytearray(buffer_size) for _ in range(count)]
+
+    @property
+    def buffer_size(self) -> int:
+        """Size in bytes of the buffers"""
+        return self.__buffer_size
+
+    @property
+    def count(self) -> int:
+        """Number of buffers of the pool"""
+        return self.__count
+
+    @property
+    def free(self) -> int:
+        """Number of buffers ready to be leased"""
+        with self.__cond:
+            return len(self.__free)
+
+    def acquire(self, timeout: float = None) -> FrameBuffer:
+        """Lease a buffer from the pool
+
+        Args:
+            timeout (float, optional): seconds to wait for a free buffer, None means wait forever. Defaults to None.
+
+        Returns:
+            FrameBuffer: leased buffer
+        """
+        with self.__cond:
+            if not self.__cond.wait_for(lambda: self.__free, timeout):
+                raise SvbonyCameraError.PoolExhausted()
+            return FrameBuffer(self, self.__free.pop(), self.__generation)
+
+    def resize(self, buffer_size: int) -> None:
+        """Change the size of the buffers, leased buffers are replaced when released.
+
+        Args:
+            buffer_size (int): new size in bytes of one frame
+        """
+        with self.__cond:
+            if buffer_size == self.__buffer_size:
+                return
+            self.__generation += 1
+            self.__buffer_size = buffer_size
+            self.__free = [bytearray(buffer_size) for _ in self.__free]
+
+    def _give_back(self, buffer: bytearray, generation: int) -> None:
+        with self.__cond:
+            if generation != self.__generation:
+                buffer = bytearray(self.__buffer_size)
+            self.__free.append(buffer)
+            self.__cond.notify()
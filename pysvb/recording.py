@@ -0,0 +1,497 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Memory mapped recordings with a frame index
+#
+
+import json
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+
+from pysvb.camera import SVB_CONTROL_TYPE, SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.helpers import frame_shape, image_type_to_bytes_per_pixel, image_type_to_dtype
+
+RECORDING_METADATA = "recording.json"
+RECORDING_INDEX = "index.dat"
+RECORDING_SEGMENT = "segment_{:05d}.dat"
+
+# Index header: magic, record size, controls, frame size, frames per segment, closed, frames
+_INDEX_HEADER = struct.Struct('<8sIIQIIQ')
+_INDEX_HEADER_SIZE = 64
+_INDEX_COUNT_OFFSET = 32
+_INDEX_CLOSED_OFFSET = 28
+_INDEX_MAGIC = b"SVBREC01"
+# Index record: frame offset, wall clock timestamp, sequence, then one int64 per control
+_RECORD = '<QdQ'
+_NO_VALUE = -(1 << 63)
+
+DEFAULT_RECORDING_CONTROLS = (SVB_CONTROL_TYPE.SVB_EXPOSURE, SVB_CONTROL_TYPE.SVB_GAIN,
+                              SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE)
+"""Controls stored in the index by default"""
+
+
+@dataclass
+class SVB_RECORDING_ENTRY:
+    """Recording index entry dataclass"""
+    index: int = 0
+    "frame index"
+    offset: int = 0
+    "frame offset, segment * segment size + offset in the segment"
+    timestamp: float = 0.0
+    "capture time, seconds since the epoch"
+    sequence: int = 0
+    "frame sequence number"
+    controls: dict = None
+    "control values when the frame was captured, by SVB_CONTROL_TYPE"
+
+
+class RecordingWriter:
+    """Record frames into a directory of preallocated, memory mapped segment files and a compact index.
+       The camera writes each frame straight into its slot of the map (see capture and next_slot), then the
+       index gets the frame offset, timestamp, sequence number and the last control snapshot, and finally the
+       frame count: a RecordingReader in another process sees only complete frames while the recording goes on.
+       Segments keep their preallocated size, the last one is partly used.
+
+       with RecordingWriter.from_camera("session", sdk, camera_id) as recording:
+           sdk.start_video_capture(camera_id)
+           while recording.frames < 100000:
+               recording.capture(sdk, camera_id, wait_ms)
+    """
+
+    def __init__(self, path: str, shape: tuple, image_type: SVB_IMG_TYPE, segment_size: int = 512 * 1024 * 1024,
+                 controls: 'tuple[SVB_CONTROL_TYPE]' = DEFAULT_RECORDING_CONTROLS, metadata: dict = None) -> None:
+        """Initialize class, the directory is created and must not hold another recording.
+
+        Args:
+            path (str): recording directory
+            shape (tuple): frame shape, (height, width) or (height, width, channels) (see get_frame_array_format)
+            image_type (SVB_IMG_TYPE): image type of the frames
+            segment_size (int, optional): maximum bytes of a segment file, at least one frame. Defaults to 512MiB.
+            controls (tuple[SVB_CONTROL_TYPE], optional): controls stored for each frame. Defaults to DEFAULT_RECORDING_CONTROLS.
+            metadata (dict, optional): more JSON serializable metadata of the recording. Defaults to None.
+        """
+        self.__path = os.path.expanduser(path)
+        self.__image_type = SVB_IMG_TYPE(image_type)
+        self.__frame_size = shape[0] * shape[1] * image_type_to_bytes_per_pixel(self.__image_type)
+        self.__frames_per_segment = max(segment_size // self.__frame_size, 1)
+        self.__segment_size = self.__frames_per_segment * self.__frame_size
+        self.__controls = tuple(int(control) for control in controls)
+        self.__record = struct.Struct(_RECORD + 'q' * len(self.__controls))
+        self.__snapshot = {}
+        self.__snapshot_time = None
+        self.__count = 0
+        self.__segments = []
+        self.__map = None
+        self.__slot = None
+        # Frame timestamps are monotonic, they are moved to the wall clock with the offset of the creation
+        self.__clock_offset = time.time() - time.monotonic()
+
+        os.makedirs(self.__path, exist_ok=True)
+        if os.path.exists(os.path.join(self.__path, RECORDING_INDEX)):
+            raise FileExistsError("{} already holds a recording".format(self.__path))
+
+        info = dict(metadata or {})
+        info.update({
+            'shape': list(shape),
+            'image_type': int(self.__image_type),
+            'dtype': image_type_to_dtype(self.__image_type),
+            'frame_size': self.__frame_size,
+            'frames_per_segment': self.__frames_per_segment,
+            'controls': list(self.__controls)
+        })
+        with open(os.path.join(self.__path, RECORDING_METADATA), 'w') as f:
+            json.dump(info, f, indent=1)
+
+        self.__index = os.open(os.path.join(self.__path, RECORDING_INDEX), os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        header = _INDEX_HEADER.pack(_INDEX_MAGIC, self.__record.size, len(self.__controls), self.__frame_size,
+                                    self.__frames_per_segment, 0, 0)
+        os.pwrite(self.__index, header.ljust(_INDEX_HEADER_SIZE, b'\0'), 0)
+
+    @classmethod
+    def from_camera(cls, path: str, sdk: PySVBCameraSDK, camera_id: int, segment_size: int = 512 * 1024 * 1024,
+                    controls: 'tuple[SVB_CONTROL_TYPE]' = DEFAULT_RECORDING_CONTROLS) -> 'RecordingWriter':
+        """Create a recording for the frames of a camera with its current ROI area and output image type.
+            The camera need be opened at first.
+
+        Args:
+            path (str): recording directory
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            segment_size (int, optional): maximum bytes of a segment file. Defaults to 512MiB.
+            controls (tuple[SVB_CONTROL_TYPE], optional): controls stored for each frame. Defaults to DEFAULT_RECORDING_CONTROLS.
+
+        Returns:
+            RecordingWriter: recording of the camera frames
+        """
+        roi = sdk.get_roi_format(camera_id)
+        image_type = sdk.get_output_image_type(camera_id)
+        metadata = {
+            'roi': [roi.start_x, roi.start_y, roi.width, roi.height, roi.bin],
+            'bayer_pattern': int(sdk.get_camera_property(camera_id).BayerPattern),
+            'serial_number': sdk.get_serial_number(camera_id).id
+        }
+        return cls(path, frame_shape(roi, image_type), image_type, segment_size, controls, metadata)
+
+    @property
+    def path(self) -> str:
+        """Recording directory"""
+        return self.__path
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes of one frame"""
+        return self.__frame_size
+
+    @property
+    def frames(self) -> int:
+        """Frames recorded"""
+        return self.__count
+
+    def next_slot(self) -> memoryview:
+        """Get the slot of the next frame in the segment map, write the frame into it then call commit.
+            The slot must not be used after the commit.
+
+        Returns:
+            memoryview: writable frame_size bytes slot
+        """
+        if self.__index is None:
+            raise ValueError("recording is closed")
+        if self.__slot is None:
+            segment, slot = divmod(self.__count, self.__frames_per_segment)
+            if slot == 0 or self.__map is None:
+                self.__open_segment(segment)
+            offset = slot * self.__frame_size
+            self.__slot = memoryview(self.__map)[offset:offset + self.__frame_size]
+        return self.__slot
+
+    def commit(self, sequence: int = None, timestamp: float = None, controls: dict = None) -> int:
+        """Add the frame written into the slot to the index.
+
+        Args:
+            sequence (int, optional): frame sequence number. Defaults to None (frame index).
+            timestamp (float, optional): monotonic capture time (seconds). Defaults to None (now).
+            controls (dict, optional): control values by SVB_CONTROL_TYPE, a value or (value, auto). Defaults to None
+                (the last snapshot taken by capture).
+
+        Returns:
+            int: frame index
+        """
+        if self.__slot is None:
+            raise ValueError("commit without a slot")
+        self.__slot.release()
+        self.__slot = None
+
+        index = self.__count
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if controls is None:
+            controls = self.__snapshot
+
+        values = []
+        for control in self.__controls:
+            value = controls.get(control, _NO_VALUE)
+            values.append(value[0] if isinstance(value, tuple) else value)
+
+        segment, slot = divmod(index, self.__frames_per_segment)
+        offset = segment * self.__segment_size + slot * self.__frame_size
+        record = self.__record.pack(offset, timestamp + self.__clock_offset,
+                                    index if sequence is None else sequence, *values)
+        os.pwrite(self.__index, record, _INDEX_HEADER_SIZE + index * self.__record.size)
+        # The count is published last, readers never see a frame before its index entry
+        self.__count += 1
+        os.pwrite(self.__index, struct.pack('<Q', self.__count), _INDEX_COUNT_OFFSET)
+        return index
+
+    def write(self, data, sequence: int = None, timestamp: float = None, controls: dict = None) -> int:
+        """Copy a frame into the recording, for frames not captured into the slot (see capture).
+
+        Args:
+            data: buffer of at least frame_size bytes
+            sequence (int, optional): frame sequence number. Defaults to None (frame index).
+            timestamp (float, optional): monotonic capture time (seconds). Defaults to None (now).
+            controls (dict, optional): control values by SVB_CONTROL_TYPE. Defaults to None (the last snapshot).
+
+        Returns:
+            int: frame index
+        """
+        self.next_slot()[:] = memoryview(data).cast('B')[:self.__frame_size]
+        return self.commit(sequence, timestamp, controls)
+
+    def capture(self, sdk: PySVBCameraSDK, camera_id: int, wait_ms: int, controls_interval: float = 1.0) -> int:
+        """Capture a frame straight into the recording: the sdk writes it into the segment map.
+            Video capture must be started.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            wait_ms (int): wait value (milliseconds), this value is recommend set to exposure*2+500ms
+            controls_interval (float, optional): seconds between two snapshots of the controls. Defaults to 1.0.
+
+        Returns:
+            int: frame index, None when no frame was captured and exceptions are disabled
+        """
+        now = time.monotonic()
+        if self.__controls and (self.__snapshot_time is None or now - self.__snapshot_time >= controls_interval):
+            self.__snapshot, _ = sdk.get_control_values(camera_id, self.__controls)
+            self.__snapshot_time = now
+
+        written = sdk.get_video_data_into(camera_id, self.next_slot(), wait_ms, self.__frame_size)
+        if written <= 0:
+            return None
+        return self.commit(timestamp=time.monotonic())
+
+    def close(self) -> None:
+        """Mark the recording complete and close the files"""
+        if self.__index is None:
+            return
+        if self.__slot is not None:
+            self.__slot.release()
+            self.__slot = None
+        self.__close_maps()
+        os.pwrite(self.__index, struct.pack('<I', 1), _INDEX_CLOSED_OFFSET)
+        os.close(self.__index)
+        self.__index = None
+
+    def __open_segment(self, segment: int) -> None:
+        self.__close_maps()
+        file = os.path.join(self.__path, RECORDING_SEGMENT.format(segment))
+        fd = os.open(file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Reserve the blocks now, not on the first write of each page
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, self.__segment_size)
+            else:
+                os.ftruncate(fd, self.__segment_size)
+            self.__map = mmap.mmap(fd, self.__segment_size)
+        finally:
+            os.close(fd)
+        self.__segments.append(self.__map)
+
+    def __close_maps(self) -> None:
+        pending = []
+        for segment_map in self.__segments:
+            try:
+                segment_map.close()
+            except BufferError:
+                # Still exported by a caller view, closed at the next attempt
+                pending.append(segment_map)
+        self.__segments = pending
+        self.__map = None
+
+    def __enter__(self) -> 'RecordingWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordingReader:
+    """Read a recording, also while it is being written by a RecordingWriter in another process (see tail).
+       Any frame is reached in O(1) from its index, time ranges are found by binary search on the index.
+       Frames are read only views of the segment maps, they must be dropped before closing the reader.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize class
+
+        Args:
+            path (str): recording directory
+        """
+        self.__path = os.path.expanduser(path)
+        with open(os.path.join(self.__path, RECORDING_METADATA)) as f:
+            self.__metadata = json.load(f)
+
+        self.__index = os.open(os.path.join(self.__path, RECORDING_INDEX), os.O_RDONLY)
+        header = os.pread(self.__index, _INDEX_HEADER.size, 0)
+        magic, record_size, controls, frame_size, frames_per_segment, _, _ = _INDEX_HEADER.unpack(header)
+        if magic != _INDEX_MAGIC:
+            os.close(self.__index)
+            raise ValueError("{} is not a recording".format(self.__path))
+
+        self.__record = struct.Struct(_RECORD + 'q' * controls)
+        if self.__record.size != record_size:
+            os.close(self.__index)
+            raise ValueError("{} index records are not supported".format(self.__path))
+        self.__controls = [SVB_CONTROL_TYPE(control) for control in self.__metadata['controls']]
+        self.__frame_size = frame_size
+        self.__frames_per_segment = frames_per_segment
+        self.__segment_size = frame_size * frames_per_segment
+        self.__maps = {}
+
+    @property
+    def path(self) -> str:
+        """Recording directory"""
+        return self.__path
+
+    @property
+    def metadata(self) -> dict:
+        """Recording metadata: shape, image_type, dtype, frame_size, controls and the camera ones"""
+        return self.__metadata
+
+    @property
+    def shape(self) -> tuple:
+        """Frame shape"""
+        return tuple(self.__metadata['shape'])
+
+    @property
+    def image_type(self) -> SVB_IMG_TYPE:
+        """Image type of the frames"""
+        return SVB_IMG_TYPE(self.__metadata['image_type'])
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes of one frame"""
+        return self.__frame_size
+
+    @property
+    def closed(self) -> bool:
+        """The writer completed the recording"""
+        return struct.unpack('<I', os.pread(self.__index, 4, _INDEX_CLOSED_OFFSET))[0] != 0
+
+    def __len__(self) -> int:
+        return struct.unpack('<Q', os.pread(self.__index, 8, _INDEX_COUNT_OFFSET))[0]
+
+    def entry(self, index: int) -> SVB_RECORDING_ENTRY:
+        """Get the index entry of a frame.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            SVB_RECORDING_ENTRY: index entry
+        """
+        index = self.__check(index)
+        offset, timestamp, sequence, *values = self.__record.unpack(self.__read_record(index))
+        controls = {control: value for control, value in zip(self.__controls, values) if value != _NO_VALUE}
+        return SVB_RECORDING_ENTRY(index, offset, timestamp, sequence, controls)
+
+    def timestamp(self, index: int) -> float:
+        """Get the capture time of a frame, seconds since the epoch"""
+        return struct.unpack_from('<d', self.__read_record(self.__check(index)), 8)[0]
+
+    def frame(self, index: int) -> memoryview:
+        """Get the data of a frame without copying it.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            memoryview: frame data, a view of the segment map
+        """
+        index = self.__check(index)
+        segment, slot = divmod(index, self.__frames_per_segment)
+        segment_map = self.__maps.get(segment)
+        if segment_map is None:
+            with open(os.path.join(self.__path, RECORDING_SEGMENT.format(segment)), 'rb') as f:
+                segment_map = self.__maps[segment] = mmap.mmap(f.fileno(), self.__segment_size, access=mmap.ACCESS_READ)
+        offset = slot * self.__frame_size
+        return memoryview(segment_map)[offset:offset + self.__frame_size]
+
+    def array(self, index: int):
+        """Get a frame as a read only numpy array without copying it. Requires numpy.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            numpy.ndarray: frame array (see get_video_frame_array)
+        """
+        import numpy as np
+
+        return np.frombuffer(self.frame(index), dtype=self.__metadata['dtype']).reshape(self.shape)
+
+    def find(self, timestamp: float) -> int:
+        """Get the first frame captured at or after a time, by binary search on the index.
+
+        Args:
+            timestamp (float): seconds since the epoch
+
+        Returns:
+            int: frame index, len(self) if every frame is older
+        """
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def time_range(self, start: float = None, end: float = None) -> range:
+        """Get the frames captured in a time range.
+
+        Args:
+            start (float, optional): start time, seconds since the epoch. Defaults to None (first frame).
+            end (float, optional): end time, excluded. Defaults to None (last frame).
+
+        Returns:
+            range: frame indexes
+        """
+        first = 0 if start is None else self.find(start)
+        last = len(self) if end is None else self.find(end)
+        return range(first, max(first, last))
+
+    def tail(self, start: int = 0, poll_interval: float = 0.05, timeout: float = None):
+        """Follow a recording being written: yield the index of every frame from start as soon as it is committed.
+            The iteration ends when the writer closes the recording and every frame was yielded.
+
+        Args:
+            start (int, optional): first frame index. Defaults to 0.
+            poll_interval (float, optional): seconds between two checks of the frame count. Defaults to 0.05.
+            timeout (float, optional): stop after this many seconds without new frames. Defaults to None (wait forever).
+
+        Yields:
+            int: frame index
+        """
+        index = start
+        idle_since = time.monotonic()
+        while True:
+            # Closed is read before the count, so the frames committed before the close are not missed
+            closed = self.closed
+            count = len(self)
+            if index < count:
+                while index < count:
+                    yield index
+                    index += 1
+                idle_since = time.monotonic()
+                continue
+            if closed:
+                return
+            if timeout is not None and time.monotonic() - idle_since >= timeout:
+                return
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        """Close the index and the segment maps"""
+        for segment_map in self.__maps.values():
+            try:
+                segment_map.close()
+            except BufferError:
+                # Frames still referenced keep the map alive, it is released with them
+                pass
+        self.__maps = {}
+        if self.__index is not None:
+            os.close(self.__index)
+            self.__index = None
+
+    def __read_record(self, index: int) -> bytes:
+        return os.pread(self.__index, self.__record.size, _INDEX_HEADER_SIZE + index * self.__record.size)
+
+    def __check(self, index: int) -> int:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("frame index out of range")
+        return index
+
+    def __enter__(self) -> 'RecordingReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
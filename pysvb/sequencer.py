@@ -0,0 +1,126 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Soft trigger exposure sequencer
+#
+
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Iterator
+
+from pysvb.camera import SVB_CAMERA_MODE, SVB_CONTROL_TYPE, PySVBCameraSDK
+from pysvb.pool import FrameBuffer
+
+
+@dataclass
+class SVB_EXPOSURE_SPEC:
+    """One exposure of a sequence dataclass"""
+    exposure_us: int = 0
+    "exposure (microseconds)"
+    gain: int = None
+    "gain, None keeps the current one"
+    controls: 'dict[SVB_CONTROL_TYPE, int]' = field(default_factory=dict)
+    "other control values to set before the exposure"
+
+
+@dataclass
+class SVB_SEQUENCE_TIMING:
+    """Timing of one exposure of a sequence dataclass, times are monotonic seconds"""
+    index: int = 0
+    "position of the exposure in the sequence"
+    triggered_at: float = 0.0
+    "soft trigger sent"
+    readout_at: float = 0.0
+    "frame received"
+    dead_time: float = 0.0
+    "time between the previous frame readout and this trigger, 0 for the first exposure"
+    control_writes: int = 0
+    "set_control_value calls needed before the trigger"
+
+
+class ExposureSequencer:
+    """Run a list of exposures back-to-back in soft trigger mode. As soon as the readout of a frame completes the
+       controls of the next exposure are applied and the trigger is re-armed, then the frame is handed to the
+       caller: the sensor exposes while python processes the previous frame.
+
+       for spec, frame, timing in ExposureSequencer(sdk, camera_id).run(specs):
+           with frame:
+               save(frame.data)
+    """
+
+    def __init__(self, sdk: PySVBCameraSDK, camera_id: int, pool_size: int = 4) -> None:
+        """Initialize class, the camera need be opened at first.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance, raising exceptions
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            pool_size (int, optional): frame buffers, at least one more than the frames kept alive by the caller. Defaults to 4.
+        """
+        self.__sdk = sdk
+        self.__camera_id = camera_id
+        self.__pool_size = max(pool_size, 2)
+        self.__current = {}
+
+    def run(self, specs: 'list[SVB_EXPOSURE_SPEC]') -> 'Iterator[tuple[SVB_EXPOSURE_SPEC, FrameBuffer, SVB_SEQUENCE_TIMING]]':
+        """Run the exposures, the camera is switched to SVB_MODE_TRIG_SOFT and video capture is started for the
+            duration of the sequence, then the previous mode is restored.
+
+        Args:
+            specs (list[SVB_EXPOSURE_SPEC]): exposures to run in order
+
+        Yields:
+            Tuple[SVB_EXPOSURE_SPEC, FrameBuffer, SVB_SEQUENCE_TIMING]: exposure, frame (release it to recycle the buffer), timing
+        """
+        sdk, camera_id = self.__sdk, self.__camera_id
+        specs = list(specs)
+        if not specs:
+            return
+
+        mode = sdk.get_camera_mode(camera_id)
+        if mode != SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT:
+            sdk.set_camera_mode(camera_id, SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT)
+
+        self.__current = {}
+        sdk.create_frame_pool(camera_id, self.__pool_size)
+        sdk.start_video_capture(camera_id)
+        try:
+            writes = self.__apply(specs[0])
+            triggered_at = self.__trigger()
+            dead_time = 0.0
+
+            for index, spec in enumerate(specs):
+                frame = sdk.get_video_frame(camera_id, int(spec.exposure_us / 1000) * 2 + 500)
+                readout_at = monotonic()
+                timing = SVB_SEQUENCE_TIMING(index, triggered_at, readout_at, dead_time, writes)
+
+                # Re-arm before handing the frame over
+                if index + 1 < len(specs):
+                    writes = self.__apply(specs[index + 1])
+                    triggered_at = self.__trigger()
+                    dead_time = triggered_at - readout_at
+
+                yield spec, frame, timing
+                frame = None
+        finally:
+            sdk.stop_video_capture(camera_id)
+            if mode != SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT:
+                sdk.set_camera_mode(camera_id, mode)
+
+    def __apply(self, spec: SVB_EXPOSURE_SPEC) -> int:
+        controls = dict(spec.controls)
+        controls[SVB_CONTROL_TYPE.SVB_EXPOSURE] = spec.exposure_us
+        if spec.gain is not None:
+            controls[SVB_CONTROL_TYPE.SVB_GAIN] = spec.gain
+
+        writes = 0
+        for control_type, value in controls.items():
+            if self.__current.get(control_type) != value:
+                self.__sdk.set_control_value(self.__camera_id, control_type, value, False)
+                self.__current[control_type] = value
+                writes += 1
+        return writes
+
+    def __trigger(self) -> float:
+        self.__sdk.send_soft_trigger(self.__camera_id)
+        return monotonic()
@@ -0,0 +1,394 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# SER video files, the container of the planetary capture and stacking tools
+#
+
+import mmap
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+
+from pysvb.camera import SVB_BAYER_PATTERN, SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.helpers import image_type_to_bpp, image_type_to_bytes_per_pixel
+from pysvb.pool import FrameBuffer
+
+SER_HEADER = struct.Struct('<14s7i40s40s40sqq')
+"""SER header: FileID, LuID, ColorID, LittleEndian, ImageWidth, ImageHeight, PixelDepthPerPlane, FrameCount,
+   Observer, Instrument, Telescope, DateTime, DateTime_UTC"""
+
+SER_FILE_ID = b"LUCAM-RECORDER"
+
+# SER times are ticks of 100ns since 0001-01-01
+_TICKS_PER_SECOND = 10000000
+_EPOCH = datetime(1, 1, 1, tzinfo=timezone.utc)
+_UNIX_EPOCH_TICKS = 621355968000000000
+
+
+class SER_COLOR_ID(IntEnum):
+    SER_MONO = 0
+    SER_BAYER_RGGB = 8
+    SER_BAYER_GRBG = 9
+    SER_BAYER_GBRG = 10
+    SER_BAYER_BGGR = 11
+    SER_RGB = 100
+    SER_BGR = 101
+
+
+def ser_color_id(image_type: SVB_IMG_TYPE, bayer_pattern: SVB_BAYER_PATTERN = None) -> SER_COLOR_ID:
+    """SER color ID of the frames of an image type.
+
+    Args:
+        image_type (SVB_IMG_TYPE): output image type, RGB32 has no SER equivalent
+        bayer_pattern (SVB_BAYER_PATTERN, optional): pattern of the RAW frames of color cameras. Defaults to None (mono).
+
+    Returns:
+        SER_COLOR_ID: color ID
+    """
+    if image_type == SVB_IMG_TYPE.SVB_IMG_RGB24:
+        return SER_COLOR_ID.SER_BGR
+    if image_type == SVB_IMG_TYPE.SVB_IMG_RGB32:
+        raise ValueError("SER does not support RGB32 frames")
+    if bayer_pattern is None or image_type >= SVB_IMG_TYPE.SVB_IMG_Y8:
+        return SER_COLOR_ID.SER_MONO
+
+    patterns = {
+        SVB_BAYER_PATTERN.SVB_BAYER_RG: SER_COLOR_ID.SER_BAYER_RGGB,
+        SVB_BAYER_PATTERN.SVB_BAYER_BG: SER_COLOR_ID.SER_BAYER_BGGR,
+        SVB_BAYER_PATTERN.SVB_BAYER_GR: SER_COLOR_ID.SER_BAYER_GRBG,
+        SVB_BAYER_PATTERN.SVB_BAYER_GB: SER_COLOR_ID.SER_BAYER_GBRG
+    }
+    return patterns[bayer_pattern]
+
+
+def _ticks(seconds: float) -> int:
+    return _UNIX_EPOCH_TICKS + int(round(seconds * _TICKS_PER_SECOND))
+
+
+def _text(value: bytes) -> str:
+    return value.split(b'\0', 1)[0].decode('latin-1').rstrip()
+
+
+class SerWriter:
+    """Stream frames to a SER file: one buffered sequential write per frame into a single file, the per frame
+       UTC timestamps are kept in memory and written as the trailer on close, when the header gets the frame count.
+       16 bit samples are stored little endian as the camera delivers them, with LittleEndian = 0 as written
+       by the common capture software. A file not closed (crash) has FrameCount = 0, SerReader recovers its frames.
+
+       with SerWriter.from_camera("jupiter.ser", sdk, camera_id) as ser:
+           for frame in camera.frames(max_frames=5000):
+               with frame:
+                   ser.write(frame)
+    """
+
+    def __init__(self, path: str, width: int, height: int, image_type: SVB_IMG_TYPE,
+                 color_id: SER_COLOR_ID = SER_COLOR_ID.SER_MONO, bit_depth: int = None, observer: str = "",
+                 instrument: str = "", telescope: str = "", buffer_size: int = 8 * 1024 * 1024) -> None:
+        """Initialize class, the file is created and a placeholder header written.
+
+        Args:
+            path (str): SER file path
+            width (int): frame width
+            height (int): frame height
+            image_type (SVB_IMG_TYPE): image type of the frames, RGB32 is not supported
+            color_id (SER_COLOR_ID, optional): color ID (see ser_color_id). Defaults to SER_MONO.
+            bit_depth (int, optional): significant bits of the samples. Defaults to None (from the image type, RAW16 is full scale).
+            observer (str, optional): observer name. Defaults to "".
+            instrument (str, optional): camera name. Defaults to "".
+            telescope (str, optional): telescope name. Defaults to "".
+            buffer_size (int, optional): write buffer size (bytes), frames larger than it are written without copy. Defaults to 8MiB.
+        """
+        if image_type == SVB_IMG_TYPE.SVB_IMG_RGB32:
+            raise ValueError("SER does not support RGB32 frames")
+
+        planes = 3 if image_type == SVB_IMG_TYPE.SVB_IMG_RGB24 else 1
+        self.__path = path
+        self.__width = width
+        self.__height = height
+        self.__color_id = SER_COLOR_ID(color_id)
+        self.__bit_depth = bit_depth if bit_depth is not None else min(image_type_to_bpp(image_type) // planes, 16)
+        self.__frame_size = width * height * image_type_to_bytes_per_pixel(image_type)
+        self.__texts = [value.encode('latin-1', 'replace')[:40] for value in (observer, instrument, telescope)]
+        self.__timestamps = array('q')
+        # Frame timestamps are monotonic, they are moved to the wall clock with the offset of the creation
+        self.__clock_offset = time.time() - time.monotonic()
+        self.__start = time.time()
+
+        self.__file = open(path, 'wb', buffering=max(buffer_size, 0))
+        self.__file.write(self.__header(0))
+
+    @classmethod
+    def from_camera(cls, path: str, sdk: PySVBCameraSDK, camera_id: int, observer: str = "", telescope: str = "",
+                    buffer_size: int = 8 * 1024 * 1024) -> 'SerWriter':
+        """Create a writer for the frames of a camera with its current ROI area and output image type,
+            the header is filled from the camera property (Bayer pattern), the image type (bit depth) and the camera info.
+            The camera need be opened at first.
+
+        Args:
+            path (str): SER file path
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            observer (str, optional): observer name. Defaults to "".
+            telescope (str, optional): telescope name. Defaults to "".
+            buffer_size (int, optional): write buffer size (bytes). Defaults to 8MiB.
+
+        Returns:
+            SerWriter: writer of the camera frames
+        """
+        prop = sdk.get_camera_property(camera_id)
+        roi = sdk.get_roi_format(camera_id)
+        image_type = sdk.get_output_image_type(camera_id)
+        instrument = ""
+        for i in range(0, sdk.get_num_of_connected_cameras()):
+            info = sdk.get_camera_info(i)
+            if info.CameraID == camera_id:
+                instrument = info.FriendlyName
+                break
+
+        color_id = ser_color_id(image_type, prop.BayerPattern if prop.IsColorCam else None)
+        # The depth comes from the image type, not from MaxBitDepth: RAW10/12/14 samples are right aligned so the type
+        # already tells their bits, while RAW16 is full scale whatever the sensor depth (a 12 bit sensor gives
+        # multiples of 16) and readers would clip it if the header said 12
+        return cls(path, roi.width, roi.height, image_type, color_id, None, observer, instrument, telescope, buffer_size)
+
+    @property
+    def path(self) -> str:
+        """SER file path"""
+        return self.__path
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes of one frame"""
+        return self.__frame_size
+
+    @property
+    def frames(self) -> int:
+        """Frames written"""
+        return len(self.__timestamps)
+
+    @property
+    def closed(self) -> bool:
+        """The file is closed"""
+        return self.__file is None
+
+    def write(self, frame, timestamp: float = None) -> None:
+        """Append a frame.
+
+        Args:
+            frame: FrameBuffer, or buffer (bytes, memoryview, ndarray...) of at least frame_size bytes
+            timestamp (float, optional): monotonic capture time (seconds). Defaults to None (the FrameBuffer timestamp, or now).
+        """
+        if self.__file is None:
+            raise ValueError("write to a closed SER file")
+
+        if isinstance(frame, FrameBuffer):
+            if timestamp is None:
+                timestamp = frame.timestamp
+            frame = frame.data
+        data = memoryview(frame).cast('B')
+        if data.nbytes < self.__frame_size:
+            raise ValueError("frame has {} bytes, {} expected".format(data.nbytes, self.__frame_size))
+
+        self.__file.write(data[:self.__frame_size])
+        now = time.time() if timestamp is None else timestamp + self.__clock_offset
+        if not self.__timestamps:
+            self.__start = now
+        self.__timestamps.append(_ticks(now))
+
+    def close(self) -> None:
+        """Write the timestamps trailer and the final header, then close the file"""
+        f, self.__file = self.__file, None
+        if f is None:
+            return
+        try:
+            trailer = array('q', self.__timestamps)
+            if sys.byteorder != 'little':
+                trailer.byteswap()
+            f.write(trailer.tobytes())
+            f.seek(0)
+            f.write(self.__header(len(self.__timestamps)))
+        finally:
+            f.close()
+
+    def __header(self, count: int) -> bytes:
+        local_offset = datetime.fromtimestamp(self.__start).astimezone().utcoffset().total_seconds()
+        return SER_HEADER.pack(SER_FILE_ID, 0, int(self.__color_id), 0, self.__width, self.__height,
+                               self.__bit_depth, count, *self.__texts,
+                               _ticks(self.__start + local_offset), _ticks(self.__start))
+
+    def __enter__(self) -> 'SerWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SerReader:
+    """Read a SER file through a read only memory map: random access to any frame without reading the others.
+       Frames are views of the map, they must be dropped before closing the reader. 16 bit samples are read
+       little endian, as written by SerWriter and the common capture software whatever the LittleEndian flag.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize class
+
+        Args:
+            path (str): SER file path
+        """
+        self.__path = path
+        with open(path, 'rb') as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self.__map) < SER_HEADER.size:
+                raise ValueError("{} is not a SER file".format(path))
+            header = SER_HEADER.unpack_from(self.__map, 0)
+            if header[0] != SER_FILE_ID:
+                raise ValueError("{} is not a SER file".format(path))
+        except ValueError:
+            self.__map.close()
+            raise
+
+        (_, _, color_id, self.__little_endian, self.__width, self.__height, self.__bit_depth, count,
+         observer, instrument, telescope, self.__date_time, self.__date_time_utc) = header
+        self.__color_id = color_id
+        self.__texts = (_text(observer), _text(instrument), _text(telescope))
+
+        planes = 3 if color_id >= SER_COLOR_ID.SER_RGB else 1
+        self.__sample_size = 1 if self.__bit_depth <= 8 else 2
+        self.__planes = planes
+        self.__frame_size = self.__width * self.__height * planes * self.__sample_size
+
+        # An unclosed file has FrameCount = 0: the frames are counted from the size, without timestamps
+        available = (len(self.__map) - SER_HEADER.size) // self.__frame_size if self.__frame_size else 0
+        self.__count = count if 0 < count <= available else available
+        trailer = SER_HEADER.size + self.__count * self.__frame_size
+        self.__trailer = trailer if count and len(self.__map) >= trailer + 8 * self.__count else None
+
+    @property
+    def path(self) -> str:
+        """SER file path"""
+        return self.__path
+
+    @property
+    def width(self) -> int:
+        """Frame width"""
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        """Frame height"""
+        return self.__height
+
+    @property
+    def color_id(self) -> int:
+        """SER color ID"""
+        return self.__color_id
+
+    @property
+    def bit_depth(self) -> int:
+        """Significant bits per sample"""
+        return self.__bit_depth
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes of one frame"""
+        return self.__frame_size
+
+    @property
+    def observer(self) -> str:
+        """Observer name"""
+        return self.__texts[0]
+
+    @property
+    def instrument(self) -> str:
+        """Camera name"""
+        return self.__texts[1]
+
+    @property
+    def telescope(self) -> str:
+        """Telescope name"""
+        return self.__texts[2]
+
+    @property
+    def date_time(self) -> datetime:
+        """UTC start time of the capture, None if not set"""
+        if self.__date_time_utc <= 0:
+            return None
+        return _EPOCH + timedelta(microseconds=self.__date_time_utc // 10)
+
+    @property
+    def has_timestamps(self) -> bool:
+        """The file has the per frame timestamps trailer"""
+        return self.__trailer is not None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def frame(self, index: int) -> memoryview:
+        """Get the data of a frame without copying it.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            memoryview: frame data, a view of the file map
+        """
+        index = self.__index(index)
+        offset = SER_HEADER.size + index * self.__frame_size
+        return memoryview(self.__map)[offset:offset + self.__frame_size]
+
+    def array(self, index: int):
+        """Get a frame as a numpy array without copying it. Requires numpy.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            numpy.ndarray: read only (height, width) or (height, width, 3) array, uint8 or '<u2'
+        """
+        import numpy as np
+
+        shape = (self.__height, self.__width) + ((self.__planes,) if self.__planes > 1 else ())
+        dtype = np.uint8 if self.__sample_size == 1 else np.dtype('<u2')
+        return np.frombuffer(self.frame(index), dtype=dtype).reshape(shape)
+
+    def timestamp(self, index: int) -> datetime:
+        """Get the UTC capture time of a frame.
+
+        Args:
+            index (int): frame index, negative counts from the end
+
+        Returns:
+            datetime: capture time, None if the file has no timestamps
+        """
+        index = self.__index(index)
+        if self.__trailer is None:
+            return None
+        ticks, = struct.unpack_from('<q', self.__map, self.__trailer + index * 8)
+        return _EPOCH + timedelta(microseconds=ticks // 10)
+
+    def close(self) -> None:
+        """Close the file map"""
+        try:
+            self.__map.close()
+        except BufferError:
+            # Frames still referenced keep the map alive, it is released with them
+            pass
+
+    def __index(self, index: int) -> int:
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("frame index out of range")
+        return index
+
+    def __enter__(self) -> 'SerReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
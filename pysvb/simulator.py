@@ -0,0 +1,818 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Simulated cameras backend, requires numpy
+#
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+
+from pysvb.backend import SVBBackend
+from pysvb.camera import (SVB_BAYER_PATTERN, SVB_CAMERA_MODE, SVB_CONTROL_TYPE, SVB_GUIDE_DIRECTION,
+                          SVB_IMG_TYPE, SVB_TRIG_OUTPUT)
+from pysvb.errors import SVB_CAMERA_ERRORS
+from pysvb.helpers import image_type_to_bpp, image_type_to_bytes_per_pixel
+
+SUCCESS = SVB_CAMERA_ERRORS.SVB_SUCCESS
+
+# Red, green, blue plane of each cell of the Bayer patterns: [row][column] of the 2x2 cell
+_CFA = {
+    int(SVB_BAYER_PATTERN.SVB_BAYER_RG): ((0, 1), (1, 2)),
+    int(SVB_BAYER_PATTERN.SVB_BAYER_BG): ((2, 1), (1, 0)),
+    int(SVB_BAYER_PATTERN.SVB_BAYER_GR): ((1, 0), (2, 1)),
+    int(SVB_BAYER_PATTERN.SVB_BAYER_GB): ((1, 2), (0, 1))
+}
+
+# Red, green, blue sky background of color sensors, as a fraction of the full scale from 100ms at gain 0
+_SKY_RGB = (0.03, 0.02, 0.015)
+
+
+@dataclass
+class SVB_SIMULATED_CAMERA:
+    """Simulated camera settings dataclass"""
+    name: str = "SVBONY Simulated Camera"
+    "friendly name"
+    serial_number: str = "SIM0000000000000"
+    "serial number"
+    width: int = 1920
+    "sensor width"
+    height: int = 1080
+    "sensor height"
+    bit_depth: int = 12
+    "sensor bit depth"
+    color: bool = True
+    "color sensor"
+    bayer_pattern: SVB_BAYER_PATTERN = SVB_BAYER_PATTERN.SVB_BAYER_RG
+    "bayer pattern of color sensors"
+    video_formats: tuple = (SVB_IMG_TYPE.SVB_IMG_RAW8, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    "supported output image types, the first one is the default"
+    bins: tuple = (1, 2)
+    "supported binning methods"
+    pixel_size: float = 2.9
+    "pixel size (microns)"
+    fps: float = 30.0
+    "max frame rate, frames are exposure or 1/fps apart, whichever is longer"
+    realtime: bool = True
+    "frames follow the exposure timing, False delivers them as fast as they are read"
+    trigger: bool = True
+    "trigger camera"
+    cooled: bool = False
+    "camera with cooler"
+    pulse_guide: bool = True
+    "ST4 port"
+    drop_rate: float = 0.0
+    "probability of a frame being dropped"
+    drop_every: int = 0
+    "drop every n-th frame, 0 disables it"
+    stamp_sequence: bool = False
+    "the sensor frame counter is written in the first 4 bytes of every frame (little endian), dropped frames leave gaps"
+    scene: str = 'stars'
+    "'stars' or 'noise'"
+    stars: int = 200
+    "stars of the star field"
+    bank_size: int = 4
+    "noisy frames generated for each setting, delivered in turn"
+    firmware_version: str = "1.0.0"
+    "firmware version"
+    seed: int = 0
+    "random seed of the scene and of the dropped frames"
+
+
+def _controls(config: SVB_SIMULATED_CAMERA) -> 'list[tuple]':
+    # (Name, Description, MaxValue, MinValue, DefaultValue, IsAutoSupported, IsWritable, ControlType)
+    C = SVB_CONTROL_TYPE
+    caps = [
+        ("Gain", "Gain", 720, 0, 10, 1, 1, C.SVB_GAIN),
+        ("Exposure", "Exposure Time(us)", 2000000000, 29, 30000, 1, 1, C.SVB_EXPOSURE),
+        ("Gamma", "Gamma", 1000, 1, 100, 0, 1, C.SVB_GAMMA),
+        ("Contrast", "Contrast", 100, 0, 50, 0, 1, C.SVB_CONTRAST),
+        ("Sharpness", "Sharpness", 100, 0, 0, 0, 1, C.SVB_SHARPNESS),
+        ("Flip", "Flip: 0->None 1->Horiz 2->Vert 3->Both", 3, 0, 0, 0, 1, C.SVB_FLIP),
+        ("FrameSpeed", "Frame speed: 0->low 1->medium 2->high", 2, 0, 1, 0, 1, C.SVB_FRAME_SPEED_MODE),
+        ("Offset", "Black level offset", 255, 0, 0, 0, 1, C.SVB_BLACK_LEVEL),
+        ("AutoExpTarget", "Auto exposure target brightness", 160, 50, 100, 0, 1, C.SVB_AUTO_TARGET_BRIGHTNESS),
+        ("BadPixelCorrection", "Bad pixel correction", 1, 0, 1, 0, 1, C.SVB_BAD_PIXEL_CORRECTION_ENABLE),
+        ("Temperature", "Sensor temperature, 0.1C", 1000, -500, 200, 0, 0, C.SVB_CURRENT_TEMPERATURE)
+    ]
+    if config.color:
+        caps += [
+            ("WB_R", "White balance: Red component", 511, 0, 128, 1, 1, C.SVB_WB_R),
+            ("WB_G", "White balance: Green component", 511, 0, 128, 1, 1, C.SVB_WB_G),
+            ("WB_B", "White balance: Blue component", 511, 0, 128, 1, 1, C.SVB_WB_B),
+            ("Saturation", "Saturation", 255, 0, 128, 0, 1, C.SVB_SATURATION)
+        ]
+    if config.cooled:
+        caps += [
+            ("CoolerEnable", "Cooler enable", 1, 0, 0, 0, 1, C.SVB_COOLER_ENABLE),
+            ("TargetTemp", "Target temperature, C", 30, -35, 0, 0, 1, C.SVB_TARGET_TEMPERATURE),
+            ("CoolerPower", "Cooler power", 100, 0, 0, 0, 0, C.SVB_COOLER_POWER)
+        ]
+    return [tuple(cap[:7]) + (int(cap[7]),) for cap in caps]
+
+
+class _Camera:
+    """State of one simulated camera, every field is guarded by cond"""
+
+    def __init__(self, index: int, config: SVB_SIMULATED_CAMERA) -> None:
+        import numpy as np
+
+        self.index = index
+        self.config = config
+        self.caps = _controls(config)
+        self.cond = threading.Condition()
+        self.rng = np.random.default_rng(config.seed + index)
+        self.opened = False
+        self.removed = False
+        self.capturing = False
+        self.ring = None
+        self.trigger_output = {int(SVB_TRIG_OUTPUT.SVB_TRIG_OUTPUT_PINA): (0, 0, 0),
+                               int(SVB_TRIG_OUTPUT.SVB_TRIG_OUTPUT_PINB): (0, 0, 0)}
+        self.star_field = self.__star_field()
+        self.bank_key = None
+        self.bank = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.controls = {cap[7]: (cap[4], 0) for cap in self.caps}
+        self.image_type = int(self.config.video_formats[0])
+        self.roi = (0, 0, self.config.width // 8 * 8, self.config.height // 2 * 2, 1)
+        self.mode = int(SVB_CAMERA_MODE.SVB_MODE_NORMAL)
+        self.dropped = 0
+
+    @property
+    def frame_size(self) -> int:
+        return self.roi[2] * self.roi[3] * image_type_to_bytes_per_pixel(self.image_type)
+
+    @property
+    def interval(self) -> float:
+        exposure = self.controls[int(SVB_CONTROL_TYPE.SVB_EXPOSURE)][0] / 1e6
+        return max(exposure, 1.0 / self.config.fps)
+
+    def start(self) -> None:
+        self.capturing = True
+        self.produced = 0
+        self.triggers = deque()
+        self.next_due = monotonic() + self.interval
+
+    def temperature(self) -> int:
+        enabled = self.controls.get(int(SVB_CONTROL_TYPE.SVB_COOLER_ENABLE), (0, 0))[0]
+        if self.config.cooled and enabled:
+            return self.controls[int(SVB_CONTROL_TYPE.SVB_TARGET_TEMPERATURE)][0] * 10
+        return 200
+
+    def __star_field(self):
+        import numpy as np
+
+        if self.config.scene != 'stars':
+            return None
+        # Sensor coordinates, peak as a fraction of the full scale and red, green, blue response of each star
+        x = self.rng.uniform(0, self.config.width, self.config.stars)
+        y = self.rng.uniform(0, self.config.height, self.config.stars)
+        peak = self.rng.pareto(1.5, self.config.stars) * 0.02 + 0.01
+        rgb = self.rng.uniform(0.6, 1.0, (self.config.stars, 3)) if self.config.color else np.ones((self.config.stars, 3))
+        return np.concatenate([np.stack([x, y, np.minimum(peak, 1.0)], axis=1), rgb], axis=1)
+
+    def frame(self) -> bytes:
+        """Next frame of the bank, regenerated when the settings that shape the image change"""
+        key = (self.roi, self.image_type, self.controls[int(SVB_CONTROL_TYPE.SVB_EXPOSURE)][0],
+               self.controls[int(SVB_CONTROL_TYPE.SVB_GAIN)][0], self.controls[int(SVB_CONTROL_TYPE.SVB_FLIP)][0])
+        if key != self.bank_key:
+            self.bank = [self.__render() for _ in range(0, max(self.config.bank_size, 1))]
+            self.bank_key = key
+        return self.bank[self.produced % len(self.bank)]
+
+    def __render(self) -> bytes:
+        import numpy as np
+
+        start_x, start_y, width, height, bin = self.roi
+        full_scale = (1 << self.config.bit_depth) - 1
+        exposure = self.controls[int(SVB_CONTROL_TYPE.SVB_EXPOSURE)][0]
+        gain = self.controls[int(SVB_CONTROL_TYPE.SVB_GAIN)][0]
+        scale = min(1.0, exposure / 100000) * 10 ** (gain / 200) * full_scale
+
+        # Red, green and blue planes, the sky background is reddish on color sensors
+        color = self.config.color
+        sky = np.array(_SKY_RGB if color else (0.02, 0.02, 0.02))
+        image = np.empty((height, width, 3))
+        image[...] = sky * scale + 0.01 * full_scale
+        if self.star_field is not None:
+            sigma = 1.5 / bin
+            yy, xx = np.mgrid[-4:5, -4:5]
+            for x, y, peak, r, g, b in self.star_field:
+                cx, cy = x / bin - start_x, y / bin - start_y
+                ix, iy = int(cx), int(cy)
+                if not (4 <= ix < width - 4 and 4 <= iy < height - 4):
+                    continue
+                psf = np.exp(-((xx - (cx - ix)) ** 2 + (yy - (cy - iy)) ** 2) / (2 * sigma * sigma))
+                image[iy - 4:iy + 5, ix - 4:ix + 5] += (psf * peak * scale)[..., None] * (r, g, b)
+
+        flip = self.controls[int(SVB_CONTROL_TYPE.SVB_FLIP)][0]
+        if flip & 1:
+            image = image[:, ::-1]
+        if flip & 2:
+            image = image[::-1]
+
+        # What the camera delivers: the Bayer mosaic for RAW types, luminance for Y types and mono sensors,
+        # the three planes for RGB types (demosaiced by the camera)
+        image_type = SVB_IMG_TYPE(self.image_type)
+        if image_type in (SVB_IMG_TYPE.SVB_IMG_RGB24, SVB_IMG_TYPE.SVB_IMG_RGB32):
+            image = np.ascontiguousarray(image)
+        elif color and image_type < SVB_IMG_TYPE.SVB_IMG_Y8:
+            cfa = _CFA[int(self.config.bayer_pattern)]
+            mosaic = np.empty((height, width))
+            for py in (0, 1):
+                for px in (0, 1):
+                    mosaic[py::2, px::2] = image[py::2, px::2, cfa[py][px]]
+            image = mosaic
+        else:
+            image = image.mean(axis=2)
+
+        # Shot noise and read noise
+        image += self.rng.standard_normal(image.shape) * (np.sqrt(image) + 3.0)
+        np.clip(image, 0, full_scale, out=image)
+
+        # Sensor samples to the container of the image type
+        bits = min(image_type_to_bpp(image_type), 16)
+        if image_type in (SVB_IMG_TYPE.SVB_IMG_RGB24, SVB_IMG_TYPE.SVB_IMG_RGB32):
+            bits = 8
+        if bits == 16:
+            image *= 1 << (16 - self.config.bit_depth)
+        elif bits < self.config.bit_depth:
+            image /= 1 << (self.config.bit_depth - bits)
+
+        if bits > 8:
+            return np.rint(image).astype('<u2').tobytes()
+
+        samples = np.rint(image).astype(np.uint8)
+        if image_type == SVB_IMG_TYPE.SVB_IMG_RGB24:
+            samples = samples[..., ::-1]
+        elif image_type == SVB_IMG_TYPE.SVB_IMG_RGB32:
+            samples = np.concatenate([samples[..., ::-1], np.full((height, width, 1), 255, np.uint8)], axis=2)
+        return samples.tobytes()
+
+
+class _Ring:
+    """Ring capture of a simulated camera, mirrors the native one"""
+
+    def __init__(self, depth: int, buff_size: int, wait_ms: int) -> None:
+        self.depth = depth
+        self.buff_size = buff_size
+        self.wait_ms = wait_ms
+        self.cond = threading.Condition()
+        self.ready = deque()
+        self.running = True
+        self.last_err = SUCCESS
+        self.frames = self.overruns = self.timeouts = self.high_water = 0
+        self.thread = None
+
+    def stats(self, err: int) -> tuple:
+        with self.cond:
+            return (self.frames, self.overruns, self.timeouts, self.high_water, len(self.ready), self.depth, err)
+
+
+class SVBSimulator(SVBBackend):
+    """Backend of simulated cameras: frames are synthetic star fields or noise, delivered with the timing of
+       the exposure and frame rate (or as fast as possible), with dropped frames and injected errors.
+       It does not need the SVBONY sdk nor a camera, e.g. for benchmarks and tests:
+
+       sim = SVBSimulator([SVB_SIMULATED_CAMERA(width=4144, height=2822, fps=20)])
+       sdk = PySVBCameraSDK(backend=sim)
+       sim.inject_error('SVBGetVideoData', SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT, count=3)
+    """
+
+    SDK_VERSION = "pysvb-simulator"
+
+    def __init__(self, cameras: 'list[SVB_SIMULATED_CAMERA]' = None) -> None:
+        """Initialize class
+
+        Args:
+            cameras (list[SVB_SIMULATED_CAMERA], optional): simulated cameras, CameraID is the index. Defaults to None (one default camera).
+        """
+        if cameras is None:
+            cameras = [SVB_SIMULATED_CAMERA()]
+        self.__cameras = [_Camera(i, config) for i, config in enumerate(cameras)]
+        self.__errors = []
+        self.__errors_lock = threading.Lock()
+
+    def inject_error(self, function: str, err: SVB_CAMERA_ERRORS, count: int = 1, camera_id: int = None) -> None:
+        """Make the next calls of a function fail. 'SVBGetVideoData' also covers SVBGetVideoDataInto and the ring capture.
+
+        Args:
+            function (str): backend function name, e.g. 'SVBGetVideoData'
+            err (SVB_CAMERA_ERRORS): error code returned, e.g. SVB_ERROR_TIMEOUT
+            count (int, optional): failing calls. Defaults to 1.
+            camera_id (int, optional): only the calls for this camera. Defaults to None (every camera).
+        """
+        with self.__errors_lock:
+            self.__errors.append([function, int(err), count, camera_id])
+
+    def remove_camera(self, camera_id: int) -> None:
+        """Unplug a camera: its calls fail with SVB_ERROR_CAMERA_REMOVED, pending frame reads included"""
+        camera = self.__cameras[camera_id]
+        with camera.cond:
+            camera.removed = True
+            camera.cond.notify_all()
+
+    def restore_camera(self, camera_id: int) -> None:
+        """Plug back a removed camera, it must be opened again"""
+        camera = self.__cameras[camera_id]
+        with camera.cond:
+            camera.removed = False
+            camera.opened = camera.capturing = False
+
+    def __injected(self, function: str, camera_id: int = None) -> int:
+        with self.__errors_lock:
+            for entry in self.__errors:
+                if entry[0] == function and (entry[3] is None or entry[3] == camera_id):
+                    entry[2] -= 1
+                    if entry[2] <= 0:
+                        self.__errors.remove(entry)
+                    return entry[1]
+        return SUCCESS
+
+    def __camera(self, function: str, camera_id: int, opened: bool = True) -> 'tuple[_Camera, int]':
+        err = self.__injected(function, camera_id)
+        if err != SUCCESS:
+            return None, err
+        if not 0 <= camera_id < len(self.__cameras):
+            return None, SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_ID
+        camera = self.__cameras[camera_id]
+        if camera.removed:
+            return None, SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_REMOVED
+        if opened and not camera.opened:
+            return None, SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_CLOSED
+        return camera, SUCCESS
+
+    # Enumeration
+
+    def SVBGetNumOfConnectedCameras(self) -> int:
+        return len(self.__cameras)
+
+    def SVBGetCameraInfo(self, camera_index: int) -> tuple:
+        err = self.__injected('SVBGetCameraInfo')
+        if err == SUCCESS and not 0 <= camera_index < len(self.__cameras):
+            err = SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_INDEX
+        if err != SUCCESS:
+            return ("", "", "", 0, 0), err
+        config = self.__cameras[camera_index].config
+        return (config.name, config.serial_number, "USB3.0", 0x1000 + camera_index, camera_index), SUCCESS
+
+    def SVBGetCameraProperty(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetCameraProperty', camera_id, False)
+        if err != SUCCESS:
+            return (0, 0, 0, 0, (), (), 0, 0), err
+        c = camera.config
+        return (c.height, c.width, int(c.color), int(c.bayer_pattern), tuple(c.bins),
+                tuple(int(f) for f in c.video_formats), c.bit_depth, int(c.trigger)), SUCCESS
+
+    def SVBGetCameraPropertyEx(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetCameraPropertyEx', camera_id)
+        if err != SUCCESS:
+            return (0, 0), err
+        return (int(camera.config.pulse_guide), int(camera.config.cooled)), SUCCESS
+
+    def SVBOpenCamera(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBOpenCamera', camera_id, False)
+        if err == SUCCESS:
+            with camera.cond:
+                camera.opened = True
+        return err
+
+    def SVBCloseCamera(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBCloseCamera', camera_id, False)
+        if err == SUCCESS:
+            with camera.cond:
+                camera.opened = camera.capturing = False
+                camera.cond.notify_all()
+        return err
+
+    # Controls
+
+    def SVBGetNumOfControls(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetNumOfControls', camera_id)
+        return (len(camera.caps) if camera else 0), err
+
+    def SVBGetControlCaps(self, camera_id: int, control_index: int) -> tuple:
+        camera, err = self.__camera('SVBGetControlCaps', camera_id)
+        if err == SUCCESS and not 0 <= control_index < len(camera.caps):
+            err = SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_INDEX
+        if err != SUCCESS:
+            return ("", "", 0, 0, 0, 0, 0, 0), err
+        return camera.caps[control_index], SUCCESS
+
+    def __get_control(self, camera: _Camera, control_type: int) -> tuple:
+        control_type = int(control_type)
+        if control_type not in camera.controls:
+            return 0, 0, SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_CONTROL_TYPE
+        if control_type == SVB_CONTROL_TYPE.SVB_CURRENT_TEMPERATURE:
+            return camera.temperature(), 0, SUCCESS
+        if control_type == SVB_CONTROL_TYPE.SVB_COOLER_POWER:
+            return (50 if camera.temperature() != 200 else 0), 0, SUCCESS
+        value, auto = camera.controls[control_type]
+        return value, auto, SUCCESS
+
+    def __set_control(self, camera: _Camera, control_type: int, value: int, auto: int) -> int:
+        control_type = int(control_type)
+        caps = next((cap for cap in camera.caps if cap[7] == control_type), None)
+        if caps is None:
+            return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_CONTROL_TYPE
+        if not caps[6] or not caps[3] <= value <= caps[2]:
+            return SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+        camera.controls[control_type] = (int(value), int(bool(auto) and bool(caps[5])))
+        return SUCCESS
+
+    def SVBGetControlValue(self, camera_id: int, control_type: int) -> tuple:
+        camera, err = self.__camera('SVBGetControlValue', camera_id)
+        if err != SUCCESS:
+            return -1, -1, err
+        with camera.cond:
+            return self.__get_control(camera, control_type)
+
+    def SVBSetControlValue(self, camera_id: int, control_type: int, value: int, auto: int) -> int:
+        camera, err = self.__camera('SVBSetControlValue', camera_id)
+        if err != SUCCESS:
+            return err
+        with camera.cond:
+            return self.__set_control(camera, control_type, value, auto)
+
+    def SVBGetControlValues(self, camera_id: int, control_types) -> tuple:
+        control_types = [int(control_type) for control_type in control_types]
+        camera, err = self.__camera('SVBGetControlValues', camera_id)
+        values, errors = {}, {}
+        for control_type in control_types:
+            if camera is None:
+                errors[control_type] = err
+                continue
+            with camera.cond:
+                value, auto, control_err = self.__get_control(camera, control_type)
+            if control_err == SUCCESS:
+                values[control_type] = (value, bool(auto))
+            else:
+                errors[control_type] = control_err
+        return values, errors, self.__batch_error(control_types, errors)
+
+    def SVBSetControlValues(self, camera_id: int, controls: dict) -> tuple:
+        camera, err = self.__camera('SVBSetControlValues', camera_id)
+        errors = {}
+        for control_type, value in controls.items():
+            value, auto = value if isinstance(value, tuple) else (value, False)
+            if camera is None:
+                errors[int(control_type)] = err
+                continue
+            with camera.cond:
+                control_err = self.__set_control(camera, control_type, value, auto)
+            if control_err != SUCCESS:
+                errors[int(control_type)] = control_err
+        return errors, self.__batch_error(list(controls), errors)
+
+    @staticmethod
+    def __batch_error(control_types: list, errors: dict) -> int:
+        if not control_types or len(errors) < len(control_types):
+            return SUCCESS
+        return errors[int(control_types[0])]
+
+    def SVBWhiteBalanceOnce(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBWhiteBalanceOnce', camera_id)
+        if err == SUCCESS and not camera.config.color:
+            err = SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+        return err
+
+    def SVBRestoreDefaultParam(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBRestoreDefaultParam', camera_id)
+        if err == SUCCESS:
+            with camera.cond:
+                if camera.capturing:
+                    return SVB_CAMERA_ERRORS.SVB_ERROR_VIDEO_MODE_ACTIVE
+                camera.reset()
+        return err
+
+    def SVBSetAutoSaveParam(self, camera_id: int, enable: int) -> int:
+        return self.__camera('SVBSetAutoSaveParam', camera_id)[1]
+
+    # Format
+
+    def SVBGetOutputImageType(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetOutputImageType', camera_id)
+        return (camera.image_type if camera else -1), err
+
+    def SVBSetOutputImageType(self, camera_id: int, image_type: int) -> int:
+        camera, err = self.__camera('SVBSetOutputImageType', camera_id)
+        if err != SUCCESS:
+            return err
+        with camera.cond:
+            if camera.capturing:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_VIDEO_MODE_ACTIVE
+            if image_type not in [int(f) for f in camera.config.video_formats]:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_IMGTYPE
+            camera.image_type = int(image_type)
+        return SUCCESS
+
+    def SVBSetROIFormat(self, camera_id: int, start_x: int, start_y: int, width: int, height: int, bin: int) -> int:
+        camera, err = self.__camera('SVBSetROIFormat', camera_id)
+        if err != SUCCESS:
+            return err
+        c = camera.config
+        with camera.cond:
+            if camera.capturing:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_VIDEO_MODE_ACTIVE
+            if bin not in c.bins or width <= 0 or height <= 0 or width % 8 or height % 2 or \
+                    width > c.width // bin or height > c.height // bin:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SIZE
+            if start_x < 0 or start_y < 0 or start_x + width > c.width // bin or start_y + height > c.height // bin:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_OUTOF_BOUNDARY
+            camera.roi = (start_x, start_y, width, height, bin)
+        return SUCCESS
+
+    def SVBGetROIFormat(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetROIFormat', camera_id)
+        if err != SUCCESS:
+            return -1, -1, -1, -1, -1, err
+        return camera.roi + (SUCCESS,)
+
+    def SVBGetCameraSupportMode(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetCameraSupportMode', camera_id)
+        if err != SUCCESS:
+            return (), err
+        if not camera.config.trigger:
+            return (int(SVB_CAMERA_MODE.SVB_MODE_NORMAL),), SUCCESS
+        return tuple(int(mode) for mode in SVB_CAMERA_MODE), SUCCESS
+
+    def SVBGetCameraMode(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetCameraMode', camera_id)
+        return (camera.mode if camera else -1), err
+
+    def SVBSetCameraMode(self, camera_id: int, mode: int) -> int:
+        camera, err = self.__camera('SVBSetCameraMode', camera_id)
+        if err != SUCCESS:
+            return err
+        if mode not in self.SVBGetCameraSupportMode(camera_id)[0]:
+            return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_MODE
+        with camera.cond:
+            if camera.capturing:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_VIDEO_MODE_ACTIVE
+            camera.mode = int(mode)
+        return SUCCESS
+
+    # Video
+
+    def SVBGetDroppedFrames(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetDroppedFrames', camera_id)
+        return (camera.dropped if camera else 0), err
+
+    def SVBStartVideoCapture(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBStartVideoCapture', camera_id)
+        if err == SUCCESS:
+            with camera.cond:
+                camera.start()
+        return err
+
+    def SVBStopVideoCapture(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBStopVideoCapture', camera_id)
+        if err == SUCCESS:
+            with camera.cond:
+                camera.capturing = False
+                camera.cond.notify_all()
+        return err
+
+    def SVBSendSoftTrigger(self, camera_id: int) -> int:
+        camera, err = self.__camera('SVBSendSoftTrigger', camera_id)
+        if err != SUCCESS:
+            return err
+        with camera.cond:
+            if camera.mode != SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_MODE
+            if not camera.capturing:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE
+            # The sensor exposes one frame at a time, the exposure starts after the previous readout
+            start = monotonic()
+            if camera.triggers:
+                start = max(start, camera.triggers[-1] + 1.0 / camera.config.fps)
+            exposure = camera.controls[int(SVB_CONTROL_TYPE.SVB_EXPOSURE)][0] / 1e6
+            camera.triggers.append(start + exposure)
+            camera.cond.notify_all()
+        return SUCCESS
+
+    def __read_frame(self, camera_id: int, buffer: memoryview, buff_size: int, wait_ms: int) -> int:
+        camera, err = self.__camera('SVBGetVideoData', camera_id)
+        if err != SUCCESS:
+            return err
+
+        deadline = None if wait_ms < 0 else monotonic() + wait_ms / 1000
+        with camera.cond:
+            while True:
+                if camera.removed:
+                    return SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_REMOVED
+                if not camera.opened:
+                    return SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_CLOSED
+                if not camera.capturing:
+                    return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE
+                if buff_size < camera.frame_size:
+                    return SVB_CAMERA_ERRORS.SVB_ERROR_BUFFER_TOO_SMALL
+
+                now = monotonic()
+                due = None
+                if camera.mode == SVB_CAMERA_MODE.SVB_MODE_NORMAL:
+                    due = camera.next_due if camera.config.realtime else now
+                elif camera.triggers:
+                    due = camera.triggers[0]
+
+                if due is not None and due <= now:
+                    if camera.mode == SVB_CAMERA_MODE.SVB_MODE_NORMAL:
+                        if camera.config.realtime:
+                            # Frames read out while nobody was waiting are lost
+                            missed = int((now - due) / camera.interval)
+                            camera.dropped += missed
+                            camera.next_due = due + (missed + 1) * camera.interval
+                    else:
+                        camera.triggers.popleft()
+
+                    camera.produced += 1
+                    c = camera.config
+                    if (c.drop_every and camera.produced % c.drop_every == 0) or \
+                            (c.drop_rate and camera.rng.random() < c.drop_rate):
+                        camera.dropped += 1
+                        continue
+
+                    data = camera.frame()
+                    sequence = camera.produced - 1
+                    break
+
+                timeout = None if due is None else due - now
+                if deadline is not None:
+                    if now >= deadline:
+                        return SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT
+                    timeout = deadline - now if timeout is None else min(timeout, deadline - now)
+                camera.cond.wait(timeout)
+
+        size = len(data)
+        buffer[:size] = data
+        if camera.config.stamp_sequence and size >= 4:
+            buffer[:4] = (sequence & 0xFFFFFFFF).to_bytes(4, 'little')
+        return SUCCESS
+
+    def SVBGetVideoData(self, camera_id: int, buff_size: int, wait_ms: int) -> tuple:
+        data = bytearray(max(buff_size, 0))
+        err = self.__read_frame(camera_id, memoryview(data), buff_size, wait_ms)
+        return bytes(data), err
+
+    def SVBGetVideoDataInto(self, camera_id: int, buffer, wait_ms: int, buff_size: int = -1) -> tuple:
+        view = memoryview(buffer).cast('B')
+        if view.readonly:
+            raise TypeError("a writable buffer is required")
+        if buff_size < 0:
+            buff_size = view.nbytes
+        if buff_size > view.nbytes:
+            return 0, SVB_CAMERA_ERRORS.SVB_ERROR_BUFFER_TOO_SMALL
+        err = self.__read_frame(camera_id, view, buff_size, wait_ms)
+        return (buff_size if err == SUCCESS else 0), err
+
+    # Ring capture
+
+    def SVBStartRingCapture(self, camera_id: int, depth: int, buff_size: int, wait_ms: int) -> int:
+        if wait_ms <= 0:
+            raise ValueError("ring capture wait must be positive")
+        if not 0 <= camera_id < len(self.__cameras):
+            return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_ID
+        camera = self.__cameras[camera_id]
+        with camera.cond:
+            if camera.ring is not None:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_VIDEO_MODE_ACTIVE
+            if depth < 1 or buff_size <= 0:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+            ring = camera.ring = _Ring(depth, buff_size, wait_ms)
+        ring.thread = threading.Thread(target=self.__ring_thread, args=(camera_id, ring),
+                                       name="svb-sim-ring-{}".format(camera_id), daemon=True)
+        ring.thread.start()
+        return SUCCESS
+
+    def __ring_thread(self, camera_id: int, ring: _Ring) -> None:
+        sequence = 0
+        while True:
+            with ring.cond:
+                if not ring.running:
+                    return
+            data = bytearray(ring.buff_size)
+            err = self.__read_frame(camera_id, memoryview(data), ring.buff_size, ring.wait_ms)
+            timestamp = monotonic()
+            with ring.cond:
+                if err == SUCCESS:
+                    if len(ring.ready) == ring.depth:
+                        ring.ready.popleft()
+                        ring.overruns += 1
+                    ring.ready.append((data, sequence, timestamp))
+                    sequence += 1
+                    ring.frames += 1
+                    ring.high_water = max(ring.high_water, len(ring.ready))
+                elif err == SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT:
+                    ring.timeouts += 1
+                    continue
+                else:
+                    ring.last_err = err
+                    ring.running = False
+                ring.cond.notify_all()
+
+    def __ring(self, camera_id: int) -> _Ring:
+        if 0 <= camera_id < len(self.__cameras):
+            return self.__cameras[camera_id].ring
+        return None
+
+    def SVBStopRingCapture(self, camera_id: int) -> tuple:
+        ring = self.__ring(camera_id)
+        if ring is None:
+            return (0, 0, 0, 0, 0, 0, SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE)
+        camera = self.__cameras[camera_id]
+        with camera.cond:
+            camera.ring = None
+        with ring.cond:
+            ring.running = False
+            ring.cond.notify_all()
+        ring.thread.join()
+        return ring.stats(SUCCESS)
+
+    def SVBGetRingCaptureStats(self, camera_id: int) -> tuple:
+        ring = self.__ring(camera_id)
+        if ring is None:
+            return (0, 0, 0, 0, 0, 0, SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE)
+        return ring.stats(ring.last_err)
+
+    def SVBGetRingFrameInto(self, camera_id: int, buffer, wait_ms: int) -> tuple:
+        ring = self.__ring(camera_id)
+        if ring is None:
+            return 0, 0, 0.0, SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE
+        view = memoryview(buffer).cast('B')
+        if view.readonly:
+            raise TypeError("a writable buffer is required")
+        if view.nbytes < ring.buff_size:
+            return 0, 0, 0.0, SVB_CAMERA_ERRORS.SVB_ERROR_BUFFER_TOO_SMALL
+
+        deadline = None if wait_ms < 0 else monotonic() + wait_ms / 1000
+        with ring.cond:
+            while not ring.ready:
+                if not ring.running:
+                    err = ring.last_err if ring.last_err != SUCCESS else SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_SEQUENCE
+                    return 0, 0, 0.0, err
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - monotonic()
+                    if timeout <= 0:
+                        return 0, 0, 0.0, SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT
+                ring.cond.wait(timeout)
+            data, sequence, timestamp = ring.ready.popleft()
+
+        view[:ring.buff_size] = data
+        return ring.buff_size, sequence, timestamp, SUCCESS
+
+    # Misc
+
+    def SVBGetCameraFirmwareVersion(self, camera_id: int, buff_size: int) -> tuple:
+        camera, err = self.__camera('SVBGetCameraFirmwareVersion', camera_id)
+        return (camera.config.firmware_version[:max(buff_size - 1, 0)] if camera else ""), err
+
+    def SVBGetSDKVersion(self) -> str:
+        return self.SDK_VERSION
+
+    def SVBGetSerialNumber(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetSerialNumber', camera_id)
+        return (camera.config.serial_number if camera else ""), err
+
+    def SVBSetTriggerOutputIOConf(self, camera_id: int, pin: int, pin_high: int, delay: int, duration: int) -> int:
+        camera, err = self.__camera('SVBSetTriggerOutputIOConf', camera_id)
+        if err == SUCCESS:
+            if pin not in camera.trigger_output:
+                return SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+            with camera.cond:
+                camera.trigger_output[pin] = (int(pin_high), delay, duration)
+        return err
+
+    def SVBGetTriggerOutputIOConf(self, camera_id: int, pin: int) -> tuple:
+        camera, err = self.__camera('SVBGetTriggerOutputIOConf', camera_id)
+        if err == SUCCESS and pin not in camera.trigger_output:
+            err = SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+        if err != SUCCESS:
+            return 0, 0, 0, err
+        return camera.trigger_output[pin] + (SUCCESS,)
+
+    def SVBPulseGuide(self, camera_id: int, direction: int, duration: int) -> int:
+        camera, err = self.__camera('SVBPulseGuide', camera_id)
+        if err != SUCCESS:
+            return err
+        if not camera.config.pulse_guide:
+            return SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR
+        if direction not in [int(d) for d in SVB_GUIDE_DIRECTION]:
+            return SVB_CAMERA_ERRORS.SVB_ERROR_INVALID_DIRECTION
+        return SUCCESS
+
+    def SVBGetSensorPixelSize(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBGetSensorPixelSize', camera_id)
+        return (camera.config.pixel_size if camera else 0.0), err
+
+    def SVBCanPulseGuide(self, camera_id: int) -> tuple:
+        camera, err = self.__camera('SVBCanPulseGuide', camera_id)
+        return (int(camera.config.pulse_guide) if camera else 0), err
+
+    def SVBIsCameraNeedToUpgrade(self, camera_id: int, buff_size: int) -> tuple:
+        camera, err = self.__camera('SVBIsCameraNeedToUpgrade', camera_id)
+        return 0, (camera.config.firmware_version if camera else ""), err
@@ -0,0 +1,202 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Live stacking, requires numpy
+#
+
+from pysvb.camera import PySVBCameraSDK
+
+
+class LiveStacker:
+    """Incremental stack of frames: running mean and variance per pixel (Welford) with streaming winsorized
+       sigma clipping, a sample farther than sigma standard deviations from the running mean of its pixel is
+       rejected and clamped to that distance. Outliers (satellites, hot pixels) move the stack by a bounded
+       amount, yet they still widen the scale estimate: a pixel whose early estimate was too low, or whose
+       background drifts, recovers instead of rejecting forever. Memory does not depend on the number of
+       frames: a few arrays of the frame size.
+       Frames can be shifted by integer registration offsets, pixels falling outside are not stacked.
+
+       stacker = LiveStacker.from_camera(sdk, camera_id)
+       for frame in camera.frames():
+           stacker.add(frame.data)
+           show(stacker.preview())
+    """
+
+    def __init__(self, shape: tuple, frame_dtype: str = '<u2', sigma: float = 3.0, min_frames: int = 10,
+                 dtype: str = 'float32') -> None:
+        """Initialize class
+
+        Args:
+            shape (tuple): frame shape, (height, width) or (height, width, channels)
+            frame_dtype (str, optional): dtype of the frames given as buffers. Defaults to '<u2'.
+            sigma (float, optional): rejection threshold in standard deviations, None disables the clipping. Defaults to 3.0.
+            min_frames (int, optional): samples of a pixel stacked before its clipping starts. Defaults to 10.
+            dtype (str, optional): accumulators dtype, 'float32' or 'float64'. Defaults to 'float32'.
+        """
+        import numpy as np
+
+        self.__shape = tuple(shape)
+        self.__frame_dtype = np.dtype(frame_dtype)
+        self.__sigma = sigma
+        self.__min_frames = max(min_frames, 2)
+        self.__dtype = np.dtype(dtype)
+
+        self.__count = np.zeros(self.__shape, dtype=np.uint32)
+        self.__mean = np.zeros(self.__shape, dtype=self.__dtype)
+        self.__m2 = np.zeros(self.__shape, dtype=self.__dtype)
+        # Scratch arrays reused by every add
+        self.__sample = np.empty(self.__shape, dtype=self.__dtype)
+        self.__delta = np.empty(self.__shape, dtype=self.__dtype)
+        self.__reject = np.empty(self.__shape, dtype=bool)
+        self.__frames = 0
+        self.__rejected = 0
+
+    @classmethod
+    def from_camera(cls, sdk: PySVBCameraSDK, camera_id: int, sigma: float = 3.0, min_frames: int = 10,
+                    dtype: str = 'float32') -> 'LiveStacker':
+        """Create a stacker for the frames of a camera with its current ROI area and output image type.
+
+        Args:
+            sdk (PySVBCameraSDK): sdk instance
+            camera_id (int): this is get from the camera info (use get_camera_info)
+            sigma (float, optional): rejection threshold in standard deviations, None disables the clipping. Defaults to 3.0.
+            min_frames (int, optional): samples of a pixel stacked before its clipping starts. Defaults to 10.
+            dtype (str, optional): accumulators dtype, 'float32' or 'float64'. Defaults to 'float32'.
+
+        Returns:
+            LiveStacker: stacker of the camera frames
+        """
+        shape, frame_dtype = sdk.get_frame_array_format(camera_id)
+        return cls(shape, frame_dtype, sigma, min_frames, dtype)
+
+    @property
+    def shape(self) -> tuple:
+        """Frame shape"""
+        return self.__shape
+
+    @property
+    def frames(self) -> int:
+        """Frames added"""
+        return self.__frames
+
+    @property
+    def rejected(self) -> int:
+        """Samples rejected (winsorized) by the sigma clipping"""
+        return self.__rejected
+
+    @property
+    def count(self):
+        """Samples stacked per pixel (numpy.ndarray, read only view)"""
+        view = self.__count.view()
+        view.flags.writeable = False
+        return view
+
+    def add(self, frame, offset: 'tuple[int, int]' = None) -> int:
+        """Stack a frame.
+
+        Args:
+            frame: ndarray of the frame shape, or buffer (bytes, FrameBuffer.data...) of frame_dtype samples
+            offset (tuple[int, int], optional): (dy, dx) registration shift of the frame in pixels. Defaults to None.
+
+        Returns:
+            int: samples of the frame rejected by the sigma clipping
+        """
+        import numpy as np
+
+        if not isinstance(frame, np.ndarray):
+            frame = np.frombuffer(frame, dtype=self.__frame_dtype)
+        frame = frame.reshape(self.__shape)
+
+        dst, src = self.__regions(offset)
+        if dst is None:
+            self.__frames += 1
+            return 0
+
+        count, mean, m2 = self.__count[dst], self.__mean[dst], self.__m2[dst]
+        sample, delta, reject = self.__sample[dst], self.__delta[dst], self.__reject[dst]
+
+        np.copyto(sample, frame[src], casting='unsafe')
+        np.subtract(sample, mean, out=delta)
+
+        rejected = 0
+        if self.__sigma is not None and self.__frames >= self.__min_frames:
+            # limit = sigma * std, one ADU at least so that constant (saturated) pixels can change
+            limit = sample
+            np.divide(m2, np.maximum(count, 2) - 1, out=limit)
+            np.sqrt(limit, out=limit)
+            np.maximum(limit, 1.0, out=limit)
+            limit *= self.__sigma
+            np.greater(np.abs(delta), limit, out=reject)
+            reject &= count >= self.__min_frames
+            rejected = int(np.count_nonzero(reject))
+            # Winsorize: the rejected samples are clamped to mean +- limit
+            np.copysign(limit, delta, out=delta, where=reject)
+
+        # Welford update, the winsorized sample is mean + delta: m2 grows by delta * (sample - new mean)
+        count += 1
+        np.divide(delta, count, out=sample)
+        mean += sample
+        sample *= delta
+        sample *= count - 1
+        m2 += sample
+
+        self.__frames += 1
+        self.__rejected += rejected
+        return rejected
+
+    def preview(self, out=None):
+        """Get the current stack, the mean of the winsorized samples of each pixel (0 where none).
+
+        Args:
+            out (numpy.ndarray, optional): destination of the frame shape, any dtype. Defaults to None (accumulators dtype).
+
+        Returns:
+            numpy.ndarray: stacked image
+        """
+        import numpy as np
+
+        if out is None:
+            return self.__mean.copy()
+        np.copyto(out, self.__mean, casting='unsafe')
+        return out
+
+    def variance(self, out=None):
+        """Get the variance of the winsorized samples of each pixel (0 where less than two).
+
+        Args:
+            out (numpy.ndarray, optional): destination of the frame shape and accumulators dtype. Defaults to None (new array).
+
+        Returns:
+            numpy.ndarray: variance per pixel
+        """
+        import numpy as np
+
+        if out is None:
+            out = np.zeros(self.__shape, dtype=self.__dtype)
+        else:
+            out[...] = 0
+        np.divide(self.__m2, self.__count - 1, out=out, where=self.__count > 1)
+        return out
+
+    def reset(self) -> None:
+        """Drop the stacked frames"""
+        self.__count[...] = 0
+        self.__mean[...] = 0
+        self.__m2[...] = 0
+        self.__frames = 0
+        self.__rejected = 0
+
+    def __regions(self, offset: 'tuple[int, int]'):
+        if not offset:
+            return (Ellipsis,), (Ellipsis,)
+
+        height, width = self.__shape[:2]
+        dy, dx = int(round(offset[0])), int(round(offset[1]))
+        if abs(dy) >= height or abs(dx) >= width:
+            return None, None
+
+        # Frame pixel (y, x) lands on the stack pixel (y + dy, x + dx)
+        dst = (slice(max(dy, 0), height + min(dy, 0)), slice(max(dx, 0), width + min(dx, 0)))
+        src = (slice(max(-dy, 0), height + min(-dy, 0)), slice(max(-dx, 0), width + min(-dx, 0)))
+        return dst, src
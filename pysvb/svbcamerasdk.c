@@ -2,6 +2,12 @@
 #include <Python.h>
 #include <SVBCameraSDK.h>
 
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
 /*
  *
  * Python binding to SVBONY Cameras Driver
@@ -9,9 +15,73 @@
  *
  */
 
+/*
+ * Every SDK call is made with the GIL released so that a camera waiting
+ * for a frame (or an exposure) does not stall the other python threads.
+ * Calls addressed to the same camera are serialized by camera_locks,
+ * calls without a camera (enumeration, sdk version) by sdk_lock.
+ * SVBGetVideoData can block for wait_ms (or forever) so it is serialized
+ * on its own video_locks: while a thread waits for a frame another one
+ * can still set controls or send a soft trigger to the same camera.
+ */
+#define SVB_NO_CAMERA -1
+
+/* The SDK version strings need at least 64 bytes, whatever size the caller asks for */
+#define SVB_VERSION_BUFF_MIN 64
+
+static PyThread_type_lock sdk_lock = NULL;
+static PyThread_type_lock camera_locks[SVBCAMERA_ID_MAX];
+static PyThread_type_lock video_locks[SVBCAMERA_ID_MAX];
+
+static PyThread_type_lock svb_lock_for(PyThread_type_lock *locks, int iCameraID)
+{
+    if (iCameraID >= 0 && iCameraID < SVBCAMERA_ID_MAX)
+    {
+        return locks[iCameraID];
+    }
+
+    return sdk_lock;
+}
+
+#define SVB_LOCKED_CALL(lock, ...)                    \
+    {                                                 \
+        PyThread_type_lock _svb_lock = (lock);        \
+        Py_BEGIN_ALLOW_THREADS                        \
+        PyThread_acquire_lock(_svb_lock, WAIT_LOCK);  \
+        __VA_ARGS__;                                  \
+        PyThread_release_lock(_svb_lock);             \
+        Py_END_ALLOW_THREADS                          \
+    }
+
+#define SVB_CALL(iCameraID, ...) \
+    SVB_LOCKED_CALL(svb_lock_for(camera_locks, iCameraID), __VA_ARGS__)
+
+#define SVB_VIDEO_CALL(iCameraID, ...) \
+    SVB_LOCKED_CALL(svb_lock_for(video_locks, iCameraID), __VA_ARGS__)
+
+static int svb_alloc_locks(void)
+{
+    if (!(sdk_lock = PyThread_allocate_lock()))
+    {
+        return -1;
+    }
+
+    for (int i = 0; i < SVBCAMERA_ID_MAX; i++)
+    {
+        if (!(camera_locks[i] = PyThread_allocate_lock()) ||
+            !(video_locks[i] = PyThread_allocate_lock()))
+        {
+            return -1;
+        }
+    }
+
+    return 0;
+}
+
 static PyObject *py_SVBGetNumOfConnectedCameras(PyObject *self, PyObject *args)
 {
-    int res = SVBGetNumOfConnectedCameras();
+    int res = 0;
+    SVB_CALL(SVB_NO_CAMERA, res = SVBGetNumOfConnectedCameras());
 
     /*This builds the answer back into a python object */
     return Py_BuildValue("i", res);
@@ -21,99 +91,97 @@ static PyObject *py_SVBGetCameraInfo(PyObject *self, PyObject *args)
 {
     // Default values
     int err = -1, iCameraIndex = err;
-    PyObject *ret_obj = Py_BuildValue("{s:s,s:s,s:s,s:i,s:i}",
-        "FriendlyName", "", "CameraSN", "",
-        "PortType", "", "DeviceID", 0,
-        "CameraID", 0
-    );
+    SVB_CAMERA_INFO info = {"", "", "", 0, 0};
 
     if (PyArg_ParseTuple(args, "i", &iCameraIndex))
     {
-        SVB_CAMERA_INFO info;
-        err = SVBGetCameraInfo(&info, iCameraIndex);
-        if (err ==  SVB_SUCCESS) {
-            ret_obj = Py_BuildValue("{s:s,s:s,s:s,s:i,s:i}",
-                "FriendlyName", info.FriendlyName, "CameraSN", info.CameraSN,
-                "PortType", info.PortType, "DeviceID", info.DeviceID,
-                "CameraID", info.CameraID
-            );
+        SVB_CALL(SVB_NO_CAMERA, err = SVBGetCameraInfo(&info, iCameraIndex));
+        if (err != SVB_SUCCESS) {
+            memset(&info, 0, sizeof(info));
         }
     }
 
-    return Py_BuildValue("Oi", ret_obj, err);
+    return Py_BuildValue("(sssIi)i",
+        info.FriendlyName, info.CameraSN, info.PortType,
+        info.DeviceID, info.CameraID, err);
 }
 
 static PyObject *py_SVBGetCameraProperty(PyObject *self, PyObject *args)
 {
     // Default values
-    int err = -1, iCameraID = err;
-    PyObject *supportedBinsList = PyList_New(0);
-    PyObject *supportedVideoFormatsList = PyList_New(0);
-    PyObject *ret_obj = Py_BuildValue("{s:l,s:l,s:i,s:i,s:O,s:O,s:i,s:i}",
-            "MaxHeight", 0, "MaxWidth", 0,
-            "IsColorCam", 0, "BayerPattern", 0,
-            "SupportedBins", supportedBinsList, "SupportedVideoFormat", supportedVideoFormatsList,
-            "MaxBitDepth", 0, "IsTriggerCam", 0
-    );
+    int err = -1, iCameraID = err, nBins = 0, nVideoFormats = 0;
+    SVB_CAMERA_PROPERTY props;
 
+    memset(&props, 0, sizeof(props));
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        SVB_CAMERA_PROPERTY props;
-        err = SVBGetCameraProperty(iCameraID, &props);
+        SVB_CALL(iCameraID, err = SVBGetCameraProperty(iCameraID, &props));
+        if (err != SVB_SUCCESS) {
+            memset(&props, 0, sizeof(props));
+        }
+    }
 
-        // Supported bins
-        // Supported video formats
+    // Supported bins, 0 is the end of the list
+    while (nBins < sizeof(props.SupportedBins) / sizeof(props.SupportedBins[0]) &&
+           props.SupportedBins[nBins] != 0)
+    {
+        nBins++;
+    }
 
-        if (err ==  SVB_SUCCESS) {
-            for (int i = 0; i < sizeof(props.SupportedBins)/sizeof(props.SupportedBins[0]); i++)
-            {
-                if (props.SupportedBins[i] == 0) break;
-                PyList_Append(supportedBinsList, Py_BuildValue("i", props.SupportedBins[i]));
-            }
+    // Supported video formats, SVB_IMG_END is the end of the list
+    while (err == SVB_SUCCESS &&
+           nVideoFormats < sizeof(props.SupportedVideoFormat) / sizeof(props.SupportedVideoFormat[0]) &&
+           props.SupportedVideoFormat[nVideoFormats] != SVB_IMG_END)
+    {
+        nVideoFormats++;
+    }
 
-            for (int i = 0; i < sizeof(props.SupportedVideoFormat) / sizeof(props.SupportedVideoFormat[0]); i++)
-            {
-                if (props.SupportedVideoFormat[i] == SVB_IMG_END) break;
-                PyList_Append(supportedVideoFormatsList, Py_BuildValue("i", props.SupportedVideoFormat[i]));
-            }
+    PyObject *supportedBins = PyTuple_New(nBins);
+    PyObject *supportedVideoFormats = PyTuple_New(nVideoFormats);
+    if (!supportedBins || !supportedVideoFormats)
+    {
+        Py_XDECREF(supportedBins);
+        Py_XDECREF(supportedVideoFormats);
+        return NULL;
+    }
 
-            ret_obj = Py_BuildValue("{s:l,s:l,s:i,s:i,s:O,s:O,s:i,s:i}",
-                "MaxHeight", props.MaxHeight, "MaxWidth", props.MaxWidth,
-                "IsColorCam", props.IsColorCam, "BayerPattern", props.BayerPattern,
-                "SupportedBins", supportedBinsList, "SupportedVideoFormat", supportedVideoFormatsList,
-                "MaxBitDepth", props.MaxBitDepth, "IsTriggerCam", props.IsTriggerCam
-            );
-        }
+    for (int i = 0; i < nBins; i++)
+    {
+        PyTuple_SET_ITEM(supportedBins, i, PyLong_FromLong(props.SupportedBins[i]));
     }
 
+    for (int i = 0; i < nVideoFormats; i++)
+    {
+        PyTuple_SET_ITEM(supportedVideoFormats, i, PyLong_FromLong(props.SupportedVideoFormat[i]));
+    }
 
-    return Py_BuildValue("Oi", ret_obj, err);
+    // N steals the references of the tuples
+    return Py_BuildValue("(lliiNNii)i",
+        props.MaxHeight, props.MaxWidth,
+        props.IsColorCam, props.BayerPattern,
+        supportedBins, supportedVideoFormats,
+        props.MaxBitDepth, props.IsTriggerCam, err);
 }
 
 static PyObject *py_SVBGetCameraPropertyEx(PyObject *self, PyObject *args)
 {
     // Default values
     int err = -1, iCameraID = err;
-    PyObject *ret_obj = Py_BuildValue("{s:i, s:i}",
-                "bSupportPulseGuide", 0,
-                "bSupportControlTemp", 0
-    );
+    SVB_CAMERA_PROPERTY_EX prop_ex;
+
+    memset(&prop_ex, 0, sizeof(prop_ex));
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        SVB_CAMERA_PROPERTY_EX prop_ex;
-        err = SVBGetCameraPropertyEx(iCameraID, &prop_ex);
-        if (err ==  SVB_SUCCESS) {
-            ret_obj = Py_BuildValue("{s:i, s:i}",
-                    "bSupportPulseGuide", prop_ex.bSupportPulseGuide,
-                    "bSupportControlTemp", prop_ex.bSupportControlTemp
-            );
+        SVB_CALL(iCameraID, err = SVBGetCameraPropertyEx(iCameraID, &prop_ex));
+        if (err != SVB_SUCCESS) {
+            memset(&prop_ex, 0, sizeof(prop_ex));
         }
     }
 
     /*This builds the answer back into a python object */
-    return Py_BuildValue("Oi", ret_obj, err);
+    return Py_BuildValue("(ii)i", prop_ex.bSupportPulseGuide, prop_ex.bSupportControlTemp, err);
 }
 
 static PyObject *py_SVBOpenCamera(PyObject *self, PyObject *args)
@@ -122,7 +190,7 @@ static PyObject *py_SVBOpenCamera(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBOpenCamera(iCameraID);
+        SVB_CALL(iCameraID, err = SVBOpenCamera(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -134,7 +202,7 @@ static PyObject *py_SVBCloseCamera(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBCloseCamera(iCameraID);
+        SVB_CALL(iCameraID, err = SVBCloseCamera(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -146,7 +214,7 @@ static PyObject *py_SVBGetNumOfControls(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetNumOfControls(iCameraID, &numberOfControls);
+        SVB_CALL(iCameraID, err = SVBGetNumOfControls(iCameraID, &numberOfControls));
     }
 
     /*This builds the answer back into a python object */
@@ -157,27 +225,22 @@ static PyObject *py_SVBGetControlCaps(PyObject *self, PyObject *args)
 {
     // Default values
     int err = -1, controlIndex = err, iCameraID = err;
-    PyObject *ret_obj = Py_BuildValue("{s:s, s:s, s:l, s:l, s:l, s:i, s:i, s:i}",
-                "Name", "", "Description", "",
-                "MaxValue", 0, "MinValue", 0,
-                "DefaultValue", 0, "IsAutoSupported", 0,
-                "IsWritable", 0, "ControlType", 0);
+    SVB_CONTROL_CAPS ctrl_caps;
+
+    memset(&ctrl_caps, 0, sizeof(ctrl_caps));
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &controlIndex))
     {
-        SVB_CONTROL_CAPS ctrl_caps;
-        err = SVBGetControlCaps(iCameraID, controlIndex, &ctrl_caps);
-
-        if (err ==  SVB_SUCCESS) {
-            ret_obj = Py_BuildValue("{s:s, s:s, s:l, s:l, s:l, s:i, s:i, s:i}",
-                "Name", ctrl_caps.Name, "Description", ctrl_caps.Description,
-                "MaxValue", ctrl_caps.MaxValue, "MinValue", ctrl_caps.MinValue,
-                "DefaultValue", ctrl_caps.DefaultValue, "IsAutoSupported", ctrl_caps.IsAutoSupported,
-                "IsWritable", ctrl_caps.IsWritable, "ControlType", ctrl_caps.ControlType);
+        SVB_CALL(iCameraID, err = SVBGetControlCaps(iCameraID, controlIndex, &ctrl_caps));
+        if (err != SVB_SUCCESS) {
+            memset(&ctrl_caps, 0, sizeof(ctrl_caps));
         }
     }
 
-    return Py_BuildValue("Oi", ret_obj, err);
+    return Py_BuildValue("(ssllliii)i",
+        ctrl_caps.Name, ctrl_caps.Description,
+        ctrl_caps.MaxValue, ctrl_caps.MinValue, ctrl_caps.DefaultValue,
+        ctrl_caps.IsAutoSupported, ctrl_caps.IsWritable, ctrl_caps.ControlType, err);
 }
 
 static PyObject *py_SVBGetControlValue(PyObject *self, PyObject *args)
@@ -188,7 +251,7 @@ static PyObject *py_SVBGetControlValue(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &controlType))
     {
-        err = SVBGetControlValue(iCameraID, controlType, &controlValue, &pbauto);
+        SVB_CALL(iCameraID, err = SVBGetControlValue(iCameraID, controlType, &controlValue, &pbauto));
     }
 
     /*This builds the answer back into a python object */
@@ -203,13 +266,241 @@ static PyObject *py_SVBSetControlValue(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "iili", &iCameraID, &controlType, &controlValue, &pbauto))
     {
-        err = SVBSetControlValue(iCameraID, controlType, controlValue, pbauto);
+        SVB_CALL(iCameraID, err = SVBSetControlValue(iCameraID, controlType, controlValue, pbauto));
     }
 
     /*This builds the answer back into a python object */
     return Py_BuildValue("i", err);
 }
 
+/*
+ * Batched controls access: the controls are read (or written) in a single
+ * native loop under one camera lock acquisition, instead of one python call
+ * per control. Values and per control errors come back as dicts keyed by
+ * control type, err is SVB_SUCCESS unless every control failed.
+ */
+static PyObject *py_SVBGetControlValues(PyObject *self, PyObject *args)
+{
+    int err = SVB_SUCCESS, iCameraID = -1, failed = 0;
+    PyObject *controlTypes = NULL, *seq = NULL, *values = NULL, *errors = NULL;
+    int *types = NULL, *errs = NULL;
+    long *controlValues = NULL;
+    SVB_BOOL *autos = NULL;
+    Py_ssize_t n = 0;
+
+    if (!PyArg_ParseTuple(args, "iO", &iCameraID, &controlTypes))
+    {
+        return NULL;
+    }
+
+    if (!(seq = PySequence_Fast(controlTypes, "control types must be a sequence")))
+    {
+        return NULL;
+    }
+
+    n = PySequence_Fast_GET_SIZE(seq);
+    types = PyMem_Calloc(n ? n : 1, sizeof(int));
+    errs = PyMem_Calloc(n ? n : 1, sizeof(int));
+    controlValues = PyMem_Calloc(n ? n : 1, sizeof(long));
+    autos = PyMem_Calloc(n ? n : 1, sizeof(SVB_BOOL));
+    if (!types || !errs || !controlValues || !autos)
+    {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        types[i] = (int)PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i));
+        if (types[i] == -1 && PyErr_Occurred())
+        {
+            goto done;
+        }
+    }
+
+    SVB_CALL(iCameraID, for (Py_ssize_t i = 0; i < n; i++) {
+        errs[i] = SVBGetControlValue(iCameraID, types[i], &controlValues[i], &autos[i]);
+    });
+
+    if (!(values = PyDict_New()) || !(errors = PyDict_New()))
+    {
+        goto done;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        PyObject *key = PyLong_FromLong(types[i]), *item = NULL;
+        int res = -1;
+
+        if (!key)
+        {
+            goto done;
+        }
+
+        if (errs[i] == SVB_SUCCESS)
+        {
+            item = Py_BuildValue("(lN)", controlValues[i], PyBool_FromLong(autos[i]));
+            res = item ? PyDict_SetItem(values, key, item) : -1;
+        }
+        else
+        {
+            if (!failed++)
+            {
+                err = errs[i];
+            }
+            item = PyLong_FromLong(errs[i]);
+            res = item ? PyDict_SetItem(errors, key, item) : -1;
+        }
+
+        Py_DECREF(key);
+        Py_XDECREF(item);
+        if (res < 0)
+        {
+            goto done;
+        }
+    }
+
+    if (failed < n || n == 0)
+    {
+        err = SVB_SUCCESS;
+    }
+
+done:
+    PyMem_Free(types);
+    PyMem_Free(errs);
+    PyMem_Free(controlValues);
+    PyMem_Free(autos);
+    Py_DECREF(seq);
+
+    if (PyErr_Occurred())
+    {
+        Py_XDECREF(values);
+        Py_XDECREF(errors);
+        return NULL;
+    }
+
+    /*This builds the answer back into a python object */
+    return Py_BuildValue("NNi", values, errors, err);
+}
+
+static PyObject *py_SVBSetControlValues(PyObject *self, PyObject *args)
+{
+    int err = SVB_SUCCESS, iCameraID = -1, failed = 0;
+    PyObject *controls = NULL, *items = NULL, *errors = NULL;
+    int *types = NULL, *errs = NULL;
+    long *controlValues = NULL;
+    SVB_BOOL *autos = NULL;
+    Py_ssize_t n = 0;
+
+    if (!PyArg_ParseTuple(args, "iO!", &iCameraID, &PyDict_Type, &controls))
+    {
+        return NULL;
+    }
+
+    if (!(items = PyDict_Items(controls)))
+    {
+        return NULL;
+    }
+
+    n = PyList_GET_SIZE(items);
+    types = PyMem_Calloc(n ? n : 1, sizeof(int));
+    errs = PyMem_Calloc(n ? n : 1, sizeof(int));
+    controlValues = PyMem_Calloc(n ? n : 1, sizeof(long));
+    autos = PyMem_Calloc(n ? n : 1, sizeof(SVB_BOOL));
+    if (!types || !errs || !controlValues || !autos)
+    {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    /* Values are (value, auto) tuples or plain values (auto off) */
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        PyObject *item = PyList_GET_ITEM(items, i);
+        PyObject *value = PyTuple_GET_ITEM(item, 1);
+        int bAuto = 0;
+
+        types[i] = (int)PyLong_AsLong(PyTuple_GET_ITEM(item, 0));
+        if (types[i] == -1 && PyErr_Occurred())
+        {
+            goto done;
+        }
+
+        if (PyTuple_Check(value))
+        {
+            if (!PyArg_ParseTuple(value, "lp", &controlValues[i], &bAuto))
+            {
+                goto done;
+            }
+        }
+        else
+        {
+            controlValues[i] = PyLong_AsLong(value);
+            if (controlValues[i] == -1 && PyErr_Occurred())
+            {
+                goto done;
+            }
+        }
+        autos[i] = bAuto ? SVB_TRUE : SVB_FALSE;
+    }
+
+    SVB_CALL(iCameraID, for (Py_ssize_t i = 0; i < n; i++) {
+        errs[i] = SVBSetControlValue(iCameraID, types[i], controlValues[i], autos[i]);
+    });
+
+    if (!(errors = PyDict_New()))
+    {
+        goto done;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++)
+    {
+        PyObject *key = NULL, *item = NULL;
+        int res = -1;
+
+        if (errs[i] == SVB_SUCCESS)
+        {
+            continue;
+        }
+
+        if (!failed++)
+        {
+            err = errs[i];
+        }
+
+        key = PyLong_FromLong(types[i]);
+        item = PyLong_FromLong(errs[i]);
+        res = key && item ? PyDict_SetItem(errors, key, item) : -1;
+        Py_XDECREF(key);
+        Py_XDECREF(item);
+        if (res < 0)
+        {
+            goto done;
+        }
+    }
+
+    if (failed < n || n == 0)
+    {
+        err = SVB_SUCCESS;
+    }
+
+done:
+    PyMem_Free(types);
+    PyMem_Free(errs);
+    PyMem_Free(controlValues);
+    PyMem_Free(autos);
+    Py_DECREF(items);
+
+    if (PyErr_Occurred())
+    {
+        Py_XDECREF(errors);
+        return NULL;
+    }
+
+    /*This builds the answer back into a python object */
+    return Py_BuildValue("Ni", errors, err);
+}
+
 static PyObject *py_SVBGetOutputImageType(PyObject *self, PyObject *args)
 {
     int err = -1, iCameraID = err;
@@ -217,7 +508,7 @@ static PyObject *py_SVBGetOutputImageType(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetOutputImageType(iCameraID, &imageType);
+        SVB_CALL(iCameraID, err = SVBGetOutputImageType(iCameraID, &imageType));
     }
 
     /*This builds the answer back into a python object */
@@ -231,7 +522,7 @@ static PyObject *py_SVBSetOutputImageType(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &imageType))
     {
-        err = SVBSetOutputImageType(iCameraID, imageType);
+        SVB_CALL(iCameraID, err = SVBSetOutputImageType(iCameraID, imageType));
     }
 
     /*This builds the answer back into a python object */
@@ -245,7 +536,7 @@ static PyObject *py_SVBSetROIFormat(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "iiiiii", &iCameraID, &iStartX, &iStartY, &iWidth, &iHeight, &iBin))
     {
-        err = SVBSetROIFormat(iCameraID, iStartX, iStartY, iWidth, iHeight, iBin);
+        SVB_CALL(iCameraID, err = SVBSetROIFormat(iCameraID, iStartX, iStartY, iWidth, iHeight, iBin));
     }
 
     /*This builds the answer back into a python object */
@@ -259,7 +550,7 @@ static PyObject *py_SVBGetROIFormat(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetROIFormat(iCameraID, &iStartX, &iStartY, &iWidth, &iHeight, &iBin);
+        SVB_CALL(iCameraID, err = SVBGetROIFormat(iCameraID, &iStartX, &iStartY, &iWidth, &iHeight, &iBin));
     }
 
     return Py_BuildValue("iiiiii", iStartX, iStartY, iWidth, iHeight, iBin, err);
@@ -271,7 +562,7 @@ static PyObject *py_SVBGetDroppedFrames(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetDroppedFrames(iCameraID, &piDropFrames);
+        SVB_CALL(iCameraID, err = SVBGetDroppedFrames(iCameraID, &piDropFrames));
     }
 
     return Py_BuildValue("ii", piDropFrames, err);
@@ -283,7 +574,7 @@ static PyObject *py_SVBStartVideoCapture(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBStartVideoCapture(iCameraID);
+        SVB_CALL(iCameraID, err = SVBStartVideoCapture(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -295,7 +586,7 @@ static PyObject *py_SVBStopVideoCapture(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBStopVideoCapture(iCameraID);
+        SVB_CALL(iCameraID, err = SVBStopVideoCapture(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -310,10 +601,46 @@ static PyObject *py_SVBGetVideoData(PyObject *self, PyObject *args)
         return Py_BuildValue("y#i", NULL, sizeof(NULL), err);
     }
 
-    unsigned char *pBuffer = malloc(lBuffSize * sizeof(unsigned char));
-    err = SVBGetVideoData(iCameraID, pBuffer, lBuffSize, iWaitms);
+    // The SDK writes straight into the bytes object: no temporary buffer, no copy
+    PyObject *data = PyBytes_FromStringAndSize(NULL, lBuffSize);
+    if (!data)
+    {
+        return NULL;
+    }
+
+    unsigned char *pBuffer = (unsigned char *)PyBytes_AS_STRING(data);
+    SVB_VIDEO_CALL(iCameraID, err = SVBGetVideoData(iCameraID, pBuffer, lBuffSize, iWaitms));
 
-    return Py_BuildValue("y#i", pBuffer, lBuffSize, err);
+    return Py_BuildValue("Ni", data, err);
+}
+
+static PyObject *py_SVBGetVideoDataInto(PyObject *self, PyObject *args)
+{
+    int err = -1, iCameraID = err, iWaitms = 0;
+    Py_ssize_t lBuffSize = -1;
+    Py_buffer buffer;
+
+    // Any writable contiguous buffer: bytearray, memoryview, numpy array, mmap...
+    if (!PyArg_ParseTuple(args, "iw*i|n", &iCameraID, &buffer, &iWaitms, &lBuffSize))
+    {
+        return NULL;
+    }
+
+    if (lBuffSize < 0)
+    {
+        lBuffSize = buffer.len;
+    }
+
+    if (lBuffSize > buffer.len || lBuffSize > LONG_MAX)
+    {
+        PyBuffer_Release(&buffer);
+        return Py_BuildValue("ni", (Py_ssize_t)0, SVB_ERROR_BUFFER_TOO_SMALL);
+    }
+
+    SVB_VIDEO_CALL(iCameraID, err = SVBGetVideoData(iCameraID, (unsigned char *)buffer.buf, (long)lBuffSize, iWaitms));
+    PyBuffer_Release(&buffer);
+
+    return Py_BuildValue("ni", err == SVB_SUCCESS ? lBuffSize : 0, err);
 }
 
 static PyObject *py_SVBWhiteBalanceOnce(PyObject *self, PyObject *args)
@@ -322,7 +649,7 @@ static PyObject *py_SVBWhiteBalanceOnce(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBWhiteBalanceOnce(iCameraID);
+        SVB_CALL(iCameraID, err = SVBWhiteBalanceOnce(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -338,40 +665,62 @@ static PyObject *py_SVBGetCameraFirmwareVersion(PyObject *self, PyObject *args)
         return Py_BuildValue("si", "", err);
     }
 
-    char *pCameraFirmwareVersion = malloc(buffSize * sizeof(char));
-    err = SVBGetCameraFirmwareVersion(iCameraID, pCameraFirmwareVersion);
+    size_t size = buffSize > SVB_VERSION_BUFF_MIN ? (size_t)buffSize : SVB_VERSION_BUFF_MIN;
+    char *pCameraFirmwareVersion = PyMem_Calloc(size + 1, sizeof(char));
+    if (!pCameraFirmwareVersion)
+    {
+        return PyErr_NoMemory();
+    }
+
+    SVB_CALL(iCameraID, err = SVBGetCameraFirmwareVersion(iCameraID, pCameraFirmwareVersion));
+    if (err != SVB_SUCCESS)
+    {
+        pCameraFirmwareVersion[0] = '\0';
+    }
+    pCameraFirmwareVersion[size] = '\0';
 
-    return Py_BuildValue("si", pCameraFirmwareVersion, err);
+    PyObject *ret_obj = Py_BuildValue("si", pCameraFirmwareVersion, err);
+    PyMem_Free(pCameraFirmwareVersion);
+    return ret_obj;
 }
 
 static PyObject *py_SVBGetSDKVersion(PyObject *self, PyObject *args)
 {
-    const char *version = SVBGetSDKVersion();
+    const char *version = NULL;
+    SVB_CALL(SVB_NO_CAMERA, version = SVBGetSDKVersion());
     return Py_BuildValue("s", version);
 }
 
 static PyObject *py_SVBGetCameraSupportMode(PyObject *self, PyObject *args)
 {
-    int err = -1, iCameraID = err;
-    PyObject *supportedModes = PyList_New(0);
-    PyObject *ret_obj = Py_BuildValue("{s:O}", "SupportedCameraMode", supportedModes);
+    int err = -1, iCameraID = err, nModes = 0;
+    SVB_SUPPORTED_MODE modes;
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        SVB_SUPPORTED_MODE modes;
-        err = SVBGetCameraSupportMode(iCameraID, &modes);
+        SVB_CALL(iCameraID, err = SVBGetCameraSupportMode(iCameraID, &modes));
+    }
 
-        if (err ==  SVB_SUCCESS) {
-            for (int i = 0; i < sizeof(modes.SupportedCameraMode)/sizeof(modes.SupportedCameraMode[0]); i++)
-            {
-                if (modes.SupportedCameraMode[i] == SVB_MODE_END) break;
-                PyList_Append(supportedModes, Py_BuildValue("i", modes.SupportedCameraMode[i]));
-            }
-        }
+    // SVB_MODE_END is the end of the list
+    while (err == SVB_SUCCESS &&
+           nModes < sizeof(modes.SupportedCameraMode) / sizeof(modes.SupportedCameraMode[0]) &&
+           modes.SupportedCameraMode[nModes] != SVB_MODE_END)
+    {
+        nModes++;
     }
 
+    PyObject *supportedModes = PyTuple_New(nModes);
+    if (!supportedModes)
+    {
+        return NULL;
+    }
 
-    return Py_BuildValue("Oi", ret_obj, err);
+    for (int i = 0; i < nModes; i++)
+    {
+        PyTuple_SET_ITEM(supportedModes, i, PyLong_FromLong(modes.SupportedCameraMode[i]));
+    }
+
+    return Py_BuildValue("Ni", supportedModes, err);
 }
 
 static PyObject *py_SVBGetCameraMode(PyObject *self, PyObject *args)
@@ -380,7 +729,7 @@ static PyObject *py_SVBGetCameraMode(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetCameraMode(iCameraID, &mode);
+        SVB_CALL(iCameraID, err = SVBGetCameraMode(iCameraID, &mode));
     }
 
     return Py_BuildValue("ii", mode, err);
@@ -392,7 +741,7 @@ static PyObject *py_SVBSetCameraMode(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &mode))
     {
-        err = SVBSetCameraMode(iCameraID, mode);
+        SVB_CALL(iCameraID, err = SVBSetCameraMode(iCameraID, mode));
     }
 
     return Py_BuildValue("i", err);
@@ -404,7 +753,7 @@ static PyObject *py_SVBSendSoftTrigger(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBSendSoftTrigger(iCameraID);
+        SVB_CALL(iCameraID, err = SVBSendSoftTrigger(iCameraID));
     }
 
     return Py_BuildValue("i", err);
@@ -413,20 +762,22 @@ static PyObject *py_SVBSendSoftTrigger(PyObject *self, PyObject *args)
 static PyObject *py_SVBGetSerialNumber(PyObject *self, PyObject *args)
 {
     int err = -1, iCameraID = err;
-    PyObject *ret_obj = Py_BuildValue("{s:s}", "id", "");
+    SVB_SN sn;
+
+    memset(&sn, 0, sizeof(sn));
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        SVB_SN sn;
-        err = SVBGetSerialNumber(iCameraID, &sn);
-
-        if(err == SVB_SUCCESS) {
-            ret_obj = Py_BuildValue("{s:s}", "id", sn.id);
+        SVB_CALL(iCameraID, err = SVBGetSerialNumber(iCameraID, &sn));
+        if (err != SVB_SUCCESS) {
+            memset(&sn, 0, sizeof(sn));
         }
-
     }
 
-    return Py_BuildValue("Oi", ret_obj, err);
+    // Make sure the id is terminated
+    sn.id[sizeof(sn.id) - 1] = 0;
+
+    return Py_BuildValue("si", (const char *)sn.id, err);
 }
 
 static PyObject *py_SVBSetTriggerOutputIOConf(PyObject *self, PyObject *args)
@@ -438,7 +789,7 @@ static PyObject *py_SVBSetTriggerOutputIOConf(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "iiill", &iCameraID, &pin, &bPinHigh, &lDelay, &lDuration))
     {
-        err = SVBSetTriggerOutputIOConf(iCameraID, pin, bPinHigh, lDelay, lDuration);
+        SVB_CALL(iCameraID, err = SVBSetTriggerOutputIOConf(iCameraID, pin, bPinHigh, lDelay, lDuration));
     }
 
     return Py_BuildValue("i", err);
@@ -453,7 +804,7 @@ static PyObject *py_SVBGetTriggerOutputIOConf(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &pin))
     {
-        err = SVBGetTriggerOutputIOConf(iCameraID, pin, &bPinHigh, &lDelay, &lDuration);
+        SVB_CALL(iCameraID, err = SVBGetTriggerOutputIOConf(iCameraID, pin, &bPinHigh, &lDelay, &lDuration));
     }
 
     return Py_BuildValue("illi", bPinHigh, lDelay, lDuration, err);
@@ -466,7 +817,7 @@ static PyObject *py_SVBPulseGuide(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "iii", &iCameraID, &direction, &duration))
     {
-        err = SVBPulseGuide(iCameraID, direction, duration);
+        SVB_CALL(iCameraID, err = SVBPulseGuide(iCameraID, direction, duration));
     }
 
     return Py_BuildValue("i", err);
@@ -479,7 +830,7 @@ static PyObject *py_SVBGetSensorPixelSize(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBGetSensorPixelSize(iCameraID, &fPixelSize);
+        SVB_CALL(iCameraID, err = SVBGetSensorPixelSize(iCameraID, &fPixelSize));
     }
 
     return Py_BuildValue("fi", fPixelSize, err);
@@ -492,7 +843,7 @@ static PyObject *py_SVBCanPulseGuide(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBCanPulseGuide(iCameraID, &CanPulseGuide);
+        SVB_CALL(iCameraID, err = SVBCanPulseGuide(iCameraID, &CanPulseGuide));
     }
 
     return Py_BuildValue("ii", CanPulseGuide, err);
@@ -505,7 +856,7 @@ static PyObject *py_SVBSetAutoSaveParam(PyObject *self, PyObject *args)
 
     if (PyArg_ParseTuple(args, "ii", &iCameraID, &enable))
     {
-        err = SVBSetAutoSaveParam(iCameraID, enable);
+        SVB_CALL(iCameraID, err = SVBSetAutoSaveParam(iCameraID, enable));
     }
 
     return Py_BuildValue("i", err);
@@ -521,25 +872,453 @@ static PyObject *py_SVBIsCameraNeedToUpgrade(PyObject *self, PyObject *args)
         return Py_BuildValue("isi", needToUpgrade, "", err);
     }
 
-    char *needToUpgradeMinVersion = malloc(buffSize * sizeof(char));
-    err = SVBIsCameraNeedToUpgrade(iCameraID, needToUpgrade, needToUpgradeMinVersion);
+    size_t size = buffSize > SVB_VERSION_BUFF_MIN ? (size_t)buffSize : SVB_VERSION_BUFF_MIN;
+    char *needToUpgradeMinVersion = PyMem_Calloc(size + 1, sizeof(char));
+    if (!needToUpgradeMinVersion)
+    {
+        return PyErr_NoMemory();
+    }
+
+    SVB_CALL(iCameraID, err = SVBIsCameraNeedToUpgrade(iCameraID, &needToUpgrade, needToUpgradeMinVersion));
+    if (err != SVB_SUCCESS)
+    {
+        needToUpgradeMinVersion[0] = '\0';
+    }
+    needToUpgradeMinVersion[size] = '\0';
 
-    return Py_BuildValue("isi", needToUpgrade, needToUpgradeMinVersion, err);
+    PyObject *ret_obj = Py_BuildValue("isi", needToUpgrade, needToUpgradeMinVersion, err);
+    PyMem_Free(needToUpgradeMinVersion);
+    return ret_obj;
 }
 
-static *py_SVBRestoreDefaultParam(PyObject *self, PyObject *args) 
+static PyObject *py_SVBRestoreDefaultParam(PyObject *self, PyObject *args) 
 {
     
     int err = -1, iCameraID = err;
 
     if (PyArg_ParseTuple(args, "i", &iCameraID))
     {
-        err = SVBRestoreDefaultParam(iCameraID);
+        SVB_CALL(iCameraID, err = SVBRestoreDefaultParam(iCameraID));
     }
 
     return Py_BuildValue("i", err);
 }
 
+/*
+ * Ring capture: a native thread drains SVBGetVideoData continuously into a
+ * ring of preallocated slots, python pops the frames at its own pace.
+ * The ring owns depth + 2 slots: the one being filled by the thread, the one
+ * being copied out by a reader and up to depth ready frames. When the ring is
+ * full the oldest ready frame is dropped and counted as an overrun.
+ */
+typedef struct
+{
+    int iCameraID;
+    int depth;
+    int iWaitms;
+    long lBuffSize;
+    unsigned char *slots;
+    unsigned long long *sequences;
+    double *timestamps;
+    int *ready;
+    int *free_slots;
+    int free_count;
+    int head;
+    int count;
+    int filling;
+    int running;
+    int pending;
+    int last_err;
+    int high_water;
+    unsigned long long frames;
+    unsigned long long overruns;
+    unsigned long long timeouts;
+    // Fields below are only used with the GIL held
+    int users;
+    int stopped;
+    PyThread_type_lock mutex;
+    PyThread_type_lock available;
+    PyThread_type_lock reader;
+    PyThread_type_lock done;
+} svb_ring;
+
+static svb_ring *rings[SVBCAMERA_ID_MAX];
+
+static double svb_monotonic(void)
+{
+#ifdef _WIN32
+    LARGE_INTEGER frequency, counter;
+    QueryPerformanceFrequency(&frequency);
+    QueryPerformanceCounter(&counter);
+    return (double)counter.QuadPart / (double)frequency.QuadPart;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+#endif
+}
+
+static void svb_ring_free(svb_ring *ring)
+{
+    if (ring->mutex) PyThread_free_lock(ring->mutex);
+    if (ring->available) PyThread_free_lock(ring->available);
+    if (ring->reader) PyThread_free_lock(ring->reader);
+    if (ring->done) PyThread_free_lock(ring->done);
+    PyMem_RawFree(ring->slots);
+    PyMem_RawFree(ring->sequences);
+    PyMem_RawFree(ring->timestamps);
+    PyMem_RawFree(ring->ready);
+    PyMem_RawFree(ring->free_slots);
+    PyMem_RawFree(ring);
+}
+
+static svb_ring *svb_ring_alloc(int iCameraID, int depth, long lBuffSize, int iWaitms)
+{
+    int nslots = depth + 2;
+    svb_ring *ring = PyMem_RawCalloc(1, sizeof(svb_ring));
+
+    if (!ring)
+    {
+        return NULL;
+    }
+
+    ring->iCameraID = iCameraID;
+    ring->depth = depth;
+    ring->iWaitms = iWaitms;
+    ring->lBuffSize = lBuffSize;
+    ring->running = 1;
+    ring->last_err = SVB_SUCCESS;
+    ring->slots = PyMem_RawMalloc((size_t)nslots * (size_t)lBuffSize);
+    ring->sequences = PyMem_RawCalloc(nslots, sizeof(unsigned long long));
+    ring->timestamps = PyMem_RawCalloc(nslots, sizeof(double));
+    ring->ready = PyMem_RawCalloc(depth, sizeof(int));
+    ring->free_slots = PyMem_RawCalloc(nslots, sizeof(int));
+    ring->mutex = PyThread_allocate_lock();
+    ring->available = PyThread_allocate_lock();
+    ring->reader = PyThread_allocate_lock();
+    ring->done = PyThread_allocate_lock();
+
+    if (!ring->slots || !ring->sequences || !ring->timestamps || !ring->ready || !ring->free_slots ||
+        !ring->mutex || !ring->available || !ring->reader || !ring->done)
+    {
+        svb_ring_free(ring);
+        return NULL;
+    }
+
+    // Slot 0 is filled first, the others are free
+    ring->filling = 0;
+    for (int i = 1; i < nslots; i++)
+    {
+        ring->free_slots[ring->free_count++] = i;
+    }
+
+    // available and done are held while there is nothing to signal
+    PyThread_acquire_lock(ring->available, WAIT_LOCK);
+    PyThread_acquire_lock(ring->done, WAIT_LOCK);
+
+    return ring;
+}
+
+// Wake up a reader, must be called with the ring mutex held
+static void svb_ring_signal(svb_ring *ring)
+{
+    if (!ring->pending)
+    {
+        ring->pending = 1;
+        PyThread_release_lock(ring->available);
+    }
+}
+
+static void svb_ring_thread(void *arg)
+{
+    svb_ring *ring = (svb_ring *)arg;
+    PyThread_type_lock video_lock = svb_lock_for(video_locks, ring->iCameraID);
+    unsigned long long sequence = 0;
+    int err, running, slot;
+    double timestamp;
+
+    for (;;)
+    {
+        PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+        running = ring->running;
+        slot = ring->filling;
+        PyThread_release_lock(ring->mutex);
+
+        if (!running)
+        {
+            break;
+        }
+
+        PyThread_acquire_lock(video_lock, WAIT_LOCK);
+        err = SVBGetVideoData(ring->iCameraID, ring->slots + (size_t)slot * (size_t)ring->lBuffSize,
+                              ring->lBuffSize, ring->iWaitms);
+        PyThread_release_lock(video_lock);
+        timestamp = svb_monotonic();
+
+        PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+        if (err == SVB_SUCCESS)
+        {
+            if (ring->count == ring->depth)
+            {
+                ring->free_slots[ring->free_count++] = ring->ready[ring->head];
+                ring->head = (ring->head + 1) % ring->depth;
+                ring->count--;
+                ring->overruns++;
+            }
+
+            ring->sequences[slot] = sequence++;
+            ring->timestamps[slot] = timestamp;
+            ring->ready[(ring->head + ring->count) % ring->depth] = slot;
+            ring->count++;
+            ring->frames++;
+            if (ring->count > ring->high_water)
+            {
+                ring->high_water = ring->count;
+            }
+
+            ring->filling = ring->free_slots[--ring->free_count];
+            svb_ring_signal(ring);
+        }
+        else if (err == SVB_ERROR_TIMEOUT)
+        {
+            ring->timeouts++;
+        }
+        else
+        {
+            // The camera is gone or in a wrong state: stop and report it to the readers
+            ring->last_err = err;
+            ring->running = 0;
+            svb_ring_signal(ring);
+        }
+        PyThread_release_lock(ring->mutex);
+    }
+
+    PyThread_release_lock(ring->done);
+}
+
+static svb_ring *svb_ring_get(int iCameraID)
+{
+    if (iCameraID >= 0 && iCameraID < SVBCAMERA_ID_MAX)
+    {
+        return rings[iCameraID];
+    }
+
+    return NULL;
+}
+
+// Drop a reference taken by a reader, the GIL must be held
+static void svb_ring_unref(svb_ring *ring)
+{
+    ring->users--;
+    if (ring->stopped && ring->users == 0)
+    {
+        svb_ring_free(ring);
+    }
+}
+
+static PyObject *svb_ring_stats(svb_ring *ring, int err)
+{
+    PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+    PyObject *ret_obj = Py_BuildValue("KKKiiii", ring->frames, ring->overruns, ring->timeouts,
+                                      ring->high_water, ring->count, ring->depth, err);
+    PyThread_release_lock(ring->mutex);
+
+    return ret_obj;
+}
+
+static PyObject *py_SVBStartRingCapture(PyObject *self, PyObject *args)
+{
+    int err = -1, iCameraID = err, depth = 0, iWaitms = 0;
+    long lBuffSize = 0;
+
+    if (!PyArg_ParseTuple(args, "iili", &iCameraID, &depth, &lBuffSize, &iWaitms))
+    {
+        return NULL;
+    }
+
+    /* -1 waits forever, so stop could never join the thread, and 0 makes the thread spin on the video lock */
+    if (iWaitms <= 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "ring capture wait must be positive");
+        return NULL;
+    }
+
+    if (iCameraID < 0 || iCameraID >= SVBCAMERA_ID_MAX)
+    {
+        return Py_BuildValue("i", SVB_ERROR_INVALID_ID);
+    }
+
+    if (rings[iCameraID])
+    {
+        return Py_BuildValue("i", SVB_ERROR_VIDEO_MODE_ACTIVE);
+    }
+
+    if (depth < 1 || lBuffSize <= 0)
+    {
+        return Py_BuildValue("i", SVB_ERROR_GENERAL_ERROR);
+    }
+
+    svb_ring *ring = svb_ring_alloc(iCameraID, depth, lBuffSize, iWaitms);
+    if (!ring)
+    {
+        return PyErr_NoMemory();
+    }
+
+    if (PyThread_start_new_thread(svb_ring_thread, ring) == PYTHREAD_INVALID_THREAD_ID)
+    {
+        svb_ring_free(ring);
+        return Py_BuildValue("i", SVB_ERROR_GENERAL_ERROR);
+    }
+
+    rings[iCameraID] = ring;
+
+    return Py_BuildValue("i", SVB_SUCCESS);
+}
+
+static PyObject *py_SVBStopRingCapture(PyObject *self, PyObject *args)
+{
+    int iCameraID = -1;
+
+    if (!PyArg_ParseTuple(args, "i", &iCameraID))
+    {
+        return NULL;
+    }
+
+    svb_ring *ring = svb_ring_get(iCameraID);
+    if (!ring)
+    {
+        return Py_BuildValue("KKKiiii", 0ULL, 0ULL, 0ULL, 0, 0, 0, SVB_ERROR_INVALID_SEQUENCE);
+    }
+
+    // New readers can't find the ring anymore, the current ones are woken up
+    rings[iCameraID] = NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+    ring->running = 0;
+    svb_ring_signal(ring);
+    PyThread_release_lock(ring->mutex);
+    PyThread_acquire_lock(ring->done, WAIT_LOCK);
+    Py_END_ALLOW_THREADS
+
+    PyObject *ret_obj = svb_ring_stats(ring, SVB_SUCCESS);
+
+    ring->stopped = 1;
+    ring->users++;
+    svb_ring_unref(ring);
+
+    return ret_obj;
+}
+
+static PyObject *py_SVBGetRingCaptureStats(PyObject *self, PyObject *args)
+{
+    int iCameraID = -1;
+
+    if (!PyArg_ParseTuple(args, "i", &iCameraID))
+    {
+        return NULL;
+    }
+
+    svb_ring *ring = svb_ring_get(iCameraID);
+    if (!ring)
+    {
+        return Py_BuildValue("KKKiiii", 0ULL, 0ULL, 0ULL, 0, 0, 0, SVB_ERROR_INVALID_SEQUENCE);
+    }
+
+    return svb_ring_stats(ring, ring->last_err);
+}
+
+static PyObject *py_SVBGetRingFrameInto(PyObject *self, PyObject *args)
+{
+    int err = -1, iCameraID = err, iWaitms = 0, slot = -1;
+    unsigned long long sequence = 0;
+    double timestamp = 0.0;
+    Py_buffer buffer;
+
+    if (!PyArg_ParseTuple(args, "iw*i", &iCameraID, &buffer, &iWaitms))
+    {
+        return NULL;
+    }
+
+    svb_ring *ring = svb_ring_get(iCameraID);
+    if (!ring)
+    {
+        PyBuffer_Release(&buffer);
+        return Py_BuildValue("nKdi", (Py_ssize_t)0, 0ULL, 0.0, SVB_ERROR_INVALID_SEQUENCE);
+    }
+
+    if (buffer.len < ring->lBuffSize)
+    {
+        PyBuffer_Release(&buffer);
+        return Py_BuildValue("nKdi", (Py_ssize_t)0, 0ULL, 0.0, SVB_ERROR_BUFFER_TOO_SMALL);
+    }
+
+    ring->users++;
+
+    Py_BEGIN_ALLOW_THREADS
+    double deadline = svb_monotonic() + iWaitms / 1000.0;
+
+    PyThread_acquire_lock(ring->reader, WAIT_LOCK);
+    for (;;)
+    {
+        PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+        if (ring->count > 0)
+        {
+            slot = ring->ready[ring->head];
+            ring->head = (ring->head + 1) % ring->depth;
+            ring->count--;
+            sequence = ring->sequences[slot];
+            timestamp = ring->timestamps[slot];
+            PyThread_release_lock(ring->mutex);
+            err = SVB_SUCCESS;
+            break;
+        }
+
+        if (!ring->running)
+        {
+            err = ring->last_err != SVB_SUCCESS ? ring->last_err : SVB_ERROR_INVALID_SEQUENCE;
+            PyThread_release_lock(ring->mutex);
+            break;
+        }
+        PyThread_release_lock(ring->mutex);
+
+        PY_TIMEOUT_T timeout = -1;
+        if (iWaitms >= 0)
+        {
+            double remaining = deadline - svb_monotonic();
+            if (remaining <= 0)
+            {
+                err = SVB_ERROR_TIMEOUT;
+                break;
+            }
+            timeout = (PY_TIMEOUT_T)(remaining * 1e6);
+        }
+
+        if (PyThread_acquire_lock_timed(ring->available, timeout, 0) == PY_LOCK_ACQUIRED)
+        {
+            PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+            ring->pending = 0;
+            PyThread_release_lock(ring->mutex);
+        }
+    }
+
+    if (slot >= 0)
+    {
+        memcpy(buffer.buf, ring->slots + (size_t)slot * (size_t)ring->lBuffSize, ring->lBuffSize);
+        PyThread_acquire_lock(ring->mutex, WAIT_LOCK);
+        ring->free_slots[ring->free_count++] = slot;
+        PyThread_release_lock(ring->mutex);
+    }
+    PyThread_release_lock(ring->reader);
+    Py_END_ALLOW_THREADS
+
+    Py_ssize_t written = slot >= 0 ? ring->lBuffSize : 0;
+    PyBuffer_Release(&buffer);
+    svb_ring_unref(ring);
+
+    return Py_BuildValue("nKdi", written, sequence, timestamp, err);
+}
+
 /*
  * This tells Python what methods this module has.
  * See the Python-C API for more information.
@@ -575,6 +1354,12 @@ static PyMethodDef SVBCameraSdkMethods[] = {
     {"SVBSetControlValue",
      py_SVBSetControlValue,
      METH_VARARGS, NULL},
+    {"SVBGetControlValues",
+     py_SVBGetControlValues,
+     METH_VARARGS, NULL},
+    {"SVBSetControlValues",
+     py_SVBSetControlValues,
+     METH_VARARGS, NULL},
     {"SVBGetOutputImageType",
      py_SVBGetOutputImageType,
      METH_VARARGS, NULL},
@@ -599,6 +1384,9 @@ static PyMethodDef SVBCameraSdkMethods[] = {
     {"SVBGetVideoData",
      py_SVBGetVideoData,
      METH_VARARGS, NULL},
+    {"SVBGetVideoDataInto",
+     py_SVBGetVideoDataInto,
+     METH_VARARGS, NULL},
     {"SVBWhiteBalanceOnce",
      py_SVBWhiteBalanceOnce,
      METH_VARARGS, NULL},
@@ -647,6 +1435,18 @@ static PyMethodDef SVBCameraSdkMethods[] = {
     {"SVBRestoreDefaultParam",
      py_SVBRestoreDefaultParam,
      METH_VARARGS, NULL},
+    {"SVBStartRingCapture",
+     py_SVBStartRingCapture,
+     METH_VARARGS, NULL},
+    {"SVBStopRingCapture",
+     py_SVBStopRingCapture,
+     METH_VARARGS, NULL},
+    {"SVBGetRingCaptureStats",
+     py_SVBGetRingCaptureStats,
+     METH_VARARGS, NULL},
+    {"SVBGetRingFrameInto",
+     py_SVBGetRingFrameInto,
+     METH_VARARGS, NULL},
     {NULL, NULL, 0, NULL}};
 
 /* This initiates the module using the above definitions. */
@@ -664,6 +1464,12 @@ static struct PyModuleDef moduledef = {
 PyMODINIT_FUNC PyInit_svbcamerasdk(void)
 {
     PyObject *m;
+
+    if (svb_alloc_locks() < 0)
+    {
+        return PyErr_NoMemory();
+    }
+
     m = PyModule_Create(&moduledef);
     if (!m)
     {
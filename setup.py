@@ -86,6 +86,9 @@ setup(name='pysvb',
           "pysvb": ["py.typed"],
       },
       data_files = data_files,
+      extras_require={
+          "numpy": ["numpy"],
+      },
       author='Valerio Faiuolo',
       keywords=["svbony", "sdk", "camera"],
       python_requires=">=3.4,<4",
@@ -0,0 +1,28 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Test fixtures, the cameras are simulated so no hardware nor SDK is needed
+#
+
+import pytest
+
+from pysvb.camera import PySVBCameraSDK
+from pysvb.simulator import SVB_SIMULATED_CAMERA, SVBSimulator
+
+
+@pytest.fixture
+def simulator() -> SVBSimulator:
+    """Simulator of one small RGGB color camera"""
+    return SVBSimulator([SVB_SIMULATED_CAMERA(width=64, height=32, realtime=False)])
+
+
+@pytest.fixture
+def sdk(simulator):
+    """Sdk instance on the simulator, camera 0 is open"""
+    sdk = PySVBCameraSDK(backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    yield sdk
+    sdk.close_camera(0)
+    sdk.close()
@@ -0,0 +1,44 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# asyncio front-end tests
+#
+
+import asyncio
+
+from pysvb.aio import AsyncSVBCamera
+from pysvb.camera import PySVBCameraSDK
+from pysvb.errors import SVB_CAMERA_ERRORS
+
+
+def test_stream_ends_on_errors(simulator):
+    sdk = PySVBCameraSDK(raise_exc=False, backend=simulator)
+    sdk.get_num_of_connected_cameras()
+
+    async def consume() -> list:
+        frames = []
+        async with AsyncSVBCamera(0, sdk) as camera:
+            async for frame in camera.stream(wait_ms=100):
+                frames.append((frame.sequence, frame.timestamp))
+                frame.release()
+                if len(frames) == 3:
+                    simulator.remove_camera(0)
+        return frames
+
+    frames = asyncio.run(asyncio.wait_for(consume(), 5))
+    assert [sequence for sequence, _ in frames] == [0, 1, 2]
+    assert all(timestamp is not None for _, timestamp in frames)
+    assert sdk.last_error_code == SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_REMOVED
+
+
+def test_stream_skips_timeouts(simulator):
+    sdk = PySVBCameraSDK(raise_exc=False, backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    simulator.inject_error('SVBGetVideoData', SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT, 2)
+
+    async def consume() -> int:
+        async with AsyncSVBCamera(0, sdk) as camera:
+            return len([frame.release() async for frame in camera.stream(wait_ms=100, max_frames=4)])
+
+    assert asyncio.run(asyncio.wait_for(consume(), 5)) == 4
@@ -0,0 +1,31 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Software binning tests
+#
+
+import numpy as np
+
+from pysvb.binning import SoftwareBinning
+from pysvb.camera import SVB_IMG_TYPE
+
+
+def test_color_camera_bins_bayer_planes(sdk):
+    sdk.set_output_image_type(0, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    binning = SoftwareBinning.from_camera(sdk, 0, 2, 'sum')
+    assert binning.bayer
+
+    # RGGB cells of 1, 2, 3, 4: every color must stay apart once binned
+    frame = np.tile(np.array([[1, 2], [3, 4]], dtype=np.uint16), (8, 8))
+    binned = binning(frame)
+    assert binned.shape == (8, 8)
+    assert np.array_equal(binned[:2, :2], [[4, 8], [12, 16]])
+
+
+def test_mono_binning():
+    binning = SoftwareBinning(2, 'sum')
+    frame = np.arange(16, dtype=np.uint8).reshape(4, 4)
+    binned = binning(frame)
+    assert binned.dtype == np.uint16
+    assert np.array_equal(binned, [[10, 18], [42, 50]])
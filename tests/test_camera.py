@@ -0,0 +1,122 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# PySVBCameraSDK and SVBCamera tests
+#
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from pysvb.camera import SVB_CAMERA_MODE, PySVBCameraSDK
+from pysvb.device import SVBCamera
+from pysvb.errors import SVB_CAMERA_ERRORS
+from pysvb.simulator import SVB_SIMULATED_CAMERA, SVBSimulator
+
+
+def test_trigger_async_errors_stay_with_their_camera():
+    simulator = SVBSimulator([SVB_SIMULATED_CAMERA(width=64, height=32, realtime=False) for _ in range(0, 2)])
+    with PySVBCameraSDK(raise_exc=False, backend=simulator) as sdk:
+        sdk.get_num_of_connected_cameras()
+        for camera_id in (0, 1):
+            sdk.open_camera(camera_id)
+            sdk.set_camera_mode(camera_id, SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT)
+            sdk.start_video_capture(camera_id)
+
+        simulator.inject_error('SVBSendSoftTrigger', SVB_CAMERA_ERRORS.SVB_ERROR_GENERAL_ERROR, 10, camera_id=0)
+        for _ in range(0, 10):
+            failing, working = sdk.trigger_async(0, 1000), sdk.trigger_async(1, 1000)
+            wait([failing, working])
+            assert failing.result() is None
+            frame = working.result()
+            assert frame is not None
+            frame.release()
+
+        for camera_id in (0, 1):
+            sdk.stop_video_capture(camera_id)
+            sdk.close_camera(camera_id)
+
+
+def test_read_video_frame_returns_the_call_error(simulator):
+    sdk = PySVBCameraSDK(raise_exc=False, backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    sdk.start_video_capture(0)
+    simulator.inject_error('SVBGetVideoData', SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT)
+    assert sdk.read_video_frame(0, 100) == (None, SVB_CAMERA_ERRORS.SVB_ERROR_TIMEOUT)
+    frame, err = sdk.read_video_frame(0, 1000)
+    assert err == SVB_CAMERA_ERRORS.SVB_SUCCESS
+    frame.release()
+    sdk.stop_video_capture(0)
+    sdk.close_camera(0)
+
+
+def test_frames_stop_when_the_camera_is_removed():
+    simulator = SVBSimulator([SVB_SIMULATED_CAMERA(width=64, height=32, realtime=False)])
+    sdk = PySVBCameraSDK(raise_exc=False, backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    camera = SVBCamera(0, sdk)
+    camera.open()
+
+    received = 0
+    for frame in camera.frames(wait_ms=100):
+        frame.release()
+        received += 1
+        if received == 3:
+            simulator.remove_camera(0)
+    assert received == 3
+    assert sdk.last_error_code == SVB_CAMERA_ERRORS.SVB_ERROR_CAMERA_REMOVED
+
+
+def test_ring_capture_wait_must_be_positive(sdk):
+    for wait_ms in (-1, 0):
+        with pytest.raises(ValueError):
+            sdk.start_ring_capture(0, 4, wait_ms)
+    # Nothing was left running
+    sdk.start_ring_capture(0, 4, 100)
+    sdk.stop_ring_capture(0)
+
+
+def test_ring_capture_frames_and_stop(sdk):
+    sdk.create_frame_pool(0, 4)
+    sdk.start_ring_capture(0, 4, 100)
+    frames = [sdk.get_ring_frame(0, 1000) for _ in range(0, 3)]
+    sequences = [frame.sequence for frame in frames]
+    assert sequences == sorted(set(sequences))
+    assert all(frame.timestamp is not None for frame in frames)
+    for frame in frames:
+        frame.release()
+
+    stats = sdk.stop_ring_capture(0)
+    assert stats.depth == 4
+    assert stats.frames >= 3
+    assert stats.frames == stats.overruns + stats.queued + 3
+
+    # The camera can capture again once the ring is stopped
+    sdk.start_ring_capture(0, 2, 100)
+    sdk.get_ring_frame(0, 1000).release()
+    sdk.stop_ring_capture(0)
+
+
+def test_ring_capture_stop_wakes_the_readers(simulator):
+    sdk = PySVBCameraSDK(raise_exc=False, backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    # No trigger, no frames: the reader waits until the ring is stopped
+    sdk.set_camera_mode(0, SVB_CAMERA_MODE.SVB_MODE_TRIG_SOFT)
+    sdk.start_ring_capture(0, 4, 100)
+
+    results = []
+    reader = threading.Thread(target=lambda: results.append(sdk.read_ring_frame(0, 10000)))
+    reader.start()
+    time.sleep(0.2)
+    sdk.stop_ring_capture(0)
+    reader.join(2)
+
+    assert not reader.is_alive()
+    frame, err = results[0]
+    assert frame is None and err != SVB_CAMERA_ERRORS.SVB_SUCCESS
+    sdk.close_camera(0)
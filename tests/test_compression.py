@@ -0,0 +1,32 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Frame compression tests
+#
+
+import pytest
+
+from pysvb.camera import SVB_IMG_TYPE
+from pysvb.compression import PREFILTERS, FrameCompressor, decompress
+
+
+def test_color_camera_delta_stride(sdk):
+    sdk.set_output_image_type(0, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    with FrameCompressor.from_camera(sdk, 0) as compressor:
+        # Bayer mosaics: neighbours of the same color are two samples apart
+        assert compressor.stride == 2
+        assert compressor.sample_size == 2
+        assert compressor.row_samples == 64
+
+
+@pytest.mark.parametrize('prefilter', PREFILTERS)
+def test_lossless_round_trip(sdk, prefilter):
+    sdk.set_output_image_type(0, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    sdk.start_video_capture(0)
+    with sdk.get_video_frame(0, 1000) as frame:
+        raw = bytes(frame.data)
+    sdk.stop_video_capture(0)
+
+    with FrameCompressor.from_camera(sdk, 0, prefilter=prefilter) as compressor:
+        assert decompress(compressor.compress(raw)) == raw
@@ -0,0 +1,61 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# FITS writer tests
+#
+
+import numpy as np
+
+from pysvb.camera import SVB_IMG_TYPE
+from pysvb.fits import FitsWriter
+
+
+def read_fits(path: str) -> 'tuple[dict, bytes]':
+    with open(path, 'rb') as f:
+        content = f.read()
+    header = {}
+    offset = 0
+    while True:
+        card = content[offset:offset + 80].decode('ascii')
+        offset += 80
+        if card.startswith('END'):
+            break
+        if card[8:10] == '= ':
+            header[card[:8].strip()] = card[10:].split('/')[0].strip().strip("'").strip()
+    return header, content[(offset + 2879) // 2880 * 2880:]
+
+
+def test_raw16_round_trip(sdk, tmp_path):
+    sdk.set_output_image_type(0, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    sdk.start_video_capture(0)
+    with FitsWriter.from_camera(sdk, 0) as writer:
+        frame = sdk.get_video_frame(0, 1000)
+        expected = np.frombuffer(frame.data, dtype='<u2').reshape(32, 64).copy()
+        writer.submit(str(tmp_path / "frame.fits"), frame).result()
+    sdk.stop_video_capture(0)
+
+    header, data = read_fits(str(tmp_path / "frame.fits"))
+    assert header['BITPIX'] == '16'
+    assert header['NAXIS1'] == '64' and header['NAXIS2'] == '32'
+    assert header['BAYERPAT'] == 'RGGB'
+    samples = np.frombuffer(data, dtype='>i2', count=64 * 32).astype(np.int32) + int(header['BZERO'])
+    assert np.array_equal(samples.reshape(32, 64), expected)
+    assert expected.any()
+
+
+def test_mono_camera_has_no_bayer_pattern(tmp_path):
+    from pysvb.camera import PySVBCameraSDK
+    from pysvb.simulator import SVB_SIMULATED_CAMERA, SVBSimulator
+
+    sdk = PySVBCameraSDK(backend=SVBSimulator([SVB_SIMULATED_CAMERA(width=64, height=32, color=False)]))
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    sdk.start_video_capture(0)
+    with FitsWriter.from_camera(sdk, 0) as writer:
+        writer.submit(str(tmp_path / "frame.fits"), sdk.get_video_frame(0, 1000)).result()
+    sdk.stop_video_capture(0)
+    sdk.close_camera(0)
+
+    header, _ = read_fits(str(tmp_path / "frame.fits"))
+    assert 'BAYERPAT' not in header
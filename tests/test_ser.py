@@ -0,0 +1,78 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# SER writer and reader tests
+#
+
+import numpy as np
+
+from pysvb.camera import SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.ser import SER_COLOR_ID, SerReader, SerWriter
+from pysvb.simulator import SVB_SIMULATED_CAMERA, SVBSimulator
+
+
+def record(sdk: PySVBCameraSDK, path: str, count: int) -> list:
+    frames = []
+    sdk.start_video_capture(0)
+    with SerWriter.from_camera(path, sdk, 0, observer="tester") as writer:
+        for _ in range(0, count):
+            with sdk.get_video_frame(0, 1000) as frame:
+                frame.timestamp = float(len(frames))
+                frames.append(bytes(frame.data))
+                writer.write(frame)
+    sdk.stop_video_capture(0)
+    return frames
+
+
+def test_raw16_color_round_trip(sdk, tmp_path):
+    sdk.set_output_image_type(0, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    frames = record(sdk, str(tmp_path / "video.ser"), 5)
+
+    with SerReader(str(tmp_path / "video.ser")) as reader:
+        assert reader.color_id == SER_COLOR_ID.SER_BAYER_RGGB
+        assert reader.bit_depth == 16
+        assert (reader.width, reader.height) == (64, 32)
+        assert reader.observer == "tester"
+        assert reader.instrument == "SVBONY Simulated Camera"
+        assert len(reader) == 5
+        for i, frame in enumerate(frames):
+            assert np.array_equal(reader.array(i), np.frombuffer(frame, dtype='<u2').reshape(32, 64))
+        assert reader.has_timestamps
+        # One second apart, as stamped on the frames
+        assert (reader.timestamp(4) - reader.timestamp(0)).total_seconds() == 4
+
+
+def test_rgb24_and_mono(tmp_path):
+    simulator = SVBSimulator([SVB_SIMULATED_CAMERA(width=64, height=32, realtime=False,
+                                                   video_formats=(SVB_IMG_TYPE.SVB_IMG_RGB24,)),
+                              SVB_SIMULATED_CAMERA(width=64, height=32, realtime=False, color=False)])
+    sdk = PySVBCameraSDK(backend=simulator)
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    frames = record(sdk, str(tmp_path / "rgb.ser"), 2)
+    with SerReader(str(tmp_path / "rgb.ser")) as reader:
+        assert reader.color_id == SER_COLOR_ID.SER_BGR
+        assert reader.bit_depth == 8
+        assert bytes(reader.frame(1)) == frames[1]
+    sdk.close_camera(0)
+
+    sdk.open_camera(1)
+    with SerWriter.from_camera(str(tmp_path / "mono.ser"), sdk, 1) as writer:
+        assert writer.frames == 0
+    with SerReader(str(tmp_path / "mono.ser")) as reader:
+        assert reader.color_id == SER_COLOR_ID.SER_MONO
+        assert len(reader) == 0
+    sdk.close_camera(1)
+
+
+def test_unclosed_file_frames_are_counted(tmp_path):
+    writer = SerWriter(str(tmp_path / "crash.ser"), 4, 2, SVB_IMG_TYPE.SVB_IMG_RAW8, buffer_size=0)
+    writer.write(bytes(range(8)))
+    writer.write(bytes(range(8, 16)))
+    # Simulate a crash: the header still says 0 frames and there is no trailer
+    with SerReader(str(tmp_path / "crash.ser")) as reader:
+        assert len(reader) == 2
+        assert not reader.has_timestamps
+        assert bytes(reader.frame(1)) == bytes(range(8, 16))
+    writer.close()
@@ -0,0 +1,75 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Simulated camera tests
+#
+
+import numpy as np
+import pytest
+
+from pysvb.camera import SVB_BAYER_PATTERN, SVB_IMG_TYPE, PySVBCameraSDK
+from pysvb.demosaic import Demosaicer
+from pysvb.simulator import SVB_SIMULATED_CAMERA, SVBSimulator
+
+FORMATS = (SVB_IMG_TYPE.SVB_IMG_RAW16, SVB_IMG_TYPE.SVB_IMG_RAW8, SVB_IMG_TYPE.SVB_IMG_RGB24, SVB_IMG_TYPE.SVB_IMG_Y8)
+
+
+def capture(sdk: PySVBCameraSDK, image_type: SVB_IMG_TYPE):
+    sdk.set_output_image_type(0, image_type)
+    sdk.start_video_capture(0)
+    try:
+        return sdk.get_video_frame_array(0, 1000)
+    finally:
+        sdk.stop_video_capture(0)
+
+
+def open_camera(**settings) -> PySVBCameraSDK:
+    config = dict(width=128, height=64, realtime=False, scene='noise', video_formats=FORMATS)
+    config.update(settings)
+    sdk = PySVBCameraSDK(backend=SVBSimulator([SVB_SIMULATED_CAMERA(**config)]))
+    sdk.get_num_of_connected_cameras()
+    sdk.open_camera(0)
+    # Long exposure: the sky background is well above the read noise
+    sdk.set_control_value(0, 1, 200000, False)
+    return sdk
+
+
+@pytest.mark.parametrize('pattern', list(SVB_BAYER_PATTERN))
+def test_raw_frames_are_bayer_mosaics(pattern):
+    sdk = open_camera(bayer_pattern=pattern)
+    prop = sdk.get_camera_property(0)
+    assert prop.IsColorCam
+    assert prop.BayerPattern == pattern
+
+    raw = capture(sdk, SVB_IMG_TYPE.SVB_IMG_RAW16)
+    cells = {(py, px): float(np.median(raw[py::2, px::2])) for py in (0, 1) for px in (0, 1)}
+    # The sky is reddish: red samples are the brightest, blue ones the faintest
+    red = max(cells, key=cells.get)
+    blue = min(cells, key=cells.get)
+    assert pattern.name[-2:] == {(0, 0): 'RG', (1, 1): 'BG', (0, 1): 'GR', (1, 0): 'GB'}[red]
+    assert red == (1 - blue[0], 1 - blue[1])
+
+    rgb = Demosaicer.from_camera(sdk, 0)(raw)
+    medians = np.median(rgb.reshape(-1, 3), axis=0)
+    assert medians[0] > medians[1] > medians[2]
+
+
+def test_rgb_frames_are_bgr():
+    bgr = capture(open_camera(), SVB_IMG_TYPE.SVB_IMG_RGB24)
+    assert bgr.shape == (64, 128, 3)
+    medians = np.median(bgr.reshape(-1, 3), axis=0)
+    assert medians[2] > medians[1] > medians[0]
+
+
+def test_mono_and_luminance_frames_are_flat():
+    for sdk, image_type in ((open_camera(color=False), SVB_IMG_TYPE.SVB_IMG_RAW16),
+                            (open_camera(), SVB_IMG_TYPE.SVB_IMG_Y8)):
+        frame = capture(sdk, image_type)
+        cells = [float(np.median(frame[py::2, px::2])) for py in (0, 1) for px in (0, 1)]
+        assert max(cells) - min(cells) <= 0.05 * max(cells)
+
+
+def test_mono_camera_property():
+    prop = open_camera(color=False).get_camera_property(0)
+    assert not prop.IsColorCam
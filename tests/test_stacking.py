@@ -0,0 +1,66 @@
+#
+# Python binding to SVBONY Cameras Driver
+# Copyright (c) 2022 Valerio Faiuolo
+#
+# Live stacking tests
+#
+
+import numpy as np
+
+from pysvb.stacking import LiveStacker
+
+SHAPE = (100, 100)
+FRAMES = 200
+
+
+def noise_frames(drift: float = 0.0):
+    rng = np.random.default_rng(1)
+    for i in range(0, FRAMES):
+        yield rng.normal(1000 + drift * i, 20, SHAPE).astype(np.uint16)
+
+
+def test_rejection_rate_on_pure_noise():
+    stacker = LiveStacker(SHAPE, sigma=3.0)
+    rejected = [stacker.add(frame) for frame in noise_frames()]
+
+    # 3 sigma rejects 0.27% of gaussian samples, a bit more while the estimates settle
+    samples = FRAMES * SHAPE[0] * SHAPE[1]
+    assert stacker.rejected / samples < 0.005
+    assert max(rejected) / (SHAPE[0] * SHAPE[1]) < 0.03
+    assert sum(rejected[FRAMES // 2:]) / (samples / 2) < 0.004
+    assert abs(float(stacker.preview().mean()) - 999.5) < 0.5
+    assert abs(float(np.sqrt(stacker.variance().mean())) - 20) < 1
+
+
+def test_drifting_background_does_not_freeze_pixels():
+    stacker = LiveStacker(SHAPE, sigma=3.0)
+    rejected = [stacker.add(frame) for frame in noise_frames(drift=0.5)]
+
+    assert int(stacker.count.min()) == FRAMES
+    assert sum(rejected[-50:]) / (50 * SHAPE[0] * SHAPE[1]) < 0.01
+    # The stack is the mean of the whole session
+    assert abs(float(stacker.preview().mean()) - (1000 + 0.5 * (FRAMES - 1) / 2)) < 1
+
+
+def test_outliers_are_clamped():
+    stacker = LiveStacker((4, 4), sigma=3.0)
+    for frame in noise_frames():
+        if stacker.frames == FRAMES // 2:
+            break
+        stacker.add(frame[:4, :4])
+    before = stacker.preview()
+
+    trail = np.full((4, 4), 1000, dtype=np.uint16)
+    trail[1] = 60000
+    assert stacker.add(trail) == 4
+    # A satellite trail moves the stack by at most sigma * std / n
+    assert float(np.abs(stacker.preview() - before).max()) < 3 * 25 / (FRAMES // 2)
+
+
+def test_registration_offset():
+    stacker = LiveStacker((4, 4), sigma=None)
+    frame = np.arange(16, dtype=np.uint16).reshape(4, 4)
+    stacker.add(frame)
+    stacker.add(frame, (1, 1))
+    assert int(stacker.count[0, 0]) == 1 and int(stacker.count[3, 3]) == 2
+    assert float(stacker.preview()[1, 1]) == (5 + 0) / 2